@@ -0,0 +1,216 @@
+import gc
+import os
+import json
+import time
+import resource
+import tempfile
+from pathlib import Path
+
+from funcs.train_profiler import TrainProfiler
+
+# ==========================================
+# 1. Probe 학습 (후보 설정 하나를 짧게 실행해 처리량 / 메모리 측정)
+# ==========================================
+# 실제 data.yaml로 1 에폭 학습을 시작하고, warmup 이후 probe_batches개 배치를 잰 뒤 콜백에서 중단합니다.
+# 구간 시간은 TrainProfiler의 배치 기록을 그대로 사용합니다.
+DEFAULT_AUTOTUNE = {
+    'batches': [8, 16, 32, 64],
+    'workers': [4, 8, 16],
+    'threads': [],           # CPU 학습일 때 torch.set_num_threads 후보 (비우면 코어 수 / 2, 코어 수)
+    'probe_batches': 30,
+    'warmup_batches': 5,
+    'mem_fraction': 0.85,    # GPU 전체 메모리 중 이 비율 이하로 쓰는 설정만 선택
+}
+# probe에 넘기지 않는 학습 인자 (probe가 직접 정하거나 짧은 실행에 불필요한 항목)
+_PROBE_SKIP_KEYS = ("epochs", "batch", "workers", "device", "save", "plots", "val", "patience",
+                    "project", "name", "exist_ok", "resume")
+
+
+class _ProbeDone(Exception):
+    pass
+
+
+def _is_cpu(device):
+    return str(device).lower() == "cpu"
+
+
+def _is_oom(error):
+    return "out of memory" in str(error).lower()
+
+
+def _host_rss_gb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e6
+
+
+def _finish_wandb():
+    try:
+        import wandb
+    except ImportError:
+        return
+    if wandb.run is not None:
+        wandb.finish()
+
+
+def probe(model_path, data_yaml, device, batch, workers, threads=None, probe_batches=30, warmup_batches=5,
+          train_kwargs=None, project=None):
+    """
+    후보 (batch, workers, threads) 하나로 짧게 학습해 images/s와 최대 메모리를 측정합니다.
+    Ultralytics 내장 WandB 콜백이 probe마다 run을 만들지 않도록 WANDB_MODE=disabled로 실행하므로
+    학습용 wandb.init() 전에 호출해야 합니다.
+    반환값: {'batch', 'workers', 'threads', 'status' ('ok' / 'oom' / 'error'), 'images_per_s',
+             'data_wait_ratio', 'device_mem_frac', 'device_peak_gb', 'host_peak_gb', 'error'}
+    """
+    import torch
+    from ultralytics import YOLO
+
+    row = {'batch': batch, 'workers': workers, 'threads': threads, 'status': 'ok', 'images_per_s': 0.0,
+           'data_wait_ratio': float('nan'), 'device_mem_frac': float('nan'), 'device_peak_gb': float('nan'),
+           'host_peak_gb': float('nan'), 'error': None}
+    use_cuda = not _is_cpu(device) and torch.cuda.is_available()
+    if threads:
+        torch.set_num_threads(threads)
+    if use_cuda:
+        torch.cuda.empty_cache()
+        torch.cuda.reset_peak_memory_stats(device)
+
+    profiler = TrainProfiler(sync_cuda=use_cuda)
+    stop_after = warmup_batches + probe_batches
+
+    def stop(trainer):
+        if len(profiler.compute_ms) >= stop_after:
+            raise _ProbeDone()
+
+    kwargs = {k: v for k, v in (train_kwargs or {}).items() if k not in _PROBE_SKIP_KEYS}
+    model = YOLO(str(model_path))
+    profiler.register(model)
+    model.add_callback("on_train_batch_end", stop)
+    wandb_mode = os.environ.get("WANDB_MODE")
+    os.environ["WANDB_MODE"] = "disabled"
+    try:
+        model.train(data=str(data_yaml), epochs=1, batch=batch, workers=workers, device=device,
+                    project=project or tempfile.gettempdir(), name=f"autotune_b{batch}_w{workers}_t{threads}",
+                    exist_ok=True, save=False, plots=False, val=False, verbose=False, **kwargs)
+    except _ProbeDone:
+        pass
+    except Exception as e:
+        row['status'] = 'oom' if _is_oom(e) else 'error'
+        row['error'] = str(e).splitlines()[0] if str(e) else type(e).__name__
+    finally:
+        _finish_wandb()
+        if wandb_mode is None:
+            os.environ.pop("WANDB_MODE", None)
+        else:
+            os.environ["WANDB_MODE"] = wandb_mode
+
+    # warmup 배치(워커 기동, cudnn benchmark 등)는 제외하고 계산합니다.
+    wait_ms = profiler.wait_ms[warmup_batches:len(profiler.compute_ms)]
+    compute_ms = profiler.compute_ms[warmup_batches:]
+    total_s = (sum(wait_ms) + sum(compute_ms)) / 1000
+    if row['status'] == 'ok':
+        if not compute_ms:
+            row['status'], row['error'] = 'error', "warmup 이후 측정된 배치가 없습니다 (데이터셋이 너무 작음)"
+        elif total_s > 0:
+            row['images_per_s'] = batch * len(compute_ms) / total_s
+            row['data_wait_ratio'] = sum(wait_ms) / 1000 / total_s
+    if use_cuda:
+        total_mem = torch.cuda.get_device_properties(device).total_memory
+        peak = torch.cuda.max_memory_reserved(device)
+        row['device_peak_gb'] = peak / 1e9
+        row['device_mem_frac'] = peak / total_mem
+    row['host_peak_gb'] = _host_rss_gb()
+
+    del model, profiler
+    gc.collect()
+    if use_cuda:
+        torch.cuda.empty_cache()
+    return row
+
+
+# ==========================================
+# 2. 단계별 탐색 (batch -> (CPU) threads -> workers)
+# ==========================================
+def autotune(model_path, data_yaml, device, options=None, train_kwargs=None, project=None):
+    """
+    후보 전체 조합 대신 한 번에 한 항목씩 탐색합니다. (probe 수 = batch 후보 + threads 후보 + workers 후보)
+    - batch: 작은 값부터 늘려 가며 OOM이거나 mem_fraction을 넘으면 중단하고, 맞는 것 중 가장 빠른 값 선택
+    - threads: CPU 학습일 때만, 선택된 batch에서 torch 스레드 수 탐색
+    - workers: 선택된 batch (/ threads)에서 dataloader 워커 수 탐색
+      (Ultralytics 버전에 따라 CPU 학습은 workers를 0으로 고정하므로 이 경우 후보 간 차이가 없습니다)
+    반환값: {'device', 'batch', 'workers', 'threads', 'elapsed_s', 'probes': [probe 결과...]}
+    """
+    opts = dict(DEFAULT_AUTOTUNE)
+    opts.update({k: v for k, v in (options or {}).items() if k in DEFAULT_AUTOTUNE})
+    cpu = _is_cpu(device)
+    cpu_count = os.cpu_count() or 1
+    thread_candidates = opts['threads'] or sorted({max(1, cpu_count // 2), cpu_count})
+
+    chosen = {'batch': (train_kwargs or {}).get('batch', 16),
+              'workers': (train_kwargs or {}).get('workers', max(opts['workers'])),
+              'threads': None}
+    probes = []
+    start_t = time.perf_counter()
+
+    def run(**overrides):
+        params = dict(chosen, **overrides)
+        row = probe(model_path, data_yaml, device, params['batch'], params['workers'], params['threads'],
+                    opts['probe_batches'], opts['warmup_batches'], train_kwargs, project)
+        # CPU는 host 메모리 상한을 알 수 없으므로 OOM만 걸러냅니다.
+        row['fits'] = row['status'] == 'ok' and (cpu or not row['device_mem_frac'] > opts['mem_fraction'])
+        probes.append(row)
+        print(f"🔎 [autotune] batch {params['batch']} | workers {params['workers']} | threads {params['threads']} -> "
+              f"{row['status']} | {row['images_per_s']:.1f} img/s | mem {row['device_mem_frac']:.2f}"
+              + (f" | {row['error']}" if row['error'] else ""))
+        return row
+
+    def best_of(rows, key):
+        fitting = [r for r in rows if r['fits']]
+        if fitting:
+            chosen[key] = max(fitting, key=lambda r: r['images_per_s'])[key]
+
+    batch_rows = []
+    for batch in sorted(opts['batches']):
+        row = run(batch=batch)
+        batch_rows.append(row)
+        if row['status'] == 'oom' or (row['status'] == 'ok' and not row['fits']):
+            break
+    best_of(batch_rows, 'batch')
+
+    if cpu:
+        best_of([run(threads=t) for t in thread_candidates], 'threads')
+
+    best_of([run(workers=w) for w in sorted(opts['workers'])], 'workers')
+
+    return {'device': str(device), 'batch': chosen['batch'], 'workers': chosen['workers'],
+            'threads': chosen['threads'], 'elapsed_s': time.perf_counter() - start_t, 'probes': probes}
+
+
+# ==========================================
+# 3. 결과 저장 / 적용
+# ==========================================
+def save_autotune(result, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2)
+
+
+def load_autotune(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def apply_autotune(cfg, result):
+    """
+    선택된 값을 학습 설정(cfg['train'])에 쓰고, cfg['autotune']['result']에 요약을 남깁니다. (WandB config에 함께 기록)
+    CPU 학습에서 threads가 선택되었으면 현재 프로세스의 torch 스레드 수도 맞춥니다.
+    """
+    cfg['train']['batch'] = result['batch']
+    cfg['train']['workers'] = result['workers']
+    cfg.setdefault('autotune', {})['result'] = {k: result[k] for k in ('device', 'batch', 'workers', 'threads')}
+    if result.get('threads'):
+        import torch
+        torch.set_num_threads(result['threads'])
+    return cfg
@@ -0,0 +1,181 @@
+import json
+import time
+import queue
+import platform
+import threading
+import cv2
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# ==========================================
+# 1. 디코딩 Prefetch 스레드
+# ==========================================
+_END = object()
+
+
+class FramePrefetcher:
+    """
+    별도 스레드에서 프레임을 디코딩하여 batch_size 단위로 bounded queue에 넣습니다.
+    소비자(추론 루프)는 (이미지 리스트, 프레임 경로 리스트, 프레임당 디코딩 ms)를 순서대로 받습니다.
+    """
+
+    def __init__(self, frame_paths, batch_size, queue_size=4, reader=None):
+        self.frame_paths = list(frame_paths)
+        self.batch_size = batch_size
+        self.reader = reader or (lambda path: cv2.imread(str(path)))
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            for start in range(0, len(self.frame_paths), self.batch_size):
+                paths = self.frame_paths[start:start + self.batch_size]
+                t0 = time.perf_counter()
+                images = [self.reader(p) for p in paths]
+                decode_ms = (time.perf_counter() - t0) * 1000 / len(paths)
+                self.queue.put((images, paths, decode_ms))
+        except Exception as e:
+            self.error = e
+        finally:
+            self.queue.put(_END)
+
+    def __iter__(self):
+        while True:
+            item = self.queue.get()
+            if item is _END:
+                break
+            yield item
+        if self.error is not None:
+            raise self.error
+
+
+# ==========================================
+# 2. 통계 유틸
+# ==========================================
+def percentile_summary(values, prefix):
+    """
+    값 리스트의 p50 / p95 / 평균을 {prefix_p50: .., prefix_p95: .., prefix_mean: ..}로 반환합니다.
+    """
+    if len(values) == 0:
+        return {f"{prefix}_p50": np.nan, f"{prefix}_p95": np.nan, f"{prefix}_mean": np.nan}
+    values = np.asarray(values, dtype=np.float64)
+    return {f"{prefix}_p50": float(np.percentile(values, 50)),
+            f"{prefix}_p95": float(np.percentile(values, 95)),
+            f"{prefix}_mean": float(values.mean())}
+
+
+def _sync(device):
+    if device != 'cpu':
+        import torch
+        torch.cuda.synchronize()
+
+
+# ==========================================
+# 3. 모델 x 배치 크기 벤치마크
+# ==========================================
+def benchmark_model(name, model, frame_paths, batch_size, imgsz=640, device='cpu',
+                    warmup_batches=2, plot=True, predict_kwargs=None):
+    """
+    한 모델을 batch_size 단위로 돌려 단계별(decode / preprocess / inference / postprocess / plot) 시간과
+    배치 지연(p50/p95), 처리량(frames/s)을 측정합니다. 앞쪽 warmup_batches는 통계에서 제외합니다.
+    - preprocess / inference / postprocess: Ultralytics Results.speed (프레임당 ms)
+    - latency: model.predict 호출 1회(배치)의 wall time
+    - fps: 워밍업 이후 (디코딩 대기 포함) 전체 루프 기준 프레임 처리량
+    """
+    predict_kwargs = dict(predict_kwargs or {})
+    stages = {key: [] for key in ('decode', 'preprocess', 'inference', 'postprocess', 'plot')}
+    latencies = []
+    measured_frames = 0
+    loop_start = None
+
+    for batch_idx, (images, paths, decode_ms) in enumerate(FramePrefetcher(frame_paths, batch_size)):
+        warm = batch_idx < warmup_batches
+        if not warm and loop_start is None:
+            loop_start = time.perf_counter()
+
+        _sync(device)
+        t0 = time.perf_counter()
+        results = model.predict(images, imgsz=imgsz, device=device, verbose=False, **predict_kwargs)
+        _sync(device)
+        latency_ms = (time.perf_counter() - t0) * 1000
+
+        plot_ms = 0.0
+        if plot:
+            t0 = time.perf_counter()
+            for result in results:
+                result.plot()
+            plot_ms = (time.perf_counter() - t0) * 1000 / len(results)
+
+        if warm:
+            continue
+
+        measured_frames += len(images)
+        latencies.append(latency_ms)
+        stages['decode'].append(decode_ms)
+        stages['plot'].append(plot_ms)
+        for key in ('preprocess', 'inference', 'postprocess'):
+            stages[key].append(results[0].speed.get(key, np.nan))
+
+    elapsed = time.perf_counter() - loop_start if loop_start is not None else 0.0
+
+    row = {'model': name, 'batch_size': batch_size, 'imgsz': imgsz, 'device': str(device),
+           'frames': measured_frames, 'fps': measured_frames / elapsed if elapsed > 0 else np.nan}
+    row.update(percentile_summary(latencies, 'latency_ms'))
+    for key, values in stages.items():
+        row.update(percentile_summary(values, f"{key}_ms"))
+    return row
+
+
+def run_benchmark(models, frame_paths, batch_sizes, imgsz=640, device='cpu', warmup_batches=2,
+                  plot=True, predict_kwargs=None):
+    """
+    {이름: 로드된 YOLO 모델}을 batch_sizes 별로 모두 측정하여 DataFrame으로 반환합니다.
+    모델은 호출 전에 한 번만 로드해 두고 재사용합니다.
+    """
+    rows = []
+    for batch_size in batch_sizes:
+        for name, model in models.items():
+            print(f"⏱️ {name} | batch {batch_size} | {len(frame_paths)} frames")
+            rows.append(benchmark_model(name, model, frame_paths, batch_size, imgsz, device,
+                                        warmup_batches, plot, predict_kwargs))
+    return pd.DataFrame(rows)
+
+
+def environment_info(device):
+    """
+    재현성을 위한 실행 환경 정보 (장치, 라이브러리 버전)
+    """
+    info = {'python': platform.python_version(), 'platform': platform.platform(),
+            'processor': platform.processor(), 'device': str(device)}
+    try:
+        import torch
+        info['torch'] = torch.__version__
+        if device != 'cpu' and torch.cuda.is_available():
+            info['gpu'] = torch.cuda.get_device_name(device if isinstance(device, int) else 0)
+        info['torch_threads'] = torch.get_num_threads()
+    except ImportError:
+        pass
+    try:
+        import ultralytics
+        info['ultralytics'] = ultralytics.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def save_benchmark(df, output_dir, tag, meta=None):
+    """
+    결과를 <output_dir>/<tag>.csv 와 <tag>.json(환경 정보 + 설정 + 결과)으로 저장합니다.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = output_dir / f"{tag}.csv"
+    json_path = output_dir / f"{tag}.json"
+
+    df.to_csv(csv_path, index=False)
+    with open(json_path, 'w') as f:
+        json.dump({'meta': meta or {}, 'results': df.to_dict(orient='records')}, f, indent=2, default=str)
+    return csv_path, json_path
@@ -2,186 +2,361 @@ import json
 import yaml
 import os
 import shutil
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from tqdm import tqdm
 
+from funcs.dir_index import list_dir, scan_files, is_valid_link
+from funcs.image_utils import find_first_frame, read_image_size
+from funcs.frame_source import frame_number
+
 # ==========================================
 # 1. JSON -> YOLO TXT 변환 함수 (Head Padding 포함)
 # ==========================================
-def convert_json_to_yolo_kpt_fixed(json_path, txt_path, img_w, img_h, head_ratio=0.20, padding=20):
+KPT_START, KPT_END = 5, 16   # 사용하는 COCO 키포인트 범위 (어깨 ~ 발목, 12개)
+NUM_COCO_KPTS = 17
+
+
+def load_interp_keypoints(json_path):
     """
-    JSON 파일의 키포인트(5~16번)를 추출하여 YOLO Pose 포맷(.txt)으로 변환합니다.
-    헤드 패딩(Head Padding)을 적용하여 머리 부분을 포함한 BBox를 자동 생성합니다.
+    보간 JSON에서 첫 번째 사람(instance_info[0])의 키포인트를 (17, 2) 배열로 읽습니다.
+    변환에 사용하지 않는 0~4번은 0으로 채우며, 유효하지 않은 JSON이면 None을 반환합니다.
     """
-    try:
-        with open(json_path, 'r') as f:
-            data = json.load(f)
-        
-        # 데이터 유효성 검사
-        if 'instance_info' not in data or not data['instance_info']:
-            return False
-            
-        person = data['instance_info'][0]
-        raw_kpts = person.get('keypoints', []) # [[x,y], [x,y]...]
-
-        if not raw_kpts: return False
-
-        # --- [Logic] 5~16번 키포인트 추출 ---
-        selected_kpts = []
-        valid_x = []
-        valid_y = [] 
-
-        start_idx, end_idx = 5, 16
-        
-        if len(raw_kpts) <= end_idx: return False
-
-        for i in range(start_idx, end_idx + 1):
-            x, y = raw_kpts[i]
-            
-            # Visibility: 좌표가 있으면 2 (Visible)
-            v = 2 if (x > 0 and y > 0) else 0
-
-            # 정규화 (Normalization)
-            nx = x / img_w
-            ny = y / img_h
-            selected_kpts.extend([nx, ny, v])
-
-            # BBox 계산용 좌표 수집
-            if x > 0 and y > 0:
-                valid_x.append(x)
-                valid_y.append(y)
-
-        # 유효한 키포인트가 너무 적으면 변환 실패
-        if len(valid_x) < 2: return False
-
-        # --- [Logic] Bounding Box 자동 계산 (헤드 패딩 적용) ---
-        
-        # 1. 몸통 범위 계산
-        min_x_body, max_x_body = min(valid_x), max(valid_x)
-        min_y_body, max_y_body = min(valid_y), max(valid_y)
-        
-        # 2. 헤드 패딩 (Head Padding) 적용
+    with open(json_path, 'r') as f:
+        data = json.load(f)
+
+    # 데이터 유효성 검사
+    if 'instance_info' not in data or not data['instance_info']:
+        return None
+
+    raw_kpts = data['instance_info'][0].get('keypoints', [])  # [[x,y], [x,y]...]
+    if not raw_kpts or len(raw_kpts) <= KPT_END:
+        return None
+
+    kpts = np.zeros((NUM_COCO_KPTS, 2), dtype=np.float64)
+    kpts[KPT_START:KPT_END + 1] = np.asarray(raw_kpts[KPT_START:KPT_END + 1], dtype=np.float64)
+    return kpts
+
+
+def keypoints_to_yolo_array(kpts, img_w, img_h, head_ratio=0.20, padding=20):
+    """
+    (N, 17, 2) 키포인트 배열을 벡터 연산으로 YOLO Pose 값 (N, 4 + 12*3)으로 변환합니다.
+    반환값: (rows, valid) - valid는 유효 키포인트가 2개 이상인 프레임 마스크입니다.
+    """
+    kpts = np.asarray(kpts, dtype=np.float64).reshape(-1, NUM_COCO_KPTS, 2)[:, KPT_START:KPT_END + 1]
+    x, y = kpts[..., 0], kpts[..., 1]
+
+    # Visibility: 좌표가 있으면 2 (Visible)
+    visible = (x > 0) & (y > 0)
+    valid = visible.sum(axis=1) >= 2
+
+    # 정규화 (Normalization)
+    kpt_part = np.stack([x / img_w, y / img_h, np.where(visible, 2.0, 0.0)], axis=-1)
+    kpt_part = kpt_part.reshape(len(kpts), -1)
+
+    # --- Bounding Box 자동 계산 (헤드 패딩 적용) ---
+    with np.errstate(invalid='ignore'):
+        min_x_body = np.where(visible, x, np.inf).min(axis=1)
+        max_x_body = np.where(visible, x, -np.inf).max(axis=1)
+        min_y_body = np.where(visible, y, np.inf).min(axis=1)
+        max_y_body = np.where(visible, y, -np.inf).max(axis=1)
+
         body_h = max_y_body - min_y_body
-        head_extension = body_h * head_ratio 
-        
-        final_min_y = min_y_body - head_extension
-        
-        # 3. 기본 패딩 및 클리핑
-        min_x = max(0, min_x_body - padding)
-        min_y = max(0, final_min_y - padding)
-        max_x = min(img_w, max_x_body + padding)
-        max_y = min(img_h, max_y_body + padding)
-
-        # 4. XYXY -> XYWH (Normalized Center)
+        final_min_y = min_y_body - body_h * head_ratio
+
+        # 기본 패딩 및 클리핑
+        min_x = np.maximum(0, min_x_body - padding)
+        min_y = np.maximum(0, final_min_y - padding)
+        max_x = np.minimum(img_w, max_x_body + padding)
+        max_y = np.minimum(img_h, max_y_body + padding)
+
+        # XYXY -> XYWH (Normalized Center)
         box_w = max_x - min_x
         box_h = max_y - min_y
-        box_cx = min_x + (box_w / 2)
-        box_cy = min_y + (box_h / 2)
-
-        yolo_bbox = [
-            box_cx / img_w,
-            box_cy / img_h,
+        bbox = np.stack([
+            (min_x + box_w / 2) / img_w,
+            (min_y + box_h / 2) / img_h,
             box_w / img_w,
-            box_h / img_h
-        ]
-
-        # --- [File Write] ---
-        # Class 0 + BBox + Keypoints
-        line = f"0 {' '.join(f'{v:.6f}' for v in yolo_bbox)} {' '.join(f'{v:.6f}' for v in selected_kpts)}\n"
-        
-        with open(txt_path, 'w') as f:
-            f.write(line)
-            
-        return True
+            box_h / img_h,
+        ], axis=1)
 
-    except Exception as e:
-        print(f"❌ Error converting {Path(json_path).name}: {e}")
-        return False
+    return np.concatenate([bbox, kpt_part], axis=1), valid
+
+
+def format_yolo_lines(rows):
+    """
+    YOLO Pose 값 배열 (N, 40)을 Class 0 라벨 라인 리스트로 한 번에 포맷팅합니다.
+    """
+    rows = np.asarray(rows, dtype=np.float64)
+    if rows.size == 0:
+        return []
+    fmt = "0 " + " ".join(["%.6f"] * rows.shape[1]) + "\n"
+    return [fmt % tuple(r) for r in rows.tolist()]
+
+
+def convert_jsons_to_yolo_batch(json_paths, txt_paths, img_w, img_h, head_ratio=0.20, padding=20,
+                                return_lines=False):
+    """
+    여러 JSON(보통 한 폴더 전체)을 한 번에 변환합니다.
+    키포인트를 (N, 17, 2)로 모아 벡터 연산으로 계산하고, 라벨 라인을 일괄 포맷팅한 뒤 파일로 씁니다.
+    반환값: 파일별 변환 성공 여부 리스트 (return_lines=True이면 (성공 여부, 파일별 라벨 라인 또는 None))
+    """
+    json_paths, txt_paths = list(json_paths), list(txt_paths)
+    ok = [False] * len(json_paths)
+    written = [None] * len(json_paths)
+
+    # --- JSON 로드 ---
+    loaded_idx, loaded_kpts = [], []
+    for i, json_path in enumerate(json_paths):
+        try:
+            kpts = load_interp_keypoints(json_path)
+        except Exception as e:
+            print(f"❌ Error converting {Path(json_path).name}: {e}")
+            continue
+        if kpts is not None:
+            loaded_idx.append(i)
+            loaded_kpts.append(kpts)
+
+    if not loaded_idx:
+        return (ok, written) if return_lines else ok
+
+    # --- 벡터 변환 + 일괄 포맷팅 ---
+    rows, valid = keypoints_to_yolo_array(np.stack(loaded_kpts), img_w, img_h, head_ratio, padding)
+    write_idx = [i for i, v in zip(loaded_idx, valid) if v]
+    lines = format_yolo_lines(rows[valid])
+
+    # --- [File Write] ---
+    for i, line in zip(write_idx, lines):
+        try:
+            with open(txt_paths[i], 'w') as f:
+                f.write(line)
+            ok[i] = True
+            written[i] = line
+        except Exception as e:
+            print(f"❌ Error converting {Path(json_paths[i]).name}: {e}")
+
+    return (ok, written) if return_lines else ok
+
+
+def convert_json_to_yolo_kpt_fixed(json_path, txt_path, img_w, img_h, head_ratio=0.20, padding=20):
+    """
+    JSON 파일의 키포인트(5~16번)를 추출하여 YOLO Pose 포맷(.txt)으로 변환합니다.
+    헤드 패딩(Head Padding)을 적용하여 머리 부분을 포함한 BBox를 자동 생성합니다.
+    (단일 파일용 래퍼이며, 실제 계산은 convert_jsons_to_yolo_batch가 수행합니다.)
+    """
+    return convert_jsons_to_yolo_batch([json_path], [txt_path], img_w, img_h, head_ratio, padding)[0]
 
 
 # ==========================================
 # 2. 데이터셋 구조화 및 샘플링 함수 (Symlink + Step)
 # ==========================================
-def create_yolo_dataset_structure(df, dataset_dir, data_dir, step=30):
+def _safe_name(common_path):
+    return common_path.replace("/", "_").replace("\\", "_")
+
+
+def sample_positions(num_frames, steps):
     """
-    DataFrame을 기반으로 YOLO 학습용 폴더 구조를 생성하고,
-    지정된 프레임 간격(step)으로 데이터를 샘플링하여 연결합니다.
-    (YAML 파일에 step 정보를 포함하여 저장합니다.)
+    정렬된 라벨 stem 리스트에서 steps(정수 또는 리스트) 간격으로 샘플링되는 위치의 합집합을 반환합니다.
     """
-    print(f"🚀 [Sampling Mode] 데이터셋 구조화 시작 (간격: {step})")
-    print(f"📂 저장 경로: {dataset_dir}")
+    steps = steps if isinstance(steps, (list, tuple)) else [steps]
+    return sorted({i for s in steps for i in range(0, num_frames, s)})
 
-    # 폴더 생성
-    for split in ['train', 'val']:
-        (dataset_dir / 'images' / split).mkdir(parents=True, exist_ok=True)
-        (dataset_dir / 'labels' / split).mkdir(parents=True, exist_ok=True)
 
-    counts = {'train': 0, 'val': 0, 'skip': 0, 'fixed': 0}
-    
-    # tqdm 진행률 표시
-    for idx, row in tqdm(df.iterrows(), total=len(df), desc="Linking Files"):
-        if row.get('is_train') == True: split = 'train'
-        elif row.get('is_val') == True: split = 'val'
-        else: continue 
+def _index_source_folder(data_dir, common_path, frame_dir_name="1_FRAME"):
+    """
+    1_FRAME / 5_YOLO_TXT 폴더를 한 번씩만 나열하여 (정렬된 라벨 stem 리스트, 이미지 파일명 set)을 반환합니다.
+    두 폴더 중 하나라도 없으면 None을 반환합니다.
+    """
+    label_entries = list_dir(data_dir / "5_YOLO_TXT" / common_path)
+    image_entries = list_dir(data_dir / frame_dir_name / common_path)
+    if label_entries is None or image_entries is None:
+        return None
 
-        common_path = row['common_path']
-        src_label_dir = data_dir / "5_YOLO_TXT" / common_path
-        src_image_dir = data_dir / "1_FRAME" / common_path
+    # frame_1, frame_10, ... 처럼 번호가 채워져 있지 않으므로 프레임 번호 순으로 정렬합니다.
+    label_stems = sorted((name[:-4] for name in label_entries if name.endswith(".txt")), key=frame_number)
+    return label_stems, set(image_entries)
+
+
+def _plan_folder_links(data_dir, common_path, label_stems, image_names, frame_dir_name="1_FRAME"):
+    """
+    라벨 stem 마다 (목적지 파일명, 확장자, 원본 이미지, 원본 라벨)을 만듭니다. 이미지가 없는 stem은 None.
+    이미지 존재 여부는 인덱스(set) 조회로만 확인하며, .jpg를 우선하고 없으면 .png를 사용합니다.
+    """
+    src_label_dir = data_dir / "5_YOLO_TXT" / common_path
+    src_image_dir = data_dir / frame_dir_name / common_path
+    safe_common_path = _safe_name(common_path)
+
+    plan = []
+    for file_stem in label_stems:
+        if f"{file_stem}.jpg" in image_names:
+            suffix = ".jpg"
+        elif f"{file_stem}.png" in image_names:
+            suffix = ".png"
+        else:
+            plan.append(None)
+            continue
 
-        if not src_label_dir.exists() or not src_image_dir.exists():
+        unique_name = f"{safe_common_path}_{file_stem}"
+        plan.append((unique_name, suffix, src_image_dir / f"{file_stem}{suffix}", src_label_dir / f"{file_stem}.txt"))
+    return plan
+
+
+def _apply_links(plan, image_dir, label_dir, counts, split):
+    """
+    목적지 폴더를 한 번씩 나열한 뒤, 계획(plan)과의 차집합만 심볼릭 링크/라벨 복사로 채웁니다.
+    깨진 심볼릭 링크는 삭제 후 다시 연결하고, 계획에 없는 이미지/라벨(샘플링 방식이나 step이 바뀌어
+    빠진 프레임)은 삭제하여 기존 폴더에 다시 만들어도 이번 샘플만 남도록 합니다.
+    """
+    dst_images = list_dir(image_dir) or {}
+    dst_labels = set(list_dir(label_dir) or {})
+    valid_images = set()  # 이번 실행에서 확인했거나 새로 연결한 이미지
+    planned_labels = set()
+
+    for unique_name, suffix, image_file, label_file in plan:
+        image_name = f"{unique_name}{suffix}"
+        label_name = f"{unique_name}.txt"
+        planned_labels.add(label_name)
+
+        if image_name not in valid_images and image_name in dst_images:
+            image_entry = dst_images.pop(image_name)
+            if is_valid_link(image_entry, image_file):
+                valid_images.add(image_name)
+            else:
+                os.unlink(image_entry.path)
+
+        if image_name in valid_images and label_name in dst_labels:
+            counts['skip'] += 1
             continue
 
-        label_files = sorted(list(src_label_dir.glob("*.txt")))
-        if not label_files: continue
+        try:
+            if image_name not in valid_images:
+                os.symlink(image_file, image_dir / image_name)
+                valid_images.add(image_name)
+                counts['fixed'] += 1  # 심볼릭 링크 생성 시 카운트
 
-        # Step 간격 샘플링
-        sampled_files = label_files[::step]
+            if label_name not in dst_labels:
+                shutil.copy2(label_file, label_dir / label_name)
+                dst_labels.add(label_name)
 
-        for label_file in sampled_files:
-            file_stem = label_file.stem
-            
-            image_file = src_image_dir / f"{file_stem}.jpg"
-            if not image_file.exists():
-                image_file = src_image_dir / f"{file_stem}.png"
-            if not image_file.exists(): continue
+            counts[split] += 1
 
-            safe_common_path = common_path.replace("/", "_").replace("\\", "_")
-            unique_name = f"{safe_common_path}_{file_stem}"
+        except OSError as e:
+            print(f"❌ 에러: {e}")
 
-            dst_image = dataset_dir / 'images' / split / f"{unique_name}{image_file.suffix}"
-            dst_label = dataset_dir / 'labels' / split / f"{unique_name}.txt"
+    # 계획에 없는 항목 정리 (dst_images에는 계획에서 조회되지 않은 이미지만 남아 있음)
+    for name, entry in dst_images.items():
+        os.unlink(entry.path)
+        counts['removed'] += 1
+    for name in dst_labels - planned_labels:
+        if name.endswith(".txt"):
+            os.remove(label_dir / name)
 
-            if dst_image.is_symlink() and not dst_image.exists():
-                dst_image.unlink()
 
-            if dst_image.exists() and dst_label.exists():
-                counts['skip'] += 1
-                continue
+def _link_folder(link_path, target_dir, existing):
+    """
+    폴더 단위 심볼릭 링크(link_path -> target_dir)를 만듭니다. 유효한 링크가 있으면 그대로 둡니다.
+    반환값: 새로 링크를 만들었으면 True
+    """
+    entry = existing.get(link_path.name)
+    if entry is not None:
+        if is_valid_link(entry, target_dir):
+            return False
+        os.unlink(entry.path)
+    os.symlink(target_dir, link_path, target_is_directory=True)
+    return True
 
+
+def _write_list_dataset(folder_plans, dataset_dir, data_dir, counts, split, frame_dir_name="1_FRAME"):
+    """
+    [List 모드] 프레임마다 링크/복사를 만드는 대신,
+    - images/<safe_common_path> -> <frame_dir_name>/<common_path>
+    - labels/<safe_common_path> -> 5_YOLO_TXT/<common_path>
+    폴더 링크만 common_path 당 하나씩 만들고, 샘플링된 이미지 목록을 <split>.txt 로 씁니다.
+    Ultralytics는 이미지 경로의 /images/ 를 /labels/ 로 바꿔 라벨을 찾으므로 라벨 저장소(5_YOLO_TXT)를 그대로 읽습니다.
+    """
+    existing_images = list_dir(dataset_dir / 'images') or {}
+    existing_labels = list_dir(dataset_dir / 'labels') or {}
+
+    lines = []
+    linked = set()  # 같은 common_path가 여러 행에 있어도 링크는 한 번만 확인
+    for common_path, entries in folder_plans:
+        safe_common_path = _safe_name(common_path)
+        if safe_common_path not in linked:
             try:
-                if not dst_image.exists():
-                    os.symlink(image_file, dst_image)
-                    counts['fixed'] += 1 # 심볼릭 링크 생성 시 카운트
-                
-                if not dst_label.exists():
-                    shutil.copy2(label_file, dst_label)
-                
-                # 카운트 로직: 새로 링크를 걸었거나(fixed), 이미 존재해서 건너뛰지 않았을 때
-                # 여기서는 루프를 돌 때마다 해당 split 카운트를 올리는 것이 직관적이므로 수정
-                counts[split] += 1
-                
+                if _link_folder(dataset_dir / 'images' / safe_common_path,
+                                data_dir / frame_dir_name / common_path, existing_images):
+                    counts['fixed'] += 1
+                _link_folder(dataset_dir / 'labels' / safe_common_path,
+                             data_dir / "5_YOLO_TXT" / common_path, existing_labels)
+                linked.add(safe_common_path)
             except OSError as e:
                 print(f"❌ 에러: {e}")
+                continue
 
-    # ---------------------------------------------------------
-    # ✅ [수정됨] data.yaml 생성 (sampling_step 정보 추가)
-    # ---------------------------------------------------------
+        for unique_name, suffix, image_file, label_file in entries:
+            lines.append(f"./images/{safe_common_path}/{image_file.name}\n")
+        counts[split] += len(entries)
+
+    # 목록 파일은 매번 통째로 다시 씁니다. (임시 파일 -> 교체)
+    list_path = dataset_dir / f"{split}.txt"
+    tmp_path = list_path.with_suffix(".tmp")
+    with open(tmp_path, 'w') as f:
+        f.writelines(lines)
+    os.replace(tmp_path, list_path)
+
+
+def check_list_dataset(yaml_path, max_check=None):
+    """
+    List 모드 데이터셋에서 Ultralytics가 라벨을 올바르게 찾는지 확인합니다.
+    Ultralytics와 같은 규칙(img2label_paths: /images/ -> /labels/, 확장자 -> .txt)으로 라벨 경로를 계산해
+    이미지/라벨이 실제로 존재하는지 검사합니다. (max_check: split당 검사할 최대 개수, None이면 전체)
+    """
+    try:
+        from ultralytics.data.utils import img2label_paths
+    except ImportError:
+        def img2label_paths(img_paths):
+            sa, sb = f"{os.sep}images{os.sep}", f"{os.sep}labels{os.sep}"
+            return [sb.join(x.rsplit(sa, 1)).rsplit(".", 1)[0] + ".txt" for x in img_paths]
+
+    yaml_path = Path(yaml_path)
+    with open(yaml_path, 'r') as f:
+        data_cfg = yaml.safe_load(f)
+    root = Path(data_cfg.get('path') or yaml_path.parent)
+
+    report = {}
+    for split in ['train', 'val']:
+        list_path = root / data_cfg[split]
+        parent = str(list_path.parent) + os.sep
+        with open(list_path, 'r') as f:
+            img_paths = [x.replace("./", parent) if x.startswith("./") else x for x in f.read().splitlines() if x]
+        checked = img_paths[:max_check] if max_check else img_paths
+        label_paths = img2label_paths(checked)
+
+        missing_images = [p for p in checked if not os.path.exists(p)]
+        missing_labels = [p for p in label_paths if not os.path.exists(p)]
+        report[split] = {'total': len(img_paths), 'checked': len(checked),
+                         'missing_images': missing_images, 'missing_labels': missing_labels}
+
+        status = "✅" if not missing_images and not missing_labels else "❌"
+        print(f"{status} [{split}] 검사 {len(checked):,} / {len(img_paths):,} | "
+              f"이미지 누락 {len(missing_images)} | 라벨 누락 {len(missing_labels)}")
+
+    return report
+
+
+def _write_data_yaml(dataset_dir, step, mode="symlink", sampling="stride", max_frames=None):
+    """
+    data.yaml 생성 (sampling_step / sampling 방식 / 폴더당 최대 프레임 수 정보 포함)
+    list 모드에서는 train/val이 이미지 목록 파일(train.txt / val.txt)을 가리킵니다.
+    """
     yaml_content = {
         'path': str(dataset_dir.absolute()),
-        'sampling_step': step,               
-        'train': 'images/train',
-        'val': 'images/val',
+        'sampling_step': step,
+        'sampling': sampling,
+        'max_frames': max_frames,
+        'train': 'train.txt' if mode == "list" else 'images/train',
+        'val': 'val.txt' if mode == "list" else 'images/val',
         'names': {0: 'person'},
         'kpt_shape': [12, 3],
         'flip_idx': [1, 0, 3, 2, 5, 4, 7, 6, 9, 8, 11, 10]
@@ -190,11 +365,260 @@ def create_yolo_dataset_structure(df, dataset_dir, data_dir, step=30):
     yaml_path = dataset_dir / "data.yaml"
     with open(yaml_path, 'w') as f:
         yaml.dump(yaml_content, f, sort_keys=False)
+    return yaml_path
+
+
+def _resolve_dataset_dirs(dataset_dir, steps):
+    """
+    step별 데이터셋 경로를 결정합니다.
+    - dict: {step: 경로}
+    - '{step}'이 포함된 경로: step 값으로 치환 (예: .../v1.0_step{step})
+    - 일반 경로: step이 하나일 때만 그대로 사용
+    """
+    if isinstance(dataset_dir, dict):
+        return {s: Path(dataset_dir[s]) for s in steps}
+    if "{step}" in str(dataset_dir):
+        return {s: Path(str(dataset_dir).format(step=s)) for s in steps}
+    if len(steps) > 1:
+        raise ValueError("여러 step을 만들 때는 dataset_dir에 '{step}'을 포함하거나 {step: 경로} dict를 전달해야 합니다.")
+    return {steps[0]: Path(dataset_dir)}
+
+
+def create_yolo_dataset_structure(df, dataset_dir, data_dir, step=30, mode="symlink", frame_dir_name="1_FRAME",
+                                  sampling="stride", max_frames=None):
+    """
+    DataFrame을 기반으로 YOLO 학습용 폴더 구조를 생성하고,
+    지정된 프레임 간격(step)으로 데이터를 샘플링하여 연결합니다.
+    (YAML 파일에 step 정보를 포함하여 저장합니다.)
+
+    원본/목적지 폴더는 os.scandir로 한 번씩만 나열하고, 파일 단위 존재 확인은
+    메모리 인덱스(set) 조회로 대체하여 NAS stat 호출을 최소화합니다.
+
+    step에 리스트(예: [1, 15, 30])를 주면 1_FRAME/5_YOLO_TXT를 한 번만 훑어 모든 step의 데이터셋을 만듭니다.
+    이때 dataset_dir은 '{step}'을 포함한 경로 또는 {step: 경로} dict이며, 반환값은 {step: yaml_path}입니다.
+
+    mode="list"이면 프레임별 심볼릭 링크/라벨 복사 대신 train.txt/val.txt 이미지 목록과
+    common_path 단위 폴더 링크만 만듭니다. (step=1에서도 수 초 내에 생성, check_list_dataset으로 검증)
+
+    frame_dir_name으로 이미지 원본 폴더를 바꿀 수 있습니다. (예: 축소 프레임 "1_FRAME_640", funcs.frame_pyramid)
+
+    sampling="motion" / "diversity"이면 5_YOLO_TXT(또는 shard)의 키포인트로 폴더마다 같은 수(ceil(N / step))의
+    프레임을 움직임 / 자세 다양성 기준으로 고릅니다. (funcs.frame_sampler, 기본값 "stride"는 기존 간격 샘플링)
+    max_frames를 주면 step과 무관하게 폴더당 최대 max_frames개만 고릅니다. (예: step=1 + motion + 300)
+    """
+    # frame_sampler -> label_shards -> data_utils 순환 import를 피하기 위해 함수 안에서 import
+    from funcs.frame_sampler import SAMPLING_METHODS, sample_folder_positions
+
+    if mode not in ("symlink", "list"):
+        raise ValueError(f"지원하지 않는 mode입니다: {mode} (symlink | list)")
+    if sampling not in SAMPLING_METHODS:
+        raise ValueError(f"지원하지 않는 sampling입니다: {sampling} ({' | '.join(SAMPLING_METHODS)})")
+
+    steps = list(step) if isinstance(step, (list, tuple)) else [step]
+    dataset_dirs = _resolve_dataset_dirs(dataset_dir, steps)
+
+    print(f"🚀 [Sampling Mode] 데이터셋 구조화 시작 (간격: {', '.join(map(str, steps))} | 샘플링: {sampling} "
+          f"| 폴더당 최대: {max_frames or '-'} | 모드: {mode})")
+    for s in steps:
+        print(f"📂 저장 경로 (step {s}): {dataset_dirs[s]}")
+
+    # 폴더 생성
+    for s in steps:
+        for split in ['train', 'val']:
+            image_dir = dataset_dirs[s] / 'images' / ('' if mode == "list" else split)
+            label_dir = dataset_dirs[s] / 'labels' / ('' if mode == "list" else split)
+            image_dir.mkdir(parents=True, exist_ok=True)
+            label_dir.mkdir(parents=True, exist_ok=True)
+
+    counts = {s: {'train': 0, 'val': 0, 'skip': 0, 'fixed': 0, 'removed': 0} for s in steps}
+    plans = {s: {'train': [], 'val': []} for s in steps}
+
+    # tqdm 진행률 표시
+    for idx, row in tqdm(df.iterrows(), total=len(df), desc="Indexing Folders"):
+        if row.get('is_train') == True: split = 'train'
+        elif row.get('is_val') == True: split = 'val'
+        else: continue
+
+        common_path = row['common_path']
+        index = _index_source_folder(data_dir, common_path, frame_dir_name)
+        if index is None:
+            continue
+
+        label_stems, image_names = index
+        if not label_stems: continue
+
+        # 모든 step의 샘플 위치(합집합)에 대해서만 한 번 계획을 세우고, step별로 나눠 씁니다.
+        # (step30 ⊂ step15 ⊂ step1 처럼 겹치는 프레임은 이미지 조회를 한 번만 수행)
+        step_positions = sample_folder_positions(data_dir, common_path, label_stems, steps, sampling, max_frames)
+        positions = sorted(set().union(*step_positions.values()))
+        folder_plan = _plan_folder_links(data_dir, common_path, [label_stems[i] for i in positions],
+                                         image_names, frame_dir_name)
+        planned = dict(zip(positions, folder_plan))
+
+        # Step별 샘플링 (stride: 간격, motion / diversity: 같은 예산의 내용 기반 선택)
+        for s in steps:
+            entries = [p for p in (planned[i] for i in step_positions[s]) if p is not None]
+            plans[s][split].append((common_path, entries))
+
+    yaml_paths = {}
+    for s in steps:
+        for split in ['train', 'val']:
+            if mode == "list":
+                _write_list_dataset(plans[s][split], dataset_dirs[s], data_dir, counts[s], split, frame_dir_name)
+            else:
+                entries = [e for _, folder_entries in plans[s][split] for e in folder_entries]
+                _apply_links(entries, dataset_dirs[s] / 'images' / split,
+                             dataset_dirs[s] / 'labels' / split, counts[s], split)
+
+        yaml_paths[s] = _write_data_yaml(dataset_dirs[s], s, mode, sampling, max_frames)
+
+        print("\n📊 [완료] 데이터셋 구축 결과:")
+        print(f"   - 적용 Step: {s} ({sampling})")
+        print(f"   - Train Images: {counts[s]['train']:,} 장")
+        print(f"   - Val Images:   {counts[s]['val']:,} 장")
+        if counts[s]['removed']:
+            print(f"   - 계획에 없어 삭제: {counts[s]['removed']:,} 장")
+        print(f"   - YAML Path:    {yaml_paths[s]}")
+
+    return yaml_paths if isinstance(step, (list, tuple)) else yaml_paths[step]
+
+
+# ==========================================
+# 3. 증분 변환용 Manifest
+# ==========================================
+MANIFEST_NAME = ".json2yolo_manifest.json"
+
+
+def load_manifest(yolo_dir):
+    """
+    5_YOLO_TXT/<common_path>/ 에 저장된 변환 Manifest를 읽습니다. 없거나 깨져 있으면 None을 반환합니다.
+    """
+    manifest_path = Path(yolo_dir) / MANIFEST_NAME
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(yolo_dir, params, files):
+    """
+    변환 파라미터와 JSON별 (mtime_ns, size, 성공 여부)를 임시 파일에 쓴 뒤 교체하여 원자적으로 저장합니다.
+    """
+    manifest_path = Path(yolo_dir) / MANIFEST_NAME
+    tmp_path = manifest_path.with_suffix(".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump({'params': params, 'files': files}, f)
+    os.replace(tmp_path, manifest_path)
+
+
+# ==========================================
+# 4. 폴더 단위 JSON -> YOLO TXT 변환 (병렬 워커용)
+# ==========================================
+def convert_folder_to_yolo(common_path, data_dir, head_ratio=0.20, padding=20,
+                           incremental=False, dry_run=False, img_size=None, write_shard=False):
+    """
+    common_path 하나에 해당하는 4_INTERP_DATA 폴더의 JSON을 모두 5_YOLO_TXT로 변환합니다.
+    ProcessPoolExecutor 워커에서 실행되므로 예외를 밖으로 던지지 않고 결과 dict로 반환합니다.
+
+    - incremental=True: Manifest와 비교하여 새로 생기거나 수정된 JSON만 변환합니다.
+      변환 파라미터(head_ratio, padding, 해상도)가 바뀌면 폴더 전체를 다시 변환하고,
+      원본 JSON이 사라졌거나 변환에 실패한 .txt(고아 파일)는 삭제합니다.
+    - dry_run=True: 파일을 쓰거나 지우지 않고 변환/삭제 예정 개수만 집계합니다.
+    - img_size: (width, height). FrameSizeCache 등으로 미리 알고 있으면 전달하여 프레임 조회를 생략합니다.
+    - write_shard=True: 변환 결과를 5_YOLO_SHARD/<common_path> 라벨 shard(funcs.label_shards)에도 반영합니다.
+    """
+    data_dir = Path(data_dir)
+    result = {'common_path': common_path, 'total': 0, 'success': 0,
+              'converted': 0, 'skipped': 0, 'removed': 0, 'error': None}
+
+    try:
+        frame_dir = data_dir / "1_FRAME" / common_path
+        interp_dir = data_dir / "4_INTERP_DATA" / common_path
+        yolo_dir = data_dir / "5_YOLO_TXT" / common_path
+
+        # 원본 JSON 폴더가 없거나(NAS 일시 오류 포함) 비어 있으면 아무것도 쓰거나 지우지 않고 건너뜁니다.
+        # (빈 목록을 기준으로 고아 정리를 하면 기존 .txt / manifest / shard가 모두 지워지므로)
+        json_entries = scan_files(interp_dir, ".json")
+        if not json_entries:
+            return result
+
+        # 저장할 폴더가 없으면 생성합니다.
+        if not dry_run:
+            yolo_dir.mkdir(parents=True, exist_ok=True)
+
+        # 해상도 확인 (캐시에서 전달받지 못한 경우 첫 프레임의 헤더만 읽음)
+        if img_size is None:
+            first_frame = find_first_frame(frame_dir)
+            if first_frame is None:
+                return result
+            img_size = read_image_size(first_frame)
+            if img_size is None:
+                result['error'] = "Image Read Error"
+                return result
+
+        img_w, img_h = img_size
+
+        result['total'] = len(json_entries)
+
+        # --- 변환 대상 결정 ---
+        params = {'head_ratio': head_ratio, 'padding': padding, 'img_w': img_w, 'img_h': img_h}
+        stamps = {}
+        for stem, entry in json_entries.items():
+            st = entry.stat()
+            stamps[stem] = [st.st_mtime_ns, st.st_size]
+
+        manifest = load_manifest(yolo_dir) if incremental else None
+        if manifest is not None and manifest.get('params') == params:
+            old_files = manifest.get('files', {})
+        else:
+            old_files = {}  # 첫 실행 또는 파라미터 변경 -> 전체 재변환
+
+        todo = [stem for stem in sorted(json_entries) if old_files.get(stem, [None, None])[:2] != stamps[stem]]
+        todo_set = set(todo)
+        done = {stem: old_files[stem] for stem in json_entries if stem not in todo_set}
+        result['skipped'] = len(done)
+        result['success'] = sum(1 for v in done.values() if v[2])
+
+        # --- 변환 ---
+        result['converted'] = len(todo)
+        new_lines = {}
+        if todo and not dry_run:
+            oks, lines = convert_jsons_to_yolo_batch([interp_dir / f"{stem}.json" for stem in todo],
+                                                     [yolo_dir / f"{stem}.txt" for stem in todo],
+                                                     img_w, img_h, head_ratio, padding, return_lines=True)
+            for stem, ok, line in zip(todo, oks, lines):
+                done[stem] = stamps[stem] + [ok]
+                if ok:
+                    new_lines[stem] = line
+            result['success'] += sum(oks)
+
+        # --- 고아 .txt 정리 (원본 JSON 없음 또는 변환 실패) ---
+        if incremental:
+            for stem in scan_files(yolo_dir, ".txt"):
+                if stem in done and done[stem][2]:
+                    continue
+                if stem in todo_set and dry_run:
+                    continue  # dry-run에서는 변환 결과를 알 수 없으므로 삭제 대상에서 제외
+                if not dry_run:
+                    os.remove(yolo_dir / f"{stem}.txt")
+                result['removed'] += 1
+
+        if write_shard and not dry_run:
+            # label_shards가 format_yolo_lines를 가져오므로 순환 import를 피하기 위해 여기서 import
+            from funcs.label_shards import shard_dir_for, update_label_shard, ROWS_FILE, STEMS_FILE
+            shard_dir = shard_dir_for(data_dir, common_path)
+            shard_exists = (shard_dir / ROWS_FILE).exists() and (shard_dir / STEMS_FILE).exists()
+            # 변환 / 삭제한 것이 없고 (원본 JSON도 그대로) shard가 이미 있으면 다시 쓰지 않습니다.
+            unchanged = not todo and not result['removed'] and len(done) == len(old_files)
+            if not (shard_exists and unchanged):
+                keep_stems = [stem for stem, v in done.items() if v[2]]
+                update_label_shard(shard_dir, keep_stems, new_lines, fallback_txt_dir=yolo_dir)
+
+        if not dry_run:
+            save_manifest(yolo_dir, params, done)
+
+    except Exception as e:
+        result['error'] = str(e)
 
-    print("\n📊 [완료] 데이터셋 구축 결과:")
-    print(f"   - 적용 Step: {step}")
-    print(f"   - Train Images: {counts['train']:,} 장")
-    print(f"   - Val Images:   {counts['val']:,} 장")
-    print(f"   - YAML Path:    {yaml_path}")
-    
-    return yaml_path
\ No newline at end of file
+    return result
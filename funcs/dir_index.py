@@ -0,0 +1,44 @@
+import os
+
+# ==========================================
+# 1. os.scandir 기반 디렉토리 인덱스
+# ==========================================
+# NAS에서는 파일마다 exists()/is_symlink()를 호출하는 것이 가장 비싼 작업입니다.
+# 폴더를 한 번만 나열해 메모리에 올려두고, 이후 조회는 dict/set 연산으로 처리합니다.
+
+def list_dir(directory):
+    """
+    폴더를 os.scandir로 한 번 읽어 {파일명: DirEntry}를 반환합니다. 폴더가 없으면 None을 반환합니다.
+    (DirEntry의 is_symlink()/is_dir()은 대부분 추가 stat 없이 동작합니다.)
+    """
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name: entry for entry in it}
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def scan_files(directory, suffix):
+    """
+    폴더에서 suffix로 끝나는 일반 파일만 골라 {stem: DirEntry}를 반환합니다. 폴더가 없으면 빈 dict.
+    """
+    entries = list_dir(directory) or {}
+    return {name[:-len(suffix)]: entry for name, entry in entries.items()
+            if name.endswith(suffix) and entry.is_file()}
+
+
+def is_valid_link(entry, expected_target):
+    """
+    목적지 폴더의 DirEntry가 유효한지 확인합니다.
+    - 일반 파일이면 유효
+    - 심볼릭 링크가 expected_target을 가리키면 stat 없이 유효 (readlink 1회)
+    - 다른 곳을 가리키는 링크만 실제 대상이 존재하는지 stat으로 확인합니다.
+    """
+    if not entry.is_symlink():
+        return True
+    try:
+        if os.readlink(entry.path) == str(expected_target):
+            return True
+    except OSError:
+        return False
+    return os.path.exists(entry.path)
@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import queue
+import threading
+from pathlib import Path
+
+# ==========================================
+# 1. 비동기 지표 로거 (로컬 JSONL 우선 기록 + WandB 비동기 전달)
+# ==========================================
+# <run_dir>/
+#   metrics.jsonl         : {'time', 'metrics'} 한 줄씩 append (네트워크와 무관하게 항상 기록)
+#   metrics.jsonl.synced  : WandB로 전달을 마친 줄 수 (이후 줄은 upload_pending()으로 나중에 업로드)
+#   metrics.jsonl.meta    : WandB run id / project / name (나중에 같은 run으로 이어서 업로드)
+SYNCED_SUFFIX = ".synced"
+META_SUFFIX = ".meta"
+
+
+def _read_synced(log_path):
+    try:
+        with open(str(log_path) + SYNCED_SUFFIX, 'r') as f:
+            return int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+def _write_synced(log_path, count):
+    tmp_path = f"{log_path}{SYNCED_SUFFIX}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(str(count))
+    os.replace(tmp_path, str(log_path) + SYNCED_SUFFIX)
+
+
+def read_records(log_path):
+    """
+    metrics.jsonl의 유효한 기록을 순서대로 읽습니다. 중단 중 잘린 줄은 건너뛰고 다음 줄부터 계속 읽습니다.
+    (written / synced 줄 수는 모두 이 유효 기록 기준입니다)
+    """
+    records = []
+    try:
+        with open(log_path, 'r') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+def _repair_tail(log_path):
+    """
+    이전 실행이 줄 중간에서 끝났으면(마지막 바이트가 개행이 아님) 이어 쓰기 전에 정리합니다.
+    끝까지 기록된 JSON이면 개행만 붙이고, 잘린 줄이면 마지막 개행 뒤를 잘라냅니다.
+    """
+    try:
+        with open(log_path, 'rb+') as f:
+            data = f.read()
+            if not data or data.endswith(b"\n"):
+                return
+            tail_start = data.rfind(b"\n") + 1
+            try:
+                json.loads(data[tail_start:])
+                f.write(b"\n")
+            except ValueError:
+                f.truncate(tail_start)
+    except OSError:
+        pass
+
+
+def _wandb_run():
+    try:
+        import wandb
+    except ImportError:
+        return None
+    return wandb.run
+
+
+class AsyncMetricLogger:
+    """
+    학습 루프에서는 log()로 큐에 넣기만 하고, 백그라운드 스레드가 모아서
+    1) 로컬 JSONL에 먼저 append 한 뒤 2) WandB run이 있으면 전달합니다.
+    - 큐가 가득 차면 (WandB 호출이 오래 멈춘 경우) 새 항목은 버리고 dropped에 셉니다. 학습은 기다리지 않습니다.
+    - WandB 전달이 한 번 실패하면 이후 항목은 로컬에만 남기고, upload_pending()으로 순서대로 올립니다.
+    """
+
+    def __init__(self, log_path, use_wandb=True, max_queue=10000):
+        self.log_path = Path(log_path)
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self.use_wandb = use_wandb
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.dropped = 0
+        self.forward_error = None
+
+        # 이전 실행(Resume)에서 전달하지 못한 줄이 있으면 이번 실행에서는 전달하지 않고 로컬에 이어 씁니다.
+        _repair_tail(self.log_path)
+        self.synced = _read_synced(self.log_path)
+        self.written = len(read_records(self.log_path))
+        self.forwarding = use_wandb and self.synced == self.written
+
+        run = _wandb_run() if use_wandb else None
+        if run is not None:
+            with open(str(self.log_path) + META_SUFFIX, 'w') as f:
+                json.dump({'id': run.id, 'project': run.project, 'name': run.name}, f, indent=2)
+
+        self._thread = threading.Thread(target=self._worker, name="AsyncMetricLogger", daemon=True)
+        self._thread.start()
+
+    def log(self, metrics):
+        """
+        [학습 스레드] 지표 dict를 큐에 넣고 바로 반환합니다.
+        """
+        record = {'time': time.time(), 'metrics': {k: (float(v) if hasattr(v, '__float__') else v)
+                                                   for k, v in metrics.items()}}
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _worker(self):
+        stop = False
+        while not stop:
+            batch = [self.queue.get()]
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                stop = True
+            if not batch:
+                continue
+
+            with open(self.log_path, 'a') as f:
+                for record in batch:
+                    f.write(json.dumps(record) + "\n")
+            self.written += len(batch)
+            self._forward(batch)
+
+    def _forward(self, batch):
+        if not self.forwarding:
+            return
+        run = _wandb_run()
+        if run is None:
+            self.forwarding = False
+            return
+        try:
+            for record in batch:
+                run.log(record['metrics'])
+                self.synced += 1
+        except Exception as e:
+            self.forward_error = str(e)
+            self.forwarding = False
+        _write_synced(self.log_path, self.synced)
+
+    def close(self, timeout=30):
+        """
+        남은 항목을 모두 기록하고 스레드를 종료합니다. 반환값: WandB로 아직 전달하지 못한 줄 수
+        """
+        self.queue.put(None)
+        self._thread.join(timeout)
+        pending = self.written - self.synced if self.use_wandb else 0
+        if self.forward_error:
+            print(f"⚠️ WandB 전달 실패 (로컬에 기록됨): {self.forward_error}")
+        if pending:
+            print(f"💾 WandB 미전달 {pending}건 -> {self.log_path} (upload_pending으로 나중에 업로드)")
+        return pending
+
+
+# ==========================================
+# 2. 오프라인 기록 업로드
+# ==========================================
+def upload_pending(log_path, project=None, name=None):
+    """
+    metrics.jsonl에서 아직 WandB로 전달하지 못한 줄을 순서대로 업로드합니다.
+    학습 때 WandB run이 있었다면 같은 run id로 이어서 기록합니다. 반환값: 업로드한 줄 수
+    """
+    import wandb
+
+    records = read_records(log_path)
+    synced = _read_synced(log_path)
+    pending = records[synced:]
+    if not pending:
+        return 0
+
+    meta = {}
+    try:
+        with open(str(log_path) + META_SUFFIX, 'r') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    wandb.init(project=meta.get('project') or project, name=meta.get('name') or name,
+               id=meta.get('id'), resume="allow", dir=str(Path(log_path).parent))
+    try:
+        for record in pending:
+            wandb.log(record['metrics'])
+            synced += 1
+    finally:
+        _write_synced(log_path, synced)
+        wandb.finish()
+    return len(pending)
@@ -0,0 +1,336 @@
+import os
+import json
+import time
+import fcntl
+import shutil
+import hashlib
+import contextlib
+import yaml
+import cv2
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
+
+from funcs.dir_index import list_dir
+from funcs.image_utils import resize_long_side
+
+# ==========================================
+# 1. 로컬 SSD 프레임 캐시 (Content Hash + LRU)
+# ==========================================
+# <cache_dir>/
+#   objects/<hash[:2]>/<hash>[_<imgsz>].jpg  : 프레임 실체 (내용 해시 기준, step1/15/30 간 공유)
+#   index.json                                : 원본 경로 -> 해시, 객체별 크기 / 마지막 사용 시각
+#   datasets/<name>/                          : 캐시 객체를 가리키는 로컬 data.yaml + images/labels
+#   pins/<pid>.json                           : 학습 중인 프로세스가 쓰는 객체 목록 (프로세스가 끝나면 무효)
+#   .lock                                     : 스윕처럼 여러 학습이 같은 캐시를 쓸 때 stage / evict / save 직렬화
+INDEX_NAME = "index.json"
+LOCK_NAME = ".lock"
+PINS_DIR_NAME = "pins"
+
+
+@contextlib.contextmanager
+def cache_lock(cache_dir):
+    """
+    cache_dir 단위 배타적 파일 잠금 (flock). 잠금 안에서 index를 읽고 저장해야 다른 프로세스의 기록을 덮어쓰지 않습니다.
+    """
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with open(cache_dir / LOCK_NAME, 'w') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def write_pins(cache_dir, obj_paths):
+    """
+    현재 프로세스가 쓰는 객체 목록을 pins/<pid>.json에 기록합니다. (다른 프로세스의 evict에서 제외됨)
+    """
+    pins_dir = Path(cache_dir) / PINS_DIR_NAME
+    pins_dir.mkdir(parents=True, exist_ok=True)
+    pin_path = pins_dir / f"{os.getpid()}.json"
+    tmp_path = pin_path.with_suffix(".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(sorted({str(p) for p in obj_paths}), f)
+    os.replace(tmp_path, pin_path)
+
+
+def load_active_pins(cache_dir):
+    """
+    아직 실행 중인 프로세스들의 pin 객체 합집합. 끝난 프로세스의 pin 파일은 삭제합니다.
+    """
+    pinned = set()
+    for name, entry in (list_dir(Path(cache_dir) / PINS_DIR_NAME) or {}).items():
+        if not name.endswith(".json"):
+            continue
+        try:
+            pid = int(name[:-5])
+        except ValueError:
+            continue
+        if pid != os.getpid() and not _pid_alive(pid):
+            os.remove(entry.path)
+            continue
+        try:
+            with open(entry.path, 'r') as f:
+                pinned.update(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return pinned
+
+
+def _source_key(src_path):
+    """
+    원본 파일을 다시 읽지 않고 식별하기 위한 키 (실제 경로 + 크기 + mtime)
+    """
+    st = os.stat(src_path)
+    return f"{os.path.realpath(src_path)}|{st.st_size}|{st.st_mtime_ns}"
+
+
+def _materialize(src_path, objects_dir, imgsz):
+    """
+    [워커] 원본을 한 번 읽어 내용 해시를 계산하고, 캐시 객체가 없으면 (필요 시 리사이즈하여) 씁니다.
+    반환값: (객체 키, 객체 경로, 크기)
+    """
+    with open(src_path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha1(data).hexdigest()
+    suffix = Path(src_path).suffix.lower()
+    key = f"{digest}_{imgsz}" if imgsz else digest
+    obj_path = objects_dir / digest[:2] / f"{key}{'.jpg' if imgsz else suffix}"
+
+    if not obj_path.exists():
+        obj_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = obj_path.with_name(f"{obj_path.name}.{os.getpid()}.{id(data)}.tmp")
+        if imgsz:
+            img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+            if img is None:
+                raise ValueError(f"이미지를 디코딩할 수 없습니다: {src_path}")
+            ok, buf = cv2.imencode(".jpg", resize_long_side(img, imgsz), [cv2.IMWRITE_JPEG_QUALITY, 95])
+            data = buf.tobytes()
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, obj_path)
+
+    return key, obj_path, obj_path.stat().st_size
+
+
+class FrameCache:
+    """
+    노드 로컬 디렉토리에 프레임을 내용 해시 기준으로 보관하는 캐시입니다.
+    용량(max_bytes)을 넘으면 가장 오래 사용하지 않은 객체부터 삭제(LRU)합니다.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.max_bytes = max_bytes
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+        self.index = {'sources': {}, 'objects': {}}
+        try:
+            with open(self.cache_dir / INDEX_NAME, 'r') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    @property
+    def total_bytes(self):
+        return sum(obj['size'] for obj in self.index['objects'].values())
+
+    def stage(self, src_paths, imgsz=None, num_workers=8):
+        """
+        원본 파일들을 캐시에 올리고 {원본 경로: 캐시 객체 경로}를 반환합니다.
+        이미 캐시된 원본(경로/크기/mtime 동일)은 다시 읽지 않습니다.
+        """
+        now = time.time()
+        staged, todo = {}, []
+        hits = 0
+
+        for src in src_paths:
+            src_key = f"{_source_key(src)}|{imgsz or 0}"
+            obj_key = self.index['sources'].get(src_key)
+            obj = self.index['objects'].get(obj_key)
+            if obj is not None and Path(obj['path']).exists():
+                obj['last_used'] = now
+                staged[src] = Path(obj['path'])
+                hits += 1
+            else:
+                todo.append((src, src_key))
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            futures = [(src, src_key, executor.submit(_materialize, src, self.objects_dir, imgsz))
+                       for src, src_key in todo]
+            for src, src_key, future in tqdm(futures, desc="Staging Frames"):
+                obj_key, obj_path, size = future.result()
+                self.index['sources'][src_key] = obj_key
+                self.index['objects'][obj_key] = {'path': str(obj_path), 'size': size, 'last_used': now}
+                staged[src] = obj_path
+
+        print(f"💾 캐시 적중 {hits:,}개 | 새로 복사 {len(todo):,}개")
+        return staged
+
+    def evict(self, pinned=()):
+        """
+        용량을 넘으면 pinned(학습 중인 데이터셋이 쓰는 객체)를 제외하고 LRU 순서로 삭제합니다.
+        """
+        pinned = {str(p) for p in pinned}
+        total = self.total_bytes
+        if total <= self.max_bytes:
+            return 0
+
+        removed = 0
+        for key, obj in sorted(self.index['objects'].items(), key=lambda kv: kv[1]['last_used']):
+            if total <= self.max_bytes:
+                break
+            if obj['path'] in pinned:
+                continue
+            try:
+                os.remove(obj['path'])
+            except FileNotFoundError:
+                pass
+            total -= obj['size']
+            del self.index['objects'][key]
+            removed += 1
+
+        # 삭제된 객체를 가리키는 원본 매핑 정리
+        self.index['sources'] = {k: v for k, v in self.index['sources'].items() if v in self.index['objects']}
+
+        if total > self.max_bytes:
+            print(f"⚠️ 현재 데이터셋만으로 캐시 용량을 초과합니다 ({total / 1e9:.1f}GB > {self.max_bytes / 1e9:.1f}GB)")
+        return removed
+
+    def save(self):
+        tmp_path = self.cache_dir / f"{INDEX_NAME}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.cache_dir / INDEX_NAME)
+
+
+# ==========================================
+# 2. data.yaml 단위 Staging
+# ==========================================
+def _img2label_path(img_path):
+    # Ultralytics img2label_paths와 같은 규칙: 마지막 /images/ -> /labels/, 확장자 -> .txt
+    sa, sb = f"{os.sep}images{os.sep}", f"{os.sep}labels{os.sep}"
+    return sb.join(str(img_path).rsplit(sa, 1)).rsplit(".", 1)[0] + ".txt"
+
+
+def list_split_images(root, split_value):
+    """
+    data.yaml의 train/val 항목(폴더 또는 목록 .txt)에서 (목적지 파일명, 원본 이미지 경로, 라벨 경로) 목록을 만듭니다.
+    """
+    split_path = root / split_value
+    items = []
+    if split_path.suffix == ".txt":
+        parent = str(split_path.parent) + os.sep
+        with open(split_path, 'r') as f:
+            for line in f.read().splitlines():
+                if not line:
+                    continue
+                img_path = line.replace("./", parent) if line.startswith("./") else line
+                # 목록 모드는 이미지 경로가 images/<safe_common_path>/<stem> 이므로 두 단계를 이어 고유 이름을 만듭니다.
+                name = f"{Path(img_path).parent.name}_{Path(img_path).name}"
+                items.append((name, img_path, _img2label_path(img_path)))
+    else:
+        for name, entry in sorted((list_dir(split_path) or {}).items()):
+            items.append((name, entry.path, _img2label_path(entry.path)))
+    return items
+
+
+def staged_view_dir(data_yaml, cache_dir, imgsz=None):
+    """
+    stage_dataset이 만드는 로컬 데이터셋 폴더. 축소 크기가 다르면 가리키는 객체가 다르므로 폴더를 나눕니다.
+    (같은 data.yaml을 imgsz만 바꿔 동시에 학습해도 서로의 링크를 바꾸지 않음)
+    """
+    name = Path(data_yaml).parent.name
+    return Path(cache_dir) / "datasets" / (f"{name}_{imgsz}" if imgsz else name)
+
+
+def stage_dataset(data_yaml, cache_dir, max_gb=200, imgsz=None, num_workers=8, refresh_labels=False):
+    """
+    data.yaml이 가리키는 학습/검증 프레임을 로컬 캐시로 올리고, 캐시를 가리키는 로컬 data.yaml 경로를 반환합니다.
+    - imgsz를 주면 긴 변 기준으로 미리 축소해 저장합니다. (라벨은 정규화 좌표이므로 그대로 사용)
+    - 같은 프레임을 공유하는 step1/15/30 데이터셋은 캐시 객체를 재사용합니다.
+    - 라벨은 로컬에 없을 때만 복사합니다. 라벨을 다시 변환했다면 refresh_labels=True로 실행합니다.
+    - 스윕처럼 여러 학습 프로세스가 같은 cache_dir를 쓰면 cache_lock으로 한 번에 하나씩 staging하고,
+      학습 중인 다른 프로세스가 pin한 객체는 evict하지 않습니다.
+    """
+    with cache_lock(cache_dir):
+        return _stage_dataset(data_yaml, cache_dir, max_gb, imgsz, num_workers, refresh_labels)
+
+
+def _stage_dataset(data_yaml, cache_dir, max_gb, imgsz, num_workers, refresh_labels):
+    data_yaml = Path(data_yaml)
+    with open(data_yaml, 'r') as f:
+        data_cfg = yaml.safe_load(f)
+    root = Path(data_cfg.get('path') or data_yaml.parent)
+
+    cache = FrameCache(cache_dir, int(max_gb * 1e9))
+    view_dir = staged_view_dir(data_yaml, cache_dir, imgsz)
+    print(f"🚚 [Staging] {data_yaml} -> {view_dir} (imgsz: {imgsz or '원본'})")
+
+    local_cfg = dict(data_cfg)
+    local_cfg['path'] = str(view_dir)
+    pinned = []
+
+    for split in ['train', 'val']:
+        items = list_split_images(root, data_cfg[split])
+        staged = cache.stage([img_path for _, img_path, _ in items], imgsz=imgsz, num_workers=num_workers)
+
+        image_dir = view_dir / 'images' / split
+        label_dir = view_dir / 'labels' / split
+        image_dir.mkdir(parents=True, exist_ok=True)
+        label_dir.mkdir(parents=True, exist_ok=True)
+        existing_images = list_dir(image_dir) or {}
+        existing_labels = set(list_dir(label_dir) or {})
+
+        wanted = set()
+        for name, img_path, label_path in items:
+            obj_path = staged[img_path]
+            pinned.append(obj_path)
+            image_name = f"{Path(name).stem}{obj_path.suffix}"
+            label_name = f"{Path(name).stem}.txt"
+            wanted.update([image_name, label_name])
+
+            entry = existing_images.get(image_name)
+            if entry is not None and (not entry.is_symlink() or os.readlink(entry.path) != str(obj_path)):
+                os.unlink(entry.path)
+                entry = None
+            if entry is None:
+                os.symlink(obj_path, image_dir / image_name)
+            if (refresh_labels or label_name not in existing_labels) and os.path.exists(label_path):
+                shutil.copyfile(label_path, label_dir / label_name)
+
+        # 데이터셋에서 빠진 프레임 정리
+        for name, entry in existing_images.items():
+            if name not in wanted:
+                os.unlink(entry.path)
+        for name in existing_labels:
+            if name not in wanted and name.endswith(".txt"):
+                os.remove(label_dir / name)
+
+        local_cfg[split] = f"images/{split}"
+
+    # 이 프로세스가 쓰는 객체를 pin으로 남기고, 학습 중인 다른 프로세스의 pin과 함께 evict에서 제외합니다.
+    write_pins(cache_dir, pinned)
+    removed = cache.evict(load_active_pins(cache_dir))
+    cache.save()
+
+    local_yaml = view_dir / "data.yaml"
+    with open(local_yaml, 'w') as f:
+        yaml.dump(local_cfg, f, sort_keys=False)
+
+    print(f"✅ [Staging 완료] 캐시 사용량 {cache.total_bytes / 1e9:.2f}GB / {max_gb}GB | LRU 삭제 {removed}개")
+    return local_yaml
@@ -0,0 +1,101 @@
+import os
+import time
+import cv2
+from pathlib import Path
+
+from funcs.dir_index import list_dir
+from funcs.image_utils import resize_long_side
+
+# ==========================================
+# 1. 축소 프레임 피라미드 (1_FRAME -> 1_FRAME_<size>)
+# ==========================================
+# 긴 변을 size로 맞춘 프레임을 원본과 같은 상대 경로/파일명으로 저장합니다.
+# 패딩 없이 비율만 유지하므로 5_YOLO_TXT의 정규화 좌표를 그대로 사용할 수 있고,
+# 데이터셋 빌더는 frame_dir_name="1_FRAME_640" 처럼 폴더 이름만 바꿔 가리키면 됩니다.
+
+def pyramid_dir_name(size):
+    return f"1_FRAME_{size}"
+
+
+def _write_image(dst_path, img, params):
+    """
+    인코딩 결과를 임시 파일에 쓴 뒤 교체합니다. 중간에 멈추거나 디스크가 가득 차도 잘린 파일이 남지 않으므로
+    다음 실행에서 (이미 있는 파일로 착각해 건너뛰지 않고) 다시 만듭니다.
+    """
+    ok, buf = cv2.imencode(Path(dst_path).suffix, img, params)
+    if not ok:
+        raise ValueError(f"이미지를 인코딩할 수 없습니다: {dst_path}")
+    tmp_path = dst_path.with_name(f"{dst_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(buf.tobytes())
+        os.replace(tmp_path, dst_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def build_folder_pyramid(common_path, data_dir, sizes=(640,), quality=95, overwrite=False):
+    """
+    [워커] common_path 하나의 프레임을 sizes 별로 축소 저장합니다. 이미 있는 파일은 건너뜁니다.
+    원본은 프레임당 한 번만 디코딩하여 모든 size를 만듭니다.
+    반환값: {'common_path', 'frames', 'written', 'src_bytes', 'dst_bytes': {size: bytes}, 'error'}
+    """
+    data_dir = Path(data_dir)
+    result = {'common_path': common_path, 'frames': 0, 'written': 0,
+              'src_bytes': 0, 'dst_bytes': {size: 0 for size in sizes}, 'error': None}
+
+    try:
+        src_dir = data_dir / "1_FRAME" / common_path
+        src_entries = list_dir(src_dir)
+        if src_entries is None:
+            return result
+
+        dst_dirs = {size: data_dir / pyramid_dir_name(size) / common_path for size in sizes}
+        dst_existing = {}
+        for size, dst_dir in dst_dirs.items():
+            dst_dir.mkdir(parents=True, exist_ok=True)
+            dst_existing[size] = list_dir(dst_dir) or {}
+
+        for name, entry in sorted(src_entries.items()):
+            if not name.endswith((".jpg", ".png")):
+                continue
+            result['frames'] += 1
+            result['src_bytes'] += entry.stat().st_size
+
+            todo = [size for size in sizes if overwrite or name not in dst_existing[size]]
+            for size in sizes:
+                if size not in todo:
+                    result['dst_bytes'][size] += dst_existing[size][name].stat().st_size
+            if not todo:
+                continue
+
+            img = cv2.imread(entry.path)
+            if img is None:
+                continue
+
+            for size in todo:
+                dst_path = dst_dirs[size] / name
+                params = [cv2.IMWRITE_JPEG_QUALITY, quality] if name.endswith(".jpg") else []
+                _write_image(dst_path, resize_long_side(img, size), params)
+                result['dst_bytes'][size] += os.path.getsize(dst_path)
+                result['written'] += 1
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+
+def measure_decode_time(image_paths):
+    """
+    이미지들을 cv2.imread로 디코딩하는 데 걸린 프레임당 평균 시간(ms)을 반환합니다.
+    """
+    image_paths = [str(p) for p in image_paths]
+    if not image_paths:
+        return 0.0
+    start_t = time.perf_counter()
+    for path in image_paths:
+        cv2.imread(path)
+    return (time.perf_counter() - start_t) * 1000 / len(image_paths)
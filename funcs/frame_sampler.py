@@ -0,0 +1,172 @@
+import math
+import numpy as np
+from pathlib import Path
+
+from funcs.label_shards import LabelShard, ROW_DIM, shard_dir_for
+from funcs.frame_source import frame_number
+from funcs.data_utils import sample_positions
+
+# ==========================================
+# 1. 라벨 키포인트 로드 (Shard 우선, 없으면 5_YOLO_TXT)
+# ==========================================
+# 샘플링 방식
+#   stride    : 정렬된 라벨 stem을 step 간격으로 선택 (기존 방식, 라벨 내용을 읽지 않음)
+#   motion    : 프레임 간 자세 변화량의 누적합을 균등 분할 -> 움직임이 큰 구간은 촘촘히, 정지 구간은 드물게
+#   diversity : 정규화한 자세 벡터에 farthest point sampling -> 서로 가장 다른 자세부터 선택
+# 어느 방식이든 폴더당 선택 수(예산)는 stride와 같은 ceil(N / step)이며,
+# max_frames를 주면 step과 무관하게 폴더당 최대 max_frames개로 제한합니다. (step=1에서도 중복 프레임을 줄임)
+SAMPLING_METHODS = ("stride", "motion", "diversity")
+MOTION_FLOOR = 0.1   # 정지 구간에도 평균 움직임의 이 비율만큼 가중치를 주어 완전히 비지 않게 합니다.
+
+
+def load_label_rows(data_dir, common_path, stems):
+    """
+    stems 순서대로 (N, 40) 정규화 라벨 행을 읽습니다.
+    shard에 모든 stem이 있으면 shard에서, 아니면 5_YOLO_TXT 파일의 첫 줄을 읽습니다. (읽을 수 없는 행은 0)
+    """
+    shard = LabelShard.open(shard_dir_for(data_dir, common_path))
+    if shard is not None and all(stem in shard for stem in stems):
+        return np.asarray(shard.rows[[shard.index[stem] for stem in stems]], dtype=np.float32)
+
+    rows = np.zeros((len(stems), ROW_DIM), dtype=np.float32)
+    txt_dir = Path(data_dir) / "5_YOLO_TXT" / common_path
+    for i, stem in enumerate(stems):
+        try:
+            with open(txt_dir / f"{stem}.txt", 'r') as f:
+                values = f.readline().split()[1:]
+            if len(values) == ROW_DIM:
+                rows[i] = np.array(values, dtype=np.float32)
+        except (OSError, ValueError):
+            pass
+    return rows
+
+
+# ==========================================
+# 2. 자세 특징 (폴더 단위 벡터 연산)
+# ==========================================
+def pose_features(rows):
+    """
+    (N, 40) 라벨 행 -> (N, 24) 자세 벡터. 보이는 키포인트의 중심을 원점으로, 박스 크기(sqrt(w*h))로 나누어
+    위치 / 카메라 거리와 무관하게 만들고, 보이지 않는 키포인트는 0으로 둡니다.
+    """
+    xy = rows[:, 4:].reshape(len(rows), -1, 3)[..., :2]
+    vis = rows[:, 4:].reshape(len(rows), -1, 3)[..., 2] > 0
+    count = np.maximum(vis.sum(axis=1, keepdims=True), 1)
+    center = (xy * vis[..., None]).sum(axis=1) / count
+    scale = np.sqrt(np.maximum(rows[:, 2] * rows[:, 3], 1e-6))
+    feats = (xy - center[:, None]) / scale[:, None, None] * vis[..., None]
+    return feats.reshape(len(rows), -1)
+
+
+def pose_motion(rows):
+    """
+    (N, 40) 라벨 행 -> (N,) 이전 프레임 대비 평균 키포인트 이동량 (박스 크기로 정규화, 첫 프레임은 0).
+    두 프레임 모두 보이는 키포인트만 사용합니다. 몸 전체의 이동(걷기)과 자세 변화가 함께 반영됩니다.
+    """
+    kpts = rows[:, 4:].reshape(len(rows), -1, 3)
+    motion = np.zeros(len(rows), dtype=np.float32)
+    if len(rows) < 2:
+        return motion
+
+    both = (kpts[1:, :, 2] > 0) & (kpts[:-1, :, 2] > 0)
+    scale = np.sqrt(np.maximum(rows[1:, 2] * rows[1:, 3], 1e-6))
+    dist = np.linalg.norm(kpts[1:, :, :2] - kpts[:-1, :, :2], axis=2) / scale[:, None]
+    count = both.sum(axis=1)
+    motion[1:] = np.where(count > 0, (dist * both).sum(axis=1) / np.maximum(count, 1), 0.0)
+    return motion
+
+
+# ==========================================
+# 3. 예산 내 프레임 선택
+# ==========================================
+def motion_positions(motion, budget, floor=MOTION_FLOOR):
+    """
+    누적 움직임을 budget개 구간으로 균등 분할하여 각 구간의 중앙 프레임을 고릅니다.
+    겹쳐서 부족한 수는 선택되지 않은 프레임 중 움직임이 큰 순서로 채웁니다.
+    """
+    n = len(motion)
+    if budget >= n:
+        return np.arange(n)
+    mean = float(motion.mean())
+    weight = motion + floor * (mean if mean > 0 else 1.0)
+    cum = np.cumsum(weight) - weight[0]
+    targets = (np.arange(budget) + 0.5) * cum[-1] / budget
+    selected = np.unique(np.clip(np.searchsorted(cum, targets), 0, n - 1))
+
+    if len(selected) < budget:
+        rest = np.setdiff1d(np.arange(n), selected)
+        extra = rest[np.argsort(-weight[rest], kind='stable')[:budget - len(selected)]]
+        selected = np.union1d(selected, extra)
+    return selected
+
+
+def diversity_positions(feats, budget):
+    """
+    farthest point sampling: 첫 프레임에서 시작해, 이미 고른 프레임들과의 최소 거리가 가장 큰 프레임을 반복 선택합니다.
+    반복마다 폴더 전체 (N, D) 거리 갱신 한 번이므로 O(N * budget * D) 입니다.
+    """
+    n = len(feats)
+    if budget >= n:
+        return np.arange(n)
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0] = 0
+    min_dist = np.linalg.norm(feats - feats[0], axis=1)
+    min_dist[0] = -np.inf
+    for k in range(1, budget):
+        i = int(np.argmax(min_dist))
+        selected[k] = i
+        min_dist = np.minimum(min_dist, np.linalg.norm(feats - feats[i], axis=1))
+        min_dist[i] = -np.inf
+    return np.sort(selected)
+
+
+def folder_budget(num_frames, step, max_frames=None):
+    """
+    폴더 하나의 선택 수: ceil(N / step), max_frames가 있으면 그 이하로 제한합니다.
+    """
+    budget = math.ceil(num_frames / step)
+    return min(budget, max_frames) if max_frames else budget
+
+
+def stride_positions(num_frames, step, max_frames=None):
+    """
+    step 간격 위치. max_frames에 걸리면 같은 수만큼 폴더 전체에 균등한 간격으로 고릅니다.
+    """
+    budget = folder_budget(num_frames, step, max_frames)
+    if budget >= math.ceil(num_frames / step):
+        return np.asarray(sample_positions(num_frames, step), dtype=np.int64)
+    return np.unique(np.linspace(0, num_frames - 1, budget).round().astype(np.int64))
+
+
+def select_positions(rows, step, method="motion", max_frames=None):
+    """
+    (N, 40) 라벨 행에서 folder_budget(N, step, max_frames)개 프레임 위치(정렬된 int 배열)를 고릅니다.
+    """
+    n = len(rows)
+    budget = folder_budget(n, step, max_frames)
+    if method == "stride":
+        return stride_positions(n, step, max_frames)
+    if method == "motion":
+        return motion_positions(pose_motion(rows), budget)
+    if method == "diversity":
+        return diversity_positions(pose_features(rows), budget)
+    raise ValueError(f"지원하지 않는 sampling입니다: {method} ({' | '.join(SAMPLING_METHODS)})")
+
+
+def sample_folder_positions(data_dir, common_path, label_stems, steps, method="stride", max_frames=None):
+    """
+    폴더 하나에서 step별 선택 위치 {step: [label_stems 인덱스...]}를 반환합니다.
+    stride는 라벨 내용을 읽지 않고, 나머지 방식은 라벨을 한 번만 읽어 모든 step에 재사용합니다.
+    stem은 번호가 0으로 채워져 있지 않으므로(frame_1, frame_10, frame_100, ...) 문자열 순서가 아닌
+    프레임 번호 순서로 간격 / 움직임을 계산하고, 결과는 label_stems의 인덱스로 되돌려 반환합니다.
+    max_frames: step과 무관한 폴더당 최대 선택 수 (None이면 ceil(N / step))
+    """
+    steps = steps if isinstance(steps, (list, tuple)) else [steps]
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"지원하지 않는 sampling입니다: {method} ({' | '.join(SAMPLING_METHODS)})")
+    order = sorted(range(len(label_stems)), key=lambda i: (frame_number(label_stems[i]), label_stems[i]))
+    if method == "stride":
+        return {s: sorted(order[p] for p in stride_positions(len(order), s, max_frames)) for s in steps}
+
+    rows = load_label_rows(data_dir, common_path, [label_stems[i] for i in order])
+    return {s: sorted(order[p] for p in select_positions(rows, s, method, max_frames)) for s in steps}
@@ -0,0 +1,172 @@
+import os
+import re
+import cv2
+from pathlib import Path
+
+from funcs.dir_index import list_dir
+from funcs.image_utils import read_image_size
+
+# ==========================================
+# 1. 프레임 소스 (1_FRAME 폴더 / 3_MP4 영상)
+# ==========================================
+# 두 소스 모두 (stem, BGR 이미지)를 순서대로 내며, stem은 추출 프레임 파일명과 같은 "frame_<번호>"입니다.
+# 따라서 5_YOLO_TXT 라벨이나 추론 결과를 어느 소스에서 읽었는지와 관계없이 같은 키로 맞출 수 있습니다.
+# 영상 소스는 건너뛰는 프레임을 grab()만 하고 decode(retrieve)하지 않으므로 step N 샘플링이 저렴합니다.
+FRAME_STEM_FORMAT = "frame_{}"
+_FRAME_NUM_RE = re.compile(r"(\d+)$")
+
+
+def frame_number(stem):
+    match = _FRAME_NUM_RE.search(stem)
+    return int(match.group(1)) if match else -1
+
+
+class FrameDirSource:
+    """
+    1_FRAME/<common_path> 폴더의 프레임을 번호 순(frame_0, frame_1, ...)으로 읽습니다.
+    - step: step 간격으로만 읽기 (번호 순 위치 기준)
+    - stems: 주어지면 이 stem들만 읽기 (step보다 우선)
+    """
+
+    def __init__(self, frame_dir, step=1, stems=None):
+        self.frame_dir = Path(frame_dir)
+        entries = list_dir(self.frame_dir) or {}
+        frames = {}
+        for name in entries:
+            stem, suffix = os.path.splitext(name)
+            if suffix == ".jpg" or (suffix == ".png" and stem not in frames):
+                frames[stem] = name
+        ordered = sorted(frames, key=frame_number)
+        if stems is not None:
+            stems = set(stems)
+            ordered = [stem for stem in ordered if stem in stems]
+        else:
+            ordered = ordered[::step]
+        self.paths = [(stem, self.frame_dir / frames[stem]) for stem in ordered]
+
+    def __len__(self):
+        return len(self.paths)
+
+    @property
+    def stems(self):
+        return [stem for stem, _ in self.paths]
+
+    @property
+    def size(self):
+        return read_image_size(self.paths[0][1]) if self.paths else None
+
+    def __iter__(self):
+        for stem, path in self.paths:
+            yield stem, cv2.imread(str(path))
+
+
+class VideoFileSource:
+    """
+    영상 파일을 처음부터 순차 디코딩하여 (frame_<번호>, 이미지)를 냅니다. 번호는 0부터 시작합니다.
+    - step: step 간격 프레임만 decode (나머지는 grab()으로 건너뜀)
+    - stems: 주어지면 이 stem들만 decode (step보다 우선, 마지막 stem 이후에는 읽기를 멈춤)
+    """
+
+    def __init__(self, video_path, step=1, stems=None, stem_format=FRAME_STEM_FORMAT):
+        self.video_path = Path(video_path)
+        self.step = step
+        self.stem_format = stem_format
+        self.frame_numbers = None
+        if stems is not None:
+            self.frame_numbers = {frame_number(stem) for stem in stems}
+
+        cap = cv2.VideoCapture(str(self.video_path))
+        if not cap.isOpened():
+            raise FileNotFoundError(f"영상을 열 수 없습니다: {self.video_path}")
+        self.frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.fps = cap.get(cv2.CAP_PROP_FPS)
+        self._size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        cap.release()
+
+    def __len__(self):
+        # 컨테이너 헤더 기준 추정치 (일부 코덱은 실제 decode 수와 다를 수 있음)
+        if self.frame_numbers is not None:
+            return len([n for n in self.frame_numbers if 0 <= n < self.frame_count])
+        return (self.frame_count + self.step - 1) // self.step
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def stems(self):
+        # decode 없이 헤더의 프레임 수로 계산한 stem 목록
+        if self.frame_numbers is not None:
+            numbers = sorted(n for n in self.frame_numbers if 0 <= n < self.frame_count)
+        else:
+            numbers = range(0, self.frame_count, self.step)
+        return [self.stem_format.format(n) for n in numbers]
+
+    def _wanted(self, frame_idx):
+        if self.frame_numbers is not None:
+            return frame_idx in self.frame_numbers
+        return frame_idx % self.step == 0
+
+    def __iter__(self):
+        cap = cv2.VideoCapture(str(self.video_path))
+        last_wanted = max(self.frame_numbers) if self.frame_numbers else None
+        try:
+            frame_idx = 0
+            while last_wanted is None or frame_idx <= last_wanted:
+                if not cap.grab():
+                    break
+                if self._wanted(frame_idx):
+                    ok, img = cap.retrieve()
+                    if not ok:
+                        break
+                    yield self.stem_format.format(frame_idx), img
+                frame_idx += 1
+        finally:
+            cap.release()
+
+
+def resolve_video_path(data_dir, common_path, video_path=None):
+    """
+    metadata의 video_path가 존재하면 그대로, 아니면 DATA_DIR/3_MP4/<common_path>.mp4를 사용합니다.
+    """
+    if isinstance(video_path, str) and video_path and os.path.exists(video_path):
+        return Path(video_path)
+    return Path(data_dir) / "3_MP4" / f"{common_path}.mp4"
+
+
+def open_frame_source(data_dir, common_path, video_path=None, prefer="frames", step=1, stems=None,
+                      frame_dir_name="1_FRAME"):
+    """
+    common_path 하나의 프레임 소스를 엽니다.
+    - prefer="frames": 추출 프레임 폴더가 있으면 사용하고, 없으면 영상으로 대체
+    - prefer="video": 항상 영상에서 직접 decode (1_FRAME 추출 단계 불필요)
+    """
+    frame_dir = Path(data_dir) / frame_dir_name / common_path
+    if prefer == "frames" and frame_dir.is_dir():
+        return FrameDirSource(frame_dir, step, stems)
+    return VideoFileSource(resolve_video_path(data_dir, common_path, video_path), step, stems)
+
+
+# ==========================================
+# 2. 필요한 프레임만 추출
+# ==========================================
+def export_frames(source, output_dir, quality=95, overwrite=False):
+    """
+    소스의 프레임을 <output_dir>/<stem>.jpg 로 저장합니다. 이미 있는 파일은 건너뜁니다.
+    (VideoFileSource에 stems/step을 주면 학습에 쓰이는 프레임만 추출할 수 있습니다.)
+    반환값: (저장한 프레임 수, 건너뛴 프레임 수)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    existing = set(list_dir(output_dir) or {})
+
+    written, skipped = 0, 0
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+    for stem, img in source:
+        name = f"{stem}.jpg"
+        if not overwrite and name in existing:
+            skipped += 1
+            continue
+        cv2.imwrite(str(output_dir / name), img, params)
+        written += 1
+    return written, skipped
@@ -0,0 +1,172 @@
+import os
+import json
+import struct
+import cv2
+from pathlib import Path
+
+# ==========================================
+# 1. 헤더 기반 이미지 해상도 읽기 (픽셀 디코딩 없음)
+# ==========================================
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# 해상도 정보를 담고 있는 JPEG SOF 마커 (DHT/JPG/DAC 제외)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# 길이 필드가 없는 JPEG 마커 (TEM, RST0~7)
+JPEG_STANDALONE_MARKERS = {0x01} | set(range(0xD0, 0xD8))
+
+
+def _read_jpeg_size(f):
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+
+        # 채움(Fill) 0xFF 바이트 건너뛰기
+        marker = f.read(1)
+        while marker == b"\xff":
+            marker = f.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        if marker in (0xD9, 0xDA):  # EOI / SOS: SOF 없이 스캔 데이터가 시작됨
+            return None
+
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack(">H", length_bytes)[0]
+
+        if marker in JPEG_SOF_MARKERS:
+            sof = f.read(5)
+            if len(sof) < 5:
+                return None
+            height, width = struct.unpack(">xHH", sof)
+            return width, height
+
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def read_image_size(image_path):
+    """
+    JPEG/PNG 헤더만 읽어 (width, height)를 반환합니다. (보통 수백 바이트 I/O)
+    지원하지 않는 포맷이거나 헤더가 깨져 있으면 None을 반환합니다.
+    ※ EXIF 회전 정보는 반영하지 않습니다. (영상에서 추출한 프레임에는 EXIF가 없음)
+    """
+    try:
+        with open(image_path, 'rb') as f:
+            head = f.read(24)
+            if head.startswith(PNG_SIGNATURE) and head[12:16] == b"IHDR":
+                width, height = struct.unpack(">II", head[16:24])
+                return width, height
+            if head[:2] == b"\xff\xd8":
+                return _read_jpeg_size(f)
+    except OSError:
+        return None
+    return None
+
+
+def find_first_frame(frame_dir):
+    """
+    폴더 전체를 glob하지 않고 os.scandir로 훑다가 첫 번째 .jpg를 찾는 즉시 반환합니다.
+    .jpg가 없으면 처음 본 .png를, 둘 다 없으면 None을 반환합니다.
+    """
+    first_png = None
+    try:
+        with os.scandir(frame_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".jpg"):
+                    return Path(entry.path)
+                if first_png is None and entry.name.endswith(".png"):
+                    first_png = Path(entry.path)
+    except FileNotFoundError:
+        return None
+    return first_png
+
+
+def get_frame_size(frame_dir):
+    """
+    프레임 폴더의 해상도 (width, height)를 헤더만 읽어 구합니다. 프레임이 없거나 읽을 수 없으면 None.
+    """
+    frame_path = find_first_frame(frame_dir)
+    if frame_path is None:
+        return None
+    return read_image_size(frame_path)
+
+
+# ==========================================
+# 2. common_path 단위 해상도 캐시 (Sidecar JSON)
+# ==========================================
+class FrameSizeCache:
+    """
+    common_path -> {'size': [width, height], 'frame', 'mtime_ns', 'bytes'} 를 JSON 파일(sidecar)에 저장해 두고 재사용합니다.
+    해상도를 읽은 프레임 파일의 (mtime_ns, 크기)를 함께 저장하고, 조회 때마다 그 파일 하나만 stat하여
+    프레임을 다시 추출했거나 지웠으면(값이 다르거나 파일이 없으면) 헤더를 다시 읽습니다.
+    변경 사항은 save() 호출 시 기록됩니다.
+    """
+
+    def __init__(self, cache_path):
+        self.cache_path = Path(cache_path)
+        self.sizes = {}
+        self.dirty = False
+        try:
+            with open(self.cache_path, 'r') as f:
+                self.sizes = json.load(f)
+        except (OSError, ValueError):
+            self.sizes = {}
+
+    def get(self, common_path, frame_dir, refresh=False):
+        """
+        캐시된 해상도를 반환하고, 없거나 프레임이 바뀌었으면(또는 refresh=True) 헤더를 읽어 캐시를 갱신합니다.
+        """
+        entry = self.sizes.get(common_path)
+        if not refresh and isinstance(entry, dict):
+            try:
+                st = os.stat(Path(frame_dir) / entry['frame'])
+                if (st.st_mtime_ns, st.st_size) == (entry['mtime_ns'], entry['bytes']):
+                    return tuple(entry['size'])
+            except (OSError, KeyError):
+                pass
+
+        frame_path = find_first_frame(frame_dir)
+        size = read_image_size(frame_path) if frame_path is not None else None
+        if size is None:
+            if self.sizes.pop(common_path, None) is not None:
+                self.dirty = True
+            return None
+        st = os.stat(frame_path)
+        self.sizes[common_path] = {'size': list(size), 'frame': frame_path.name,
+                                   'mtime_ns': st.st_mtime_ns, 'bytes': st.st_size}
+        self.dirty = True
+        return size
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.sizes, f)
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+
+
+# ==========================================
+# 3. 리사이즈 (긴 변 기준, 비율 유지)
+# ==========================================
+def resize_long_side(img, size):
+    """
+    긴 변이 size가 되도록 비율을 유지하며 축소합니다. 이미 작으면 그대로 반환합니다.
+    패딩(letterbox)을 넣지 않으므로 정규화된 YOLO 라벨 좌표는 그대로 유효합니다.
+    """
+    h, w = img.shape[:2]
+    scale = size / max(h, w)
+    if scale >= 1:
+        return img
+    new_w, new_h = max(1, round(w * scale)), max(1, round(h * scale))
+    return cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_AREA)
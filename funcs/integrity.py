@@ -0,0 +1,188 @@
+import os
+import json
+import time
+from pathlib import Path
+
+from funcs.dir_index import list_dir
+from funcs.image_utils import read_image_size
+from funcs.data_utils import NUM_COCO_KPTS
+
+# ==========================================
+# 1. 폴더 단위 무결성 검사 (1_FRAME / 4_INTERP_DATA / 5_YOLO_TXT)
+# ==========================================
+# 세 폴더를 한 번씩만 나열해 stem 집합으로 교차 비교하고,
+# 이미지는 헤더만, JSON은 키포인트 개수만 확인합니다.
+FRAME_SUFFIXES = (".jpg", ".png")
+MAX_EXAMPLES = 20   # 리포트에 남길 문제 파일 이름 예시 수
+
+# 문제 종류
+#   missing_frame_dir / missing_json_dir / missing_label_dir : 폴더 자체가 없음
+#   frames_without_labels / labels_without_frames / frames_without_json : stem 불일치
+#   unreadable_images : 헤더를 읽을 수 없는 이미지 (깨진 파일, 0바이트 등)
+#   bad_json : 파싱 실패 또는 instance_info[0]의 키포인트가 17개 미만
+# 빌더가 기본으로 건너뛸 문제 (이 폴더는 처리해도 결과가 없거나 깨짐)
+BLOCKING_ISSUES = ("missing_frame_dir", "missing_json_dir", "unreadable_images")
+
+
+def _stems(entries, suffixes):
+    stems = {}
+    for name, entry in (entries or {}).items():
+        stem, suffix = os.path.splitext(name)
+        if suffix in suffixes:
+            stems[stem] = entry
+    return stems
+
+
+def _json_kpt_count(path):
+    """
+    보간 JSON의 instance_info[0] 키포인트 개수. 읽을 수 없으면 -1.
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        instances = data.get('instance_info') or []
+        return len(instances[0].get('keypoints', [])) if instances else 0
+    except (OSError, ValueError, AttributeError, IndexError, TypeError):
+        return -1
+
+
+def scan_folder(common_path, data_dir, check_images=True, check_json=True):
+    """
+    [워커] common_path 하나를 검사하여 문제 종류별 개수와 예시를 반환합니다.
+    반환값: {'common_path', 'frames', 'jsons', 'labels', 'issues': {종류: 개수}, 'examples': {종류: [stem...]}, 'error'}
+    """
+    data_dir = Path(data_dir)
+    result = {'common_path': common_path, 'frames': 0, 'jsons': 0, 'labels': 0,
+              'issues': {}, 'examples': {}, 'error': None}
+
+    def report(kind, stems):
+        stems = sorted(stems)
+        if stems:
+            result['issues'][kind] = len(stems)
+            result['examples'][kind] = stems[:MAX_EXAMPLES]
+
+    try:
+        frame_entries = list_dir(data_dir / "1_FRAME" / common_path)
+        json_entries = list_dir(data_dir / "4_INTERP_DATA" / common_path)
+        label_entries = list_dir(data_dir / "5_YOLO_TXT" / common_path)
+        for kind, entries in (("missing_frame_dir", frame_entries), ("missing_json_dir", json_entries),
+                              ("missing_label_dir", label_entries)):
+            if entries is None:
+                result['issues'][kind] = 1
+
+        frames = _stems(frame_entries, FRAME_SUFFIXES)
+        jsons = _stems(json_entries, (".json",))
+        labels = _stems(label_entries, (".txt",))
+        result.update(frames=len(frames), jsons=len(jsons), labels=len(labels))
+
+        if label_entries is not None:
+            report("frames_without_labels", frames.keys() - labels.keys())
+            report("labels_without_frames", labels.keys() - frames.keys())
+        if json_entries is not None:
+            report("frames_without_json", frames.keys() - jsons.keys())
+
+        if check_images:
+            report("unreadable_images", [stem for stem, entry in frames.items() if read_image_size(entry.path) is None])
+        if check_json:
+            report("bad_json", [stem for stem, entry in jsons.items() if _json_kpt_count(entry.path) < NUM_COCO_KPTS])
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result
+
+
+# ==========================================
+# 2. 리포트 저장 / 읽기
+# ==========================================
+def save_report(results, report_path, data_dir):
+    """
+    폴더별 결과를 JSON 리포트로 저장합니다. summary에는 문제 종류별 (폴더 수, 파일 수)를 기록합니다.
+    """
+    summary = {}
+    for r in results:
+        for kind, count in r['issues'].items():
+            folders, files = summary.get(kind, (0, 0))
+            summary[kind] = (folders + 1, files + count)
+
+    report = {'generated_at': time.strftime('%Y-%m-%d %H:%M:%S'), 'data_dir': str(data_dir),
+              'folders_scanned': len(results),
+              'summary': {kind: {'folders': f, 'files': n} for kind, (f, n) in sorted(summary.items())},
+              'errors': {r['common_path']: r['error'] for r in results if r['error']},
+              'folders': {r['common_path']: {k: r[k] for k in ('frames', 'jsons', 'labels', 'issues', 'examples')}
+                          for r in sorted(results, key=lambda r: r['common_path']) if r['issues'] or r['error']}}
+
+    report_path = Path(report_path)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = report_path.with_suffix(".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, report_path)
+    return report
+
+
+# 파일 단위 문제의 예시 stem -> 실제 파일 위치 (제자리 덮어쓰기 복구는 폴더 mtime이 바뀌지 않으므로 파일 mtime 확인)
+_EXAMPLE_FILES = {'unreadable_images': ("1_FRAME", FRAME_SUFFIXES), 'bad_json': ("4_INTERP_DATA", (".json",))}
+
+
+def _mtime_after(path, report_mtime):
+    try:
+        return os.stat(path).st_mtime > report_mtime
+    except OSError:
+        return False
+
+
+def _modified_after(data_dir, common_path, report_mtime, examples=None):
+    """
+    common_path가 리포트 이후에 바뀌었는지 확인합니다.
+    - 1_FRAME / 4_INTERP_DATA / 5_YOLO_TXT 폴더 mtime (파일 추가 / 삭제 / 폴더 생성)
+    - 리포트에 남은 문제 파일 예시(깨진 이미지 / JSON)의 mtime (같은 이름으로 덮어써 복구한 경우)
+    """
+    data_dir = Path(data_dir)
+    for sub in ("1_FRAME", "4_INTERP_DATA", "5_YOLO_TXT"):
+        if _mtime_after(data_dir / sub / common_path, report_mtime):
+            return True
+    for kind, stems in (examples or {}).items():
+        if kind not in _EXAMPLE_FILES:
+            continue
+        sub, suffixes = _EXAMPLE_FILES[kind]
+        if any(_mtime_after(data_dir / sub / common_path / f"{stem}{suffix}", report_mtime)
+               for stem in stems for suffix in suffixes):
+            return True
+    return False
+
+
+def load_bad_folders(report_path, issues=BLOCKING_ISSUES, data_dir=None):
+    """
+    리포트에서 issues 중 하나라도 있는 (또는 검사 중 오류가 난) common_path 집합을 반환합니다.
+    리포트가 없으면 빈 집합을 반환하므로 빌더는 검사 없이 기존처럼 동작합니다.
+    리포트 이후에 폴더나 문제 파일 예시가 바뀌었으면(다시 추출 / 복구) 리포트가 오래된 것이므로 제외하지 않고,
+    리포트 생성 시각과 경과 시간을 함께 출력합니다. (data_dir를 생략하면 리포트의 data_dir 사용)
+    예시(MAX_EXAMPLES개)에 없는 파일만 제자리에서 덮어쓴 경우는 알 수 없으므로 다시 검사해야 합니다.
+    """
+    try:
+        with open(report_path, 'r') as f:
+            report = json.load(f)
+        report_mtime = os.stat(report_path).st_mtime
+    except (OSError, ValueError):
+        return set()
+
+    folders = report.get('folders', {})
+    bad = set(report.get('errors', {}))
+    for common_path, info in folders.items():
+        if any(kind in info['issues'] for kind in issues):
+            bad.add(common_path)
+    if not bad:
+        return bad
+
+    data_dir = data_dir or report.get('data_dir')
+    changed = {cp for cp in bad
+               if data_dir and _modified_after(data_dir, cp, report_mtime, folders.get(cp, {}).get('examples'))}
+    age_h = (time.time() - report_mtime) / 3600
+    print(f"🩺 무결성 리포트: {report.get('generated_at', '?')} 생성 ({age_h:.1f}시간 전) | {report_path}")
+    if changed:
+        print(f"⚠️ 리포트 이후 변경된 폴더 {len(changed)}개는 제외하지 않습니다. "
+              f"(runner/scan_integrity.py로 다시 검사 권장)")
+    print(f"ℹ️ 폴더 mtime과 문제 파일 예시(최대 {MAX_EXAMPLES}개)의 mtime으로만 판단합니다. "
+          f"예시에 없는 파일을 제자리에서 덮어써 복구했다면 다시 검사하세요.")
+    return bad - changed
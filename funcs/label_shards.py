@@ -0,0 +1,160 @@
+import os
+import numpy as np
+from pathlib import Path
+
+from funcs.data_utils import format_yolo_lines
+
+# ==========================================
+# 1. 라벨 Shard 포맷
+# ==========================================
+# common_path 하나당 폴더 하나:
+#   5_YOLO_SHARD/<common_path>/labels.npy  : float32 (N, 4 + 12*3)  [cx, cy, w, h, (x, y, v) * 12]
+#   5_YOLO_SHARD/<common_path>/stems.txt   : 프레임 stem (labels.npy 행 순서와 동일, 정렬됨)
+# 값은 .txt에 쓰인 6자리 소수를 그대로 float32로 옮긴 것이므로, export 시 원래 .txt와 바이트 단위로 같습니다.
+SHARD_DIR_NAME = "5_YOLO_SHARD"
+ROWS_FILE = "labels.npy"
+STEMS_FILE = "stems.txt"
+ROW_DIM = 4 + 12 * 3
+
+
+def shard_dir_for(data_dir, common_path):
+    return Path(data_dir) / SHARD_DIR_NAME / common_path
+
+
+def lines_to_rows(lines):
+    """
+    YOLO 라벨 라인("0 cx cy w h ...")들을 float32 (N, 40) 배열로 변환합니다. (class 열 제외)
+    """
+    if not lines:
+        return np.zeros((0, ROW_DIM), dtype=np.float32)
+    return np.array([line.split()[1:] for line in lines], dtype=np.float32)
+
+
+def _atomic_save(path, save_fn):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        save_fn(f)
+    os.replace(tmp_path, path)
+
+
+def write_label_shard(shard_dir, stems, rows):
+    """
+    stem 리스트와 (N, 40) 배열을 stem 순으로 정렬하여 shard로 저장합니다.
+    """
+    shard_dir = Path(shard_dir)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = np.asarray(rows, dtype=np.float32).reshape(-1, ROW_DIM)
+    order = sorted(range(len(stems)), key=lambda i: stems[i])
+    stems = [stems[i] for i in order]
+    rows = np.ascontiguousarray(rows[order])
+
+    _atomic_save(shard_dir / ROWS_FILE, lambda f: np.save(f, rows))
+    _atomic_save(shard_dir / STEMS_FILE, lambda f: f.write("".join(f"{s}\n" for s in stems).encode()))
+
+
+def update_label_shard(shard_dir, keep_stems, new_lines, fallback_txt_dir=None):
+    """
+    기존 shard를 증분 갱신합니다.
+    - keep_stems: 최종적으로 shard에 남아야 하는 stem 집합 (변환 성공 프레임)
+    - new_lines: 이번에 새로 변환된 {stem: 라벨 라인}
+    - fallback_txt_dir: 기존 shard에도 new_lines에도 없는 stem은 이 폴더의 .txt에서 읽어 채웁니다.
+    """
+    keep_stems = set(keep_stems)
+    rows_by_stem = {}
+
+    existing = LabelShard.open(shard_dir)
+    if existing is not None:
+        for stem, i in existing.index.items():
+            if stem in keep_stems and stem not in new_lines:
+                rows_by_stem[stem] = np.array(existing.rows[i])
+
+    new_stems = [s for s in new_lines if s in keep_stems]
+    for stem, row in zip(new_stems, lines_to_rows([new_lines[s] for s in new_stems])):
+        rows_by_stem[stem] = row
+
+    missing = sorted(keep_stems - set(rows_by_stem))
+    if missing and fallback_txt_dir is not None:
+        lines = []
+        for stem in missing:
+            with open(Path(fallback_txt_dir) / f"{stem}.txt", 'r') as f:
+                lines.append(f.readline())
+        for stem, row in zip(missing, lines_to_rows(lines)):
+            rows_by_stem[stem] = row
+
+    stems = list(rows_by_stem)
+    rows = np.stack([rows_by_stem[s] for s in stems]) if stems else np.zeros((0, ROW_DIM), dtype=np.float32)
+    write_label_shard(shard_dir, stems, rows)
+    return len(stems)
+
+
+# ==========================================
+# 2. Memory-mapped Reader
+# ==========================================
+class LabelShard:
+    """
+    common_path 하나의 라벨 shard를 memory-map으로 읽습니다.
+    rows는 np.memmap이므로 필요한 행만 디스크에서 읽히며, 여러 프로세스가 페이지 캐시를 공유합니다.
+    """
+
+    def __init__(self, shard_dir):
+        self.shard_dir = Path(shard_dir)
+        self.rows = np.load(self.shard_dir / ROWS_FILE, mmap_mode='r')
+        with open(self.shard_dir / STEMS_FILE, 'r') as f:
+            self.stems = f.read().splitlines()
+        if len(self.stems) != len(self.rows):
+            raise ValueError(f"shard가 손상되었습니다 (stems {len(self.stems)} != rows {len(self.rows)}): {self.shard_dir}")
+        self.index = {stem: i for i, stem in enumerate(self.stems)}
+
+    @classmethod
+    def open(cls, shard_dir):
+        """
+        shard가 없으면 None을 반환합니다.
+        """
+        if not (Path(shard_dir) / ROWS_FILE).exists():
+            return None
+        return cls(shard_dir)
+
+    def __len__(self):
+        return len(self.stems)
+
+    def __contains__(self, stem):
+        return stem in self.index
+
+    def get(self, stem):
+        """
+        stem 하나의 (40,) 행을 반환합니다. 없으면 None.
+        """
+        i = self.index.get(stem)
+        return None if i is None else self.rows[i]
+
+    @property
+    def boxes(self):
+        """(N, 4) 정규화 cx, cy, w, h"""
+        return self.rows[:, :4]
+
+    @property
+    def keypoints(self):
+        """(N, 12, 3) 정규화 x, y, visibility"""
+        return self.rows[:, 4:].reshape(len(self.rows), -1, 3)
+
+
+# ==========================================
+# 3. Shard -> YOLO TXT Export
+# ==========================================
+def export_shard_to_txt(shard_dir, txt_dir):
+    """
+    shard 하나를 기존 YOLO .txt 폴더 구조(프레임당 파일 1개)로 다시 씁니다. 반환값: 작성한 파일 수
+    """
+    shard = LabelShard.open(shard_dir)
+    if shard is None:
+        return 0
+
+    txt_dir = Path(txt_dir)
+    txt_dir.mkdir(parents=True, exist_ok=True)
+
+    lines = format_yolo_lines(np.asarray(shard.rows, dtype=np.float64))
+    for stem, line in zip(shard.stems, lines):
+        with open(txt_dir / f"{stem}.txt", 'w') as f:
+            f.write(line)
+    return len(lines)
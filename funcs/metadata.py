@@ -0,0 +1,143 @@
+import os
+import json
+import pandas as pd
+from pathlib import Path
+
+# ==========================================
+# 1. metadata.csv 바이너리 캐시
+# ==========================================
+# metadata.csv를 처음 읽을 때 컬럼형 바이너리(Feather, pyarrow가 없으면 pickle)로 옆에 저장해 두고,
+# 이후에는 CSV 파싱 없이 캐시를 읽습니다. CSV의 (mtime, 크기)가 바뀌면 자동으로 다시 만듭니다.
+#   metadata.csv -> .metadata_cache/metadata.feather (+ metadata.json: 원본 CSV stat)
+CACHE_DIR_NAME = ".metadata_cache"
+
+
+def _feather_available():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _cache_paths(csv_path, cache_dir=None):
+    cache_dir = Path(cache_dir) if cache_dir is not None else csv_path.parent / CACHE_DIR_NAME
+    suffix = ".feather" if _feather_available() else ".pkl"
+    return cache_dir / f"{csv_path.stem}{suffix}", cache_dir / f"{csv_path.stem}.json"
+
+
+def load_metadata(csv_path, cache_dir=None):
+    """
+    metadata.csv를 DataFrame으로 읽습니다. 유효한 바이너리 캐시가 있으면 CSV를 파싱하지 않습니다.
+    캐시를 읽거나 쓸 수 없으면 (깨진 feather / pickle, pyarrow 타입 오류, 쓰기 권한 없음 등) CSV를 그대로 읽어 반환합니다.
+    """
+    csv_path = Path(csv_path)
+    st = os.stat(csv_path)
+    source = {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+    data_path, stat_path = _cache_paths(csv_path, cache_dir)
+
+    try:
+        with open(stat_path, 'r') as f:
+            if json.load(f) == source and data_path.exists():
+                return pd.read_feather(data_path) if data_path.suffix == ".feather" else pd.read_pickle(data_path)
+    except Exception as e:  # 잘린 pickle(UnpicklingError / EOFError), pyarrow ArrowInvalid 등
+        if not isinstance(e, (OSError, ValueError)):
+            print(f"⚠️ metadata 캐시가 손상되어 CSV를 다시 읽습니다: {type(e).__name__}: {e}")
+
+    df = pd.read_csv(csv_path)
+    # 두 파일 모두 임시 파일 -> 교체로 씁니다. (데이터 교체 후 stat을 쓰므로 중간에 멈추면 stat 불일치로 다시 생성)
+    tmp_path = data_path.with_name(f"{data_path.name}.{os.getpid()}.tmp")
+    try:
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        if data_path.suffix == ".feather":
+            df.to_feather(tmp_path)
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, data_path)
+        tmp_stat_path = stat_path.with_name(f"{stat_path.name}.{os.getpid()}.tmp")
+        with open(tmp_stat_path, 'w') as f:
+            json.dump(source, f)
+        os.replace(tmp_stat_path, stat_path)
+    except Exception as e:  # 쓰기 권한 없음(OSError), 혼합 타입 object 컬럼(ArrowTypeError) 등
+        print(f"⚠️ metadata 캐시를 저장하지 못했습니다: {type(e).__name__}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return df
+
+
+# ==========================================
+# 2. 조회 인덱스
+# ==========================================
+SPLIT_COLUMNS = {'train': ['is_train'], 'val': ['is_val'], 'train_val': ['is_train', 'is_val']}
+
+
+class MetadataIndex:
+    """
+    metadata를 한 번 읽어 split / 행 번호 / common_path 조회를 dict·마스크 연산으로 제공합니다.
+    - split('train' | 'val' | 'train_val'): 해당 행 DataFrame (기존 `df[df['is_train'] == True]`와 동일)
+    - row(index), common_path(index), video_path(index): 행 번호(df.index) 기준 조회
+    - by_common_path(common_path): common_path로 행 조회 (중복이면 첫 번째 행)
+    """
+
+    def __init__(self, csv_path, cache_dir=None):
+        self.csv_path = Path(csv_path)
+        if not self.csv_path.exists():
+            raise FileNotFoundError(f"metadata.csv 파일을 찾을 수 없습니다: {self.csv_path}")
+        self.df = load_metadata(self.csv_path, cache_dir)
+        self._splits = {}
+        self._cp_index = None
+
+    def __len__(self):
+        return len(self.df)
+
+    def __contains__(self, index):
+        return index in self.df.index
+
+    def split(self, name):
+        if name not in self._splits:
+            mask = pd.Series(False, index=self.df.index)
+            for column in SPLIT_COLUMNS[name]:
+                if column in self.df:
+                    mask |= self.df[column] == True
+            self._splits[name] = self.df[mask]
+        return self._splits[name]
+
+    def common_paths(self, split=None):
+        df = self.df if split is None else self.split(split)
+        return df['common_path'].tolist()
+
+    def row(self, index):
+        return self.df.loc[index]
+
+    def common_path(self, index):
+        return self.df.at[index, 'common_path']
+
+    def video_path(self, index):
+        return self.df.at[index, 'video_path'] if 'video_path' in self.df else None
+
+    def by_common_path(self, common_path):
+        if self._cp_index is None:
+            cp_index = {}
+            for index, cp in zip(self.df.index, self.df['common_path']):
+                cp_index.setdefault(cp, index)
+            self._cp_index = cp_index
+        index = self._cp_index.get(common_path)
+        return None if index is None else self.df.loc[index]
+
+
+_SHARED = {}
+
+
+def get_metadata(csv_path, cache_dir=None):
+    """
+    같은 프로세스 안에서는 csv_path별 MetadataIndex를 공유합니다. (CSV가 바뀌면 새로 읽음)
+    """
+    key = str(Path(csv_path).resolve())
+    mtime = os.stat(csv_path).st_mtime_ns
+    cached = _SHARED.get(key)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, MetadataIndex(csv_path, cache_dir))
+        _SHARED[key] = cached
+    return cached[1]
@@ -0,0 +1,178 @@
+import os
+import json
+import importlib.util
+import numpy as np
+from pathlib import Path
+
+from funcs.result_store import result_to_arrays, VideoResults
+from funcs.pose_eval import select_pose_kpts
+
+# ==========================================
+# 1. Export 산출물 경로 (Ultralytics export 규칙)
+# ==========================================
+# best.pt -> best.onnx / best_openvino_model/ / best_int8_openvino_model/ (같은 weights 폴더)
+# INT8 양자화는 Ultralytics가 지원하는 OpenVINO 경로로 수행하며, 보정(calibration)에 data.yaml이 필요합니다.
+BACKENDS = ("openvino_int8", "openvino", "onnx", "pytorch")
+PARITY_FILE = "export_parity.json"   # runner/export_model.py의 parity check 결과 (weights 폴더)
+_RUNTIME_MODULE = {"openvino_int8": "openvino", "openvino": "openvino", "onnx": "onnxruntime", "pytorch": "torch"}
+
+
+def artifact_path(weights_path, backend):
+    weights_path = Path(weights_path)
+    stem = weights_path.with_suffix("")
+    if backend == "pytorch":
+        return weights_path
+    if backend == "onnx":
+        return stem.with_suffix(".onnx")
+    if backend == "openvino":
+        return Path(f"{stem}_openvino_model")
+    if backend == "openvino_int8":
+        return Path(f"{stem}_int8_openvino_model")
+    raise ValueError(f"지원하지 않는 backend: {backend}")
+
+
+def _is_fresh(artifact, weights_path):
+    return artifact.exists() and os.path.getmtime(artifact) >= os.path.getmtime(weights_path)
+
+
+def export_checkpoint(weights_path, backends=("onnx",), imgsz=640, data=None, overwrite=False):
+    """
+    체크포인트를 backends(onnx / openvino / openvino_int8)로 export 합니다.
+    weights보다 최신 산출물이 이미 있으면 건너뜁니다. 반환값: {backend: 산출물 경로}
+    """
+    from ultralytics import YOLO
+
+    weights_path = Path(weights_path)
+    exported = {}
+    for backend in backends:
+        target = artifact_path(weights_path, backend)
+        if not overwrite and _is_fresh(target, weights_path):
+            print(f"⏭️ {backend}: 최신 산출물 존재 ({target})")
+            exported[backend] = target
+            continue
+
+        kwargs = {'imgsz': imgsz}
+        if backend == "onnx":
+            kwargs.update(format="onnx", simplify=True)
+        elif backend == "openvino":
+            kwargs.update(format="openvino")
+        elif backend == "openvino_int8":
+            if data is None:
+                raise ValueError("INT8 export에는 보정용 data.yaml이 필요합니다.")
+            kwargs.update(format="openvino", int8=True, data=str(data))
+
+        print(f"📦 {backend} export 중... ({weights_path.name})")
+        # export마다 새로 로드 (export가 모델 상태를 바꾸는 경우가 있음)
+        out = YOLO(str(weights_path)).export(**kwargs)
+        exported[backend] = Path(out)
+    return exported
+
+
+# ==========================================
+# 2. 가장 빠른 Backend 선택
+# ==========================================
+def runtime_available(backend):
+    return importlib.util.find_spec(_RUNTIME_MODULE[backend]) is not None
+
+
+def load_parity_report(weights_path):
+    """
+    weights 폴더의 export_parity.json을 읽습니다. 없거나 깨져 있으면 빈 dict.
+    """
+    try:
+        with open(Path(weights_path).parent / PARITY_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _parity_status(weights_path, backend, target, reports):
+    """
+    backend 산출물의 parity 상태: 'passed' / 'failed' / 'unchecked' (리포트가 없거나 산출물보다 오래됨)
+    """
+    report = reports.get(backend)
+    if report is None:
+        return 'unchecked'
+    parity_path = Path(weights_path).parent / PARITY_FILE
+    if os.path.getmtime(parity_path) < os.path.getmtime(target):
+        return 'unchecked'  # parity check 이후 다시 export됨
+    return 'passed' if report.get('passed') else 'failed'
+
+
+def load_fastest_model(weights_path, device='cpu', prefer=BACKENDS, task="pose", require_parity=True):
+    """
+    사용 가능한 backend 중 가장 빠른 것으로 모델을 로드합니다. 반환값: (YOLO 모델, backend 이름)
+    - GPU: PyTorch 체크포인트 그대로 사용
+    - CPU: prefer 순서(OpenVINO INT8 > OpenVINO > ONNX > PyTorch) 중 산출물과 런타임이 모두 있는 첫 번째
+    - require_parity=True: export_parity.json에서 parity check를 통과한 산출물만 사용합니다.
+      (실패했거나 검사하지 않은 backend는 경고 후 건너뜀, runner/export_model.py로 검사)
+    """
+    from ultralytics import YOLO
+
+    weights_path = Path(weights_path)
+    if device != 'cpu':
+        return YOLO(str(weights_path)).to(device), "pytorch"
+
+    reports = load_parity_report(weights_path) if require_parity else {}
+    for backend in prefer:
+        if backend == "pytorch":
+            break
+        target = artifact_path(weights_path, backend)
+        if not (_is_fresh(target, weights_path) and runtime_available(backend)):
+            continue
+        if require_parity:
+            status = _parity_status(weights_path, backend, target, reports)
+            if status != 'passed':
+                print(f"⚠️ {backend}: parity check {'실패' if status == 'failed' else '기록 없음'} -> 사용하지 않음 ({target})")
+                continue
+        return YOLO(str(target), task=task), backend
+    return YOLO(str(weights_path)), "pytorch"
+
+
+# ==========================================
+# 3. Parity Check (PyTorch 대비 키포인트 오차)
+# ==========================================
+def check_parity(ref_model, test_model, frames, imgsz=640, device='cpu', tol_px=3.0, tol_conf=0.05,
+                 tol_mismatch=0.01):
+    """
+    같은 프레임들에 대해 두 모델의 top-1 결과를 비교합니다.
+    - 키포인트 오차: 두 모델 모두 검출한 프레임에서 PyTorch 결과와의 픽셀 거리 (PyTorch 관절 conf > 0.5인 관절만)
+    - 검출 불일치: 한 쪽만 검출한 프레임 수
+    통과 조건: 키포인트 오차 p95 <= tol_px, 박스 신뢰도 차이 최대 <= tol_conf, 검출 불일치 비율 <= tol_mismatch
+    """
+    ref_entries, test_entries = {}, {}
+    for stem, img in frames:
+        ref_entries[stem] = result_to_arrays(ref_model.predict(img, imgsz=imgsz, device=device, verbose=False)[0])
+        test_entries[stem] = result_to_arrays(test_model.predict(img, imgsz=imgsz, device='cpu', verbose=False)[0])
+
+    _, _, ref_conf, ref_kpts = VideoResults.from_entries(ref_entries).top1()
+    _, _, test_conf, test_kpts = VideoResults.from_entries(test_entries).top1()
+    ref_kpts, test_kpts = select_pose_kpts(ref_kpts), select_pose_kpts(test_kpts)
+
+    ref_found, test_found = ref_conf > 0, test_conf > 0
+    both = ref_found & test_found
+    joint_mask = ref_kpts[both][..., 2] > 0.5
+    dist = np.linalg.norm(ref_kpts[both][..., :2] - test_kpts[both][..., :2], axis=-1)[joint_mask]
+    conf_diff = np.abs(ref_conf[both] - test_conf[both])
+
+    report = {'frames': len(ref_entries), 'detected_both': int(both.sum()),
+              'detection_mismatch': int((ref_found != test_found).sum()),
+              'kpt_err_px_mean': float(dist.mean()) if dist.size else 0.0,
+              'kpt_err_px_p95': float(np.percentile(dist, 95)) if dist.size else 0.0,
+              'kpt_err_px_max': float(dist.max()) if dist.size else 0.0,
+              'conf_diff_max': float(conf_diff.max()) if conf_diff.size else 0.0,
+              'tol_px': tol_px, 'tol_conf': tol_conf, 'tol_mismatch': tol_mismatch}
+    mismatch_ratio = report['detection_mismatch'] / max(report['frames'], 1)
+    report['passed'] = (mismatch_ratio <= tol_mismatch and report['kpt_err_px_p95'] <= tol_px
+                        and report['conf_diff_max'] <= tol_conf)
+    return report
+
+
+def save_parity_report(weights_path, reports):
+    """
+    {backend: parity report}를 weights 폴더의 export_parity.json으로 저장합니다.
+    """
+    path = Path(weights_path).parent / PARITY_FILE
+    with open(path, 'w') as f:
+        json.dump(reports, f, indent=2)
+    return path
@@ -0,0 +1,227 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from funcs.data_utils import KPT_START, KPT_END, NUM_COCO_KPTS
+from funcs.label_shards import LabelShard, shard_dir_for, lines_to_rows
+from funcs.dir_index import list_dir
+
+# ==========================================
+# 1. 상수 (COCO OKS 기준)
+# ==========================================
+COCO_KPT_SIGMAS = np.array([.26, .25, .25, .35, .35, .79, .79, .72, .72, .62, .62,
+                            1.07, 1.07, .87, .87, .89, .89]) / 10.0
+KPT_SIGMAS = COCO_KPT_SIGMAS[KPT_START:KPT_END + 1]      # 어깨 ~ 발목 12개
+KPT_NAMES = ["l_shoulder", "r_shoulder", "l_elbow", "r_elbow", "l_wrist", "r_wrist",
+             "l_hip", "r_hip", "l_knee", "r_knee", "l_ankle", "r_ankle"]
+DEFAULT_FLIP_IDX = [1, 0, 3, 2, 5, 4, 7, 6, 9, 8, 11, 10]
+OKS_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+AREA_SCALE = 0.53   # Ultralytics와 동일하게 GT 박스 면적 * 0.53을 OKS 스케일로 사용
+
+
+# ==========================================
+# 2. GT 로드 (Shard 우선, 없으면 5_YOLO_TXT)
+# ==========================================
+def load_ground_truth(data_dir, common_path, img_w, img_h):
+    """
+    common_path 하나의 GT를 픽셀 좌표로 읽습니다. 라벨은 프레임당 1명입니다.
+    반환값: (stems (N,) 정렬된 문자열 배열, boxes (N,4) xyxy, kpts (N,12,3))
+    """
+    shard = LabelShard.open(shard_dir_for(data_dir, common_path))
+    if shard is not None:
+        stems, rows = np.array(shard.stems), np.asarray(shard.rows, dtype=np.float32)
+    else:
+        txt_dir = Path(data_dir) / "5_YOLO_TXT" / common_path
+        names = sorted(name for name in (list_dir(txt_dir) or {}) if name.endswith(".txt"))
+        lines = []
+        for name in names:
+            with open(txt_dir / name, 'r') as f:
+                lines.append(f.readline())
+        stems, rows = np.array([name[:-4] for name in names]), lines_to_rows(lines)
+
+    scale = np.array([img_w, img_h], dtype=np.float32)
+    cxcy, wh = rows[:, 0:2] * scale, rows[:, 2:4] * scale
+    boxes = np.concatenate([cxcy - wh / 2, cxcy + wh / 2], axis=1)
+    kpts = rows[:, 4:].reshape(len(rows), -1, 3).copy()
+    kpts[..., :2] *= scale
+    return stems, boxes, kpts
+
+
+def select_pose_kpts(kpts):
+    """
+    COCO 17개 키포인트 모델(사전학습 yolo*-pose) 결과는 학습에 쓰는 12개만 잘라 맞춥니다.
+    """
+    if kpts.shape[-2] == NUM_COCO_KPTS:
+        return kpts[..., KPT_START:KPT_END + 1, :]
+    return kpts
+
+
+# ==========================================
+# 3. 벡터화 지표
+# ==========================================
+def compute_oks(pred_kpts, gt_kpts, areas, sigmas=KPT_SIGMAS):
+    """
+    (M,K,2+) 예측과 (M,K,3) GT 쌍의 OKS (M,). GT visibility > 0인 키포인트만 사용합니다.
+    """
+    d2 = ((pred_kpts[..., :2] - gt_kpts[..., :2]) ** 2).sum(-1)
+    visible = gt_kpts[..., 2] > 0
+    e = d2 / ((2 * sigmas) ** 2 * (areas[:, None] + np.spacing(1)) * 2)
+    num_visible = visible.sum(-1)
+    oks = (np.exp(-e) * visible).sum(-1) / np.maximum(num_visible, 1)
+    return np.where(num_visible > 0, oks, 0.0)
+
+
+def torso_length(gt_kpts):
+    """
+    PCK 기준 길이: 왼쪽 어깨-오른쪽 엉덩이 거리 (없으면 오른쪽 어깨-왼쪽 엉덩이). 둘 다 없으면 NaN.
+    """
+    def dist(a, b):
+        ok = (gt_kpts[:, a, 2] > 0) & (gt_kpts[:, b, 2] > 0)
+        d = np.linalg.norm(gt_kpts[:, a, :2] - gt_kpts[:, b, :2], axis=-1)
+        return np.where(ok & (d > 0), d, np.nan)
+
+    first = dist(0, 7)
+    return np.where(np.isnan(first), dist(1, 6), first)
+
+
+def pck_hits(pred_kpts, gt_kpts, ref_len, alpha=0.2):
+    """
+    키포인트별 정답 여부 (N,K) bool과 평가 대상 마스크 (N,K) bool을 반환합니다.
+    예측이 없는 프레임(NaN)은 오답으로 셉니다.
+    """
+    valid = (gt_kpts[..., 2] > 0) & ~np.isnan(ref_len)[:, None]
+    dist = np.linalg.norm(pred_kpts[..., :2] - gt_kpts[..., :2], axis=-1)
+    with np.errstate(invalid='ignore'):
+        hits = (dist <= alpha * ref_len[:, None]) & valid
+    return hits, valid
+
+
+def average_precision(conf, tp, num_gt):
+    """
+    COCO 방식 101점 보간 AP. conf (M,), tp (M,T) bool -> (T,)
+    """
+    if num_gt == 0:
+        return np.full(tp.shape[1], np.nan)
+    if len(conf) == 0:
+        return np.zeros(tp.shape[1])
+    order = np.argsort(-conf, kind='stable')
+    tp = tp[order]
+    tp_cum = np.cumsum(tp, axis=0)
+    fp_cum = np.cumsum(~tp, axis=0)
+    recall = tp_cum / num_gt
+    precision = tp_cum / (tp_cum + fp_cum)
+    # precision envelope (뒤에서부터 최대값)
+    precision = np.flip(np.maximum.accumulate(np.flip(precision, 0), axis=0), 0)
+    recall_points = np.linspace(0, 1, 101)
+    ap = np.zeros(tp.shape[1])
+    for t in range(tp.shape[1]):
+        idx = np.searchsorted(recall[:, t], recall_points, side='left')
+        ap[t] = np.where(idx < len(precision), precision[np.minimum(idx, len(precision) - 1), t], 0).mean()
+    return ap
+
+
+# ==========================================
+# 4. 평가기 (영상 단위로 누적)
+# ==========================================
+class PoseEvaluator:
+    """
+    영상(common_path) 단위로 GT와 예측을 넣으면 OKS-AP / PCK / 좌우 뒤바뀜 비율을 누적합니다.
+    - AP: 모든 검출(신뢰도 순)을 사용, 프레임당 GT 1명에 가장 높은 신뢰도의 OKS >= t 검출만 TP
+    - PCK / swap: 프레임별 신뢰도 최고 검출 1개 사용 (단일 인물 영상)
+    """
+
+    def __init__(self, flip_idx=None, sigmas=KPT_SIGMAS, pck_alpha=0.2):
+        self.flip_idx = np.asarray(flip_idx if flip_idx is not None else DEFAULT_FLIP_IDX)
+        self.sigmas = sigmas
+        self.pck_alpha = pck_alpha
+        self.conf, self.tp = [], []
+        self.num_gt = 0
+        self.pck_hit = np.zeros(len(sigmas))
+        self.pck_total = np.zeros(len(sigmas))
+        self.swap = np.zeros(len(sigmas))
+        self.videos = []
+
+    def add(self, common_path, gt_stems, gt_boxes, gt_kpts, pred):
+        """
+        pred: funcs.result_store.VideoResults. GT와 pred.stems에 모두 있는 프레임만 평가합니다.
+        예측을 실행했지만 검출이 없는 프레임은 놓친 것(recall 감소)으로 세고,
+        pred.stems에 없는 GT 프레임(예측을 실행하지 않은 프레임)은 num_gt에서 제외합니다.
+        """
+        if select_pose_kpts(pred.kpts).shape[1] != len(self.sigmas):
+            raise ValueError(f"키포인트 {len(self.sigmas)}개 포즈 모델 결과가 아닙니다: {common_path}")
+        if len(gt_stems) == 0:
+            return
+
+        # --- 예측 프레임 -> GT 행 번호 (없으면 -1) ---
+        sort_idx = np.argsort(gt_stems)
+        sorted_stems = gt_stems[sort_idx]
+        pred_stems = np.array(pred.stems, dtype=str)
+        pos = np.minimum(np.searchsorted(sorted_stems, pred_stems), len(gt_stems) - 1)
+        frame_gt = np.where(sorted_stems[pos] == pred_stems, sort_idx[pos], -1)
+
+        # GT 프레임 중 예측이 실행된 프레임만 평가 대상
+        evaluated = np.zeros(len(gt_stems), bool)
+        evaluated[frame_gt[frame_gt >= 0]] = True
+        counts = np.diff(pred.offsets)
+        det_gt = np.repeat(frame_gt, counts)           # 검출별 GT 행 번호
+        det_frame = np.repeat(np.arange(len(pred_stems)), counts)
+        keep = det_gt >= 0
+        det_gt, det_frame = det_gt[keep], det_frame[keep]
+        det_conf = pred.conf[keep].astype(np.float64)
+        det_kpts = select_pose_kpts(pred.kpts[keep])
+
+        # --- OKS / TP (프레임 안에서 신뢰도 순으로 첫 OKS >= t 검출만 TP) ---
+        tp = np.zeros((len(det_conf), len(OKS_THRESHOLDS)), bool)
+        if len(det_conf):
+            gt_wh = gt_boxes[det_gt, 2:] - gt_boxes[det_gt, :2]
+            oks = compute_oks(det_kpts, gt_kpts[det_gt], gt_wh.prod(-1) * AREA_SCALE, self.sigmas)
+            order = np.lexsort((-det_conf, det_frame))
+            hit = oks[order, None] >= OKS_THRESHOLDS[None]
+            cum = np.cumsum(hit, axis=0)
+            starts = np.r_[True, det_frame[order][1:] != det_frame[order][:-1]]
+            group_start = np.maximum.accumulate(np.where(starts, np.arange(len(order)), 0))
+            prev = np.where(group_start[:, None] > 0, cum[np.maximum(group_start - 1, 0)], 0)
+            tp[order] = hit & (cum - prev == 1)
+        self.conf.append(det_conf)
+        self.tp.append(tp)
+        self.num_gt += int(evaluated.sum())
+
+        # --- PCK / 좌우 뒤바뀜 (프레임별 top-1) ---
+        _, _, _, top_kpts = pred.top1()
+        top_kpts = select_pose_kpts(top_kpts)
+        gt_eval = gt_kpts[frame_gt[frame_gt >= 0]]
+        top_eval = top_kpts[frame_gt >= 0]
+        ref_len = torso_length(gt_eval)
+        hits, valid = pck_hits(top_eval, gt_eval, ref_len, self.pck_alpha)
+        flipped_hits, _ = pck_hits(top_eval[:, self.flip_idx], gt_eval, ref_len, self.pck_alpha)
+        swapped = flipped_hits & ~hits
+
+        self.pck_hit += hits.sum(0)
+        self.pck_total += valid.sum(0)
+        self.swap += swapped.sum(0)
+
+        video_ap = average_precision(det_conf, tp, int(evaluated.sum()))
+        self.videos.append({'common_path': common_path, 'frames': int(evaluated.sum()),
+                            'detections': len(det_conf), 'AP50': video_ap[0], 'AP50_95': np.nanmean(video_ap),
+                            'PCK': hits.sum() / max(valid.sum(), 1),
+                            'swap_rate': swapped.sum() / max(valid.sum(), 1)})
+
+    def summary(self):
+        """
+        전체 지표 dict: AP50, AP75, AP50_95, PCK(전체/관절별), swap_rate(전체/관절별)
+        """
+        conf = np.concatenate(self.conf) if self.conf else np.zeros(0)
+        tp = np.concatenate(self.tp) if self.tp else np.zeros((0, len(OKS_THRESHOLDS)), bool)
+        ap = average_precision(conf, tp, self.num_gt)
+        total = np.maximum(self.pck_total, 1)
+        result = {'frames': self.num_gt, 'detections': len(conf),
+                  'AP50': float(ap[0]), 'AP75': float(ap[5]), 'AP50_95': float(np.nanmean(ap)),
+                  'PCK': float(self.pck_hit.sum() / max(self.pck_total.sum(), 1)),
+                  'swap_rate': float(self.swap.sum() / max(self.pck_total.sum(), 1))}
+        for i, name in enumerate(KPT_NAMES[:len(self.sigmas)]):
+            result[f"PCK_{name}"] = float(self.pck_hit[i] / total[i])
+            result[f"swap_{name}"] = float(self.swap[i] / total[i])
+        return result
+
+    def per_video(self):
+        return pd.DataFrame(self.videos)
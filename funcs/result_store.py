@@ -0,0 +1,208 @@
+import os
+import hashlib
+import numpy as np
+from pathlib import Path
+
+from funcs.frame_source import frame_number
+
+# ==========================================
+# 1. 체크포인트 해시
+# ==========================================
+# 같은 파일명(best.pt)이라도 재학습되면 결과가 달라지므로, 캐시 키는 파일 내용의 SHA1을 사용합니다.
+_HASH_CACHE = {}
+
+
+def checkpoint_hash(ckpt_path, length=12):
+    """
+    체크포인트 파일 내용의 SHA1 앞 length자리. (경로, mtime, 크기)가 같으면 프로세스 안에서 재계산하지 않습니다.
+    """
+    ckpt_path = str(ckpt_path)
+    st = os.stat(ckpt_path)
+    key = (ckpt_path, st.st_mtime_ns, st.st_size)
+    if key not in _HASH_CACHE:
+        sha1 = hashlib.sha1()
+        with open(ckpt_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                sha1.update(chunk)
+        _HASH_CACHE[key] = sha1.hexdigest()
+    return _HASH_CACHE[key][:length]
+
+
+# ==========================================
+# 2. 영상 단위 결과 (.npz 1개 = 체크포인트 x common_path x imgsz)
+# ==========================================
+# stems   (F,)        프레임 stem
+# offsets (F+1,)      프레임 i의 검출은 [offsets[i], offsets[i+1]) 구간
+# boxes   (M, 4)      xyxy 픽셀 좌표 (float32)
+# conf    (M,)        박스 신뢰도
+# cls     (M,)        클래스 번호
+# kpts    (M, K, 3)   x, y, visibility/conf (검출 모델은 K=0)
+def empty_entry(num_kpts=0):
+    return {'boxes': np.zeros((0, 4), np.float32), 'conf': np.zeros(0, np.float32),
+            'cls': np.zeros(0, np.int16), 'kpts': np.zeros((0, num_kpts, 3), np.float32)}
+
+
+def result_to_arrays(result):
+    """
+    Ultralytics Results 하나를 {'boxes', 'conf', 'cls', 'kpts'} numpy 배열로 변환합니다.
+    """
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        num_kpts = result.keypoints.data.shape[1] if result.keypoints is not None else 0
+        return empty_entry(num_kpts)
+    entry = {'boxes': boxes.xyxy.cpu().numpy().astype(np.float32),
+             'conf': boxes.conf.cpu().numpy().astype(np.float32),
+             'cls': boxes.cls.cpu().numpy().astype(np.int16)}
+    if result.keypoints is not None:
+        entry['kpts'] = result.keypoints.data.cpu().numpy().astype(np.float32)
+    else:
+        entry['kpts'] = np.zeros((len(entry['boxes']), 0, 3), np.float32)
+    return entry
+
+
+class VideoResults:
+    """
+    한 영상의 프레임별 추론 결과. get(stem)으로 프레임 하나의 배열들을 조회합니다.
+    """
+
+    def __init__(self, stems, offsets, boxes, conf, cls, kpts):
+        self.stems = list(stems)
+        self.index = {stem: i for i, stem in enumerate(self.stems)}
+        self.offsets = offsets
+        self.boxes, self.conf, self.cls, self.kpts = boxes, conf, cls, kpts
+
+    @classmethod
+    def from_entries(cls_, entries):
+        """
+        {stem: entry} dict로부터 만듭니다. (stem은 프레임 번호 순으로 정렬)
+        """
+        stems = sorted(entries, key=frame_number)
+        if not stems:
+            return cls_([], np.zeros(1, np.int64), **empty_entry())
+        counts = [len(entries[stem]['boxes']) for stem in stems]
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        num_kpts = max(entries[stem]['kpts'].shape[1] for stem in stems)
+        kpts = [e['kpts'] if e['kpts'].shape[1] == num_kpts else np.zeros((len(e['kpts']), num_kpts, 3), np.float32)
+                for e in (entries[stem] for stem in stems)]
+        return cls_(stems, offsets,
+                    np.concatenate([entries[s]['boxes'] for s in stems]).reshape(-1, 4),
+                    np.concatenate([entries[s]['conf'] for s in stems]),
+                    np.concatenate([entries[s]['cls'] for s in stems]),
+                    np.concatenate(kpts).reshape(-1, num_kpts, 3))
+
+    def __len__(self):
+        return len(self.stems)
+
+    def __contains__(self, stem):
+        return stem in self.index
+
+    def get(self, stem):
+        i = self.index.get(stem)
+        if i is None:
+            return None
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return {'boxes': self.boxes[start:end], 'conf': self.conf[start:end],
+                'cls': self.cls[start:end], 'kpts': self.kpts[start:end]}
+
+    def entries(self):
+        return {stem: self.get(stem) for stem in self.stems}
+
+    def top1(self):
+        """
+        프레임마다 신뢰도가 가장 높은 검출 하나의 (stems, boxes (F,4), conf (F,), kpts (F,K,3)).
+        검출이 없는 프레임은 NaN / 0으로 채웁니다. (단일 인물 영상의 지표 계산용)
+        """
+        num_frames = len(self.stems)
+        boxes = np.full((num_frames, 4), np.nan, np.float32)
+        conf = np.zeros(num_frames, np.float32)
+        kpts = np.full((num_frames, self.kpts.shape[1], 3), np.nan, np.float32)
+        counts = np.diff(self.offsets)
+        for i in np.nonzero(counts)[0]:
+            start = self.offsets[i]
+            best = start + int(np.argmax(self.conf[start:self.offsets[i + 1]]))
+            boxes[i], conf[i], kpts[i] = self.boxes[best], self.conf[best], self.kpts[best]
+        return self.stems, boxes, conf, kpts
+
+
+# ==========================================
+# 3. 결과 저장소
+# ==========================================
+class ResultStore:
+    """
+    <root>/<체크포인트 해시>/imgsz<imgsz>/<common_path>.npz 에 영상 단위 결과를 저장합니다.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path_for(self, ckpt_hash, common_path, imgsz):
+        return self.root / ckpt_hash / f"imgsz{imgsz}" / f"{common_path}.npz"
+
+    def load(self, ckpt_hash, common_path, imgsz):
+        """
+        저장된 결과를 VideoResults로 읽습니다. 없으면 None.
+        """
+        path = self.path_for(ckpt_hash, common_path, imgsz)
+        if not path.exists():
+            return None
+        with np.load(path) as data:
+            return VideoResults(data['stems'].tolist(), data['offsets'], data['boxes'],
+                                data['conf'], data['cls'], data['kpts'])
+
+    def missing(self, ckpt_hash, common_path, imgsz, stems):
+        """
+        stems 중 아직 결과가 없는 stem 리스트 (입력 순서 유지)
+        """
+        stored = self.load(ckpt_hash, common_path, imgsz)
+        if stored is None:
+            return list(stems)
+        return [stem for stem in stems if stem not in stored]
+
+    def save(self, ckpt_hash, common_path, imgsz, entries):
+        """
+        {stem: entry}를 기존 결과와 병합하여 저장합니다. (임시 파일에 쓴 뒤 교체하므로 중단되어도 기존 파일은 유지)
+        """
+        path = self.path_for(ckpt_hash, common_path, imgsz)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        stored = self.load(ckpt_hash, common_path, imgsz)
+        merged = stored.entries() if stored is not None else {}
+        merged.update(entries)
+        results = VideoResults.from_entries(merged)
+
+        tmp_path = path.with_name(path.name + ".tmp.npz")
+        np.savez(tmp_path, stems=np.array(results.stems, dtype=str), offsets=results.offsets,
+                 boxes=results.boxes, conf=results.conf, cls=results.cls, kpts=results.kpts)
+        os.replace(tmp_path, path)
+        return results
+
+
+def infer_with_store(model, ckpt_path, store, common_path, source_fn, stems, imgsz=640, batch_size=8,
+                     device='cpu', predict_kwargs=None):
+    """
+    저장소에 없는 프레임만 추론하여 채우고, 전체 결과(VideoResults)를 반환합니다.
+    - source_fn(missing_stems) -> (stem, 이미지) iterable (예: funcs.frame_source.open_frame_source(..., stems=...))
+    - stems: 이 영상에서 결과가 필요한 프레임 stem 리스트
+    """
+    ckpt_hash = checkpoint_hash(ckpt_path)
+    missing = store.missing(ckpt_hash, common_path, imgsz, stems)
+    if not missing:
+        return store.load(ckpt_hash, common_path, imgsz)
+
+    predict_kwargs = dict(predict_kwargs or {})
+    entries, batch = {}, []
+
+    def flush():
+        images = [img for _, img in batch]
+        results = model.predict(images, imgsz=imgsz, device=device, verbose=False, **predict_kwargs)
+        for (stem, _), result in zip(batch, results):
+            entries[stem] = result_to_arrays(result)
+        batch.clear()
+
+    for stem, img in source_fn(missing):
+        batch.append((stem, img))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    return store.save(ckpt_hash, common_path, imgsz, entries)
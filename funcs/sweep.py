@@ -0,0 +1,210 @@
+import sys
+import time
+import copy
+import itertools
+import subprocess
+import yaml
+import pandas as pd
+from pathlib import Path
+
+from funcs.frame_cache import list_split_images, staged_view_dir
+from funcs.target_scheduler import is_target_done, write_done_marker
+from funcs.train_profiler import load_profile
+
+# ==========================================
+# 1. 실험 설정 목록 (설정 파일 glob / 파라미터 그리드)
+# ==========================================
+def _grid_tag(key, value):
+    return f"{key.split('.')[-1]}{value}"
+
+
+def expand_grid(base_config_path, grid, out_dir):
+    """
+    base 설정에 grid의 모든 조합을 적용한 설정 파일을 out_dir에 쓰고 경로 리스트를 반환합니다.
+    - grid: {'train.batch': [16, 32], 'data.config_path': [...]} 처럼 '.'으로 구분한 키 -> 값 목록
+    - run_name 뒤에 조합을 붙여(예: v1.0_step30_batch32) 실험마다 체크포인트 폴더를 분리합니다.
+    """
+    with open(base_config_path, 'r') as f:
+        base_cfg = yaml.safe_load(f)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    keys = list(grid)
+    paths = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        cfg = copy.deepcopy(base_cfg)
+        for key, value in zip(keys, values):
+            node = cfg
+            *parents, leaf = key.split('.')
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[leaf] = value
+        # data.config_path 처럼 경로 값은 이름이 길어지므로 폴더 이름만 태그로 사용합니다.
+        tags = [_grid_tag(key, Path(value).parent.name if key.endswith('path') else value)
+                for key, value in zip(keys, values)]
+        cfg['run_name'] = "_".join([base_cfg['run_name']] + tags)
+
+        path = out_dir / f"{cfg['run_name']}.yaml"
+        with open(path, 'w') as f:
+            yaml.dump(cfg, f, sort_keys=False, allow_unicode=True)
+        paths.append(path)
+    return paths
+
+
+def load_job(config_path):
+    """
+    설정 파일 하나를 스케줄러 job(dict)으로 읽습니다.
+    data_key는 실제 학습에 쓰이는 data.yaml (staging이 켜져 있으면 로컬 캐시 쪽 data.yaml) 경로입니다.
+    """
+    with open(config_path, 'r') as f:
+        cfg = yaml.safe_load(f)
+
+    data_yaml = Path(cfg['data']['config_path'])
+    staging_cfg = cfg.get('staging') or {}
+    if staging_cfg.get('enabled'):
+        imgsz = cfg['train'].get('imgsz') if staging_cfg.get('resize') else None
+        data_yaml = staged_view_dir(data_yaml, staging_cfg['cache_dir'], imgsz) / "data.yaml"
+
+    return {'config': str(config_path), 'run_name': cfg['run_name'],
+            'run_dir': Path(cfg['output']['base_dir']) / cfg['run_name'],
+            'data_key': str(data_yaml), 'epochs': cfg['train'].get('epochs')}
+
+
+# ==========================================
+# 2. Ultralytics 라벨 캐시 공유
+# ==========================================
+# Ultralytics는 split마다 (정렬된 첫 이미지의 라벨 폴더).cache 파일에 라벨 파싱 결과를 저장하고,
+# 다음 실행에서는 해시가 같으면 그대로 읽습니다. 같은 data.yaml을 쓰는 실험이 동시에 시작하면
+# 모두 라벨을 다시 파싱하고 같은 .cache 파일을 동시에 쓰므로, 첫 job(owner)이 캐시를 만들 때까지
+# 나머지 job은 대기열에 남겨 둡니다.
+def label_cache_paths(data_yaml):
+    """
+    data_yaml의 train/val split에 대해 Ultralytics가 만들 라벨 캐시 경로 리스트.
+    data.yaml이 아직 없으면(staging 전) 빈 리스트를 반환합니다.
+    """
+    data_yaml = Path(data_yaml)
+    if not data_yaml.exists():
+        return []
+    with open(data_yaml, 'r') as f:
+        data_cfg = yaml.safe_load(f)
+    root = Path(data_cfg.get('path') or data_yaml.parent)
+
+    paths = []
+    for split in ['train', 'val']:
+        items = list_split_images(root, data_cfg[split])
+        if items:
+            _, _, label_path = min(items, key=lambda item: item[1])
+            cache_path = Path(label_path).parent.with_suffix(".cache")
+            if cache_path not in paths:
+                paths.append(cache_path)
+    return paths
+
+
+# ==========================================
+# 3. 실험 결과 요약 (results.csv)
+# ==========================================
+def summarize_run(run_dir):
+    """
+    Ultralytics가 남긴 results.csv에서 진행한 epoch 수와 best epoch(mAP50-95(P) 기준)의 지표를 읽습니다.
+    """
+    results_csv = Path(run_dir) / "results.csv"
+    if not results_csv.exists():
+        return {}
+    df = pd.read_csv(results_csv)
+    df.columns = [c.strip() for c in df.columns]
+    if df.empty:
+        return {}
+
+    fitness_col = next((c for c in ("metrics/mAP50-95(P)", "metrics/mAP50-95(B)") if c in df.columns), None)
+    best = df.loc[df[fitness_col].idxmax()] if fitness_col else df.iloc[-1]
+    summary = {'epochs_done': len(df), 'best_epoch': int(best['epoch'])}
+    summary.update({c: float(best[c]) for c in df.columns if c.startswith("metrics/")})
+    if 'time' in df.columns:
+        summary['train_time_s'] = float(df['time'].iloc[-1])
+    return summary
+
+
+# ==========================================
+# 4. Device 단위 스케줄러 (device 하나에 job 하나)
+# ==========================================
+def run_sweep(jobs, devices, train_script, log_dir, poll_s=10):
+    """
+    jobs를 순서대로 비어 있는 device에 하나씩 (train_script <config> <device> 서브프로세스로) 실행합니다.
+    - 완료 마커(run_dir/results.csv.done.json)가 있는 job은 건너뛰고, 중단된 job은 train_script가 last.pt에서 이어합니다.
+    - 같은 data.yaml의 라벨 캐시가 아직 없으면 owner job 하나만 실행하고 나머지는 캐시가 생기거나 owner가 끝날 때까지 대기합니다.
+    - 각 job의 출력은 log_dir/<run_name>.log 에 저장합니다.
+    반환값: job별 상태 / 소요 시간 / 지표 / 학습 비용(profile_epochs.csv) DataFrame (입력 순서)
+    """
+    log_dir = Path(log_dir)
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    rows = {}
+    pending = []
+    for job in jobs:
+        if is_target_done(job['run_dir'] / "results.csv"):
+            rows[job['config']] = {'status': 'skipped', 'device': None, 'returncode': None, 'wall_s': 0.0}
+            print(f"⏭️ 완료된 실험 건너뜀: {job['run_name']}")
+        else:
+            pending.append(job)
+
+    running = {}        # device slot -> (job, proc, 시작 시각, 로그 파일)
+    owners = {}         # data_key -> 라벨 캐시를 만드는 중인 job
+    ready_keys = set()  # 라벨 캐시가 준비된 data_key
+    cache_paths = {}
+
+    def cache_ready(key):
+        if key not in ready_keys:
+            paths = cache_paths.get(key) or label_cache_paths(key)
+            cache_paths[key] = paths
+            if paths and all(p.exists() for p in paths):
+                ready_keys.add(key)
+        return key in ready_keys
+
+    while pending or running:
+        # 1. 끝난 job 회수
+        for slot, (job, proc, start_t, log_f) in list(running.items()):
+            if proc.poll() is None:
+                continue
+            log_f.close()
+            wall_s = time.perf_counter() - start_t
+            status = 'done' if proc.returncode == 0 else 'failed'
+            if status == 'done':
+                write_done_marker(job['run_dir'] / "results.csv",
+                                  {'config': job['config'], 'device': str(devices[slot]), 'wall_s': wall_s})
+            rows[job['config']] = {'status': status, 'device': str(devices[slot]),
+                                   'returncode': proc.returncode, 'wall_s': wall_s}
+            print(f"{'✅' if status == 'done' else '❌'} [{devices[slot]}] {job['run_name']} "
+                  f"{status} ({wall_s / 60:.1f}분)")
+            if owners.get(job['data_key']) is job:
+                del owners[job['data_key']]
+            del running[slot]
+
+        # 2. 빈 device에 시작 가능한 job 배치 (라벨 캐시 owner가 실행 중인 data.yaml은 대기)
+        for slot, device in enumerate(devices):
+            if slot in running:
+                continue
+            job = next((j for j in pending if cache_ready(j['data_key']) or j['data_key'] not in owners), None)
+            if job is None:
+                break
+            pending.remove(job)
+            if not cache_ready(job['data_key']):
+                owners[job['data_key']] = job
+
+            log_f = open(log_dir / f"{job['run_name']}.log", 'a')
+            proc = subprocess.Popen([sys.executable, str(train_script), job['config'], str(device)],
+                                    stdout=log_f, stderr=subprocess.STDOUT, cwd=str(Path(train_script).parent))
+            running[slot] = (job, proc, time.perf_counter(), log_f)
+            print(f"🚀 [{device}] {job['run_name']} 시작 (대기 {len(pending)}개)")
+
+        if running:
+            time.sleep(poll_s)
+
+    table = []
+    for job in jobs:
+        row = {'run_name': job['run_name'], 'config': job['config'], 'data_yaml': job['data_key'],
+               'epochs': job['epochs']}
+        row.update(rows.get(job['config'], {}))
+        row.update(summarize_run(job['run_dir']))
+        row.update(load_profile(job['run_dir']))
+        table.append(row)
+    return pd.DataFrame(table)
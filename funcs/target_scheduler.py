@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import multiprocessing as mp
+import pandas as pd
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# ==========================================
+# 1. Target 선택 / 완료 마커
+# ==========================================
+DONE_SUFFIX = ".done.json"
+
+
+def select_targets(df, indices=None, query=None):
+    """
+    metadata DataFrame에서 처리할 행 번호(index) 리스트를 고릅니다.
+    - indices: 행 번호 iterable (range(35, 40) 등). 메타데이터에 없는 번호는 제외합니다.
+    - query: DataFrame.query 문자열 (예: "is_val == True") 또는 df -> bool Series 함수
+    둘 다 주면 교집합, 둘 다 없으면 전체 행입니다.
+    """
+    selected = df
+    if query is not None:
+        selected = selected.query(query) if isinstance(query, str) else selected[query(selected)]
+    if indices is not None:
+        selected = selected[selected.index.isin(list(indices))]
+    return selected.index.tolist()
+
+
+def done_marker_path(output_path):
+    return Path(str(output_path) + DONE_SUFFIX)
+
+
+def write_done_marker(output_path, info):
+    """
+    출력 파일이 끝까지 기록되었음을 <출력 파일>.done.json 으로 남깁니다. (release() 이후 호출)
+    """
+    with open(done_marker_path(output_path), 'w') as f:
+        json.dump(info, f, indent=2, default=str)
+
+
+def is_target_done(output_path, expected_frames=None):
+    """
+    출력 파일과 완료 마커가 모두 있고, 마커의 frames가 expected_frames와 같으면 완료로 봅니다.
+    중간에 중단되어 마커가 없거나 프레임 수가 바뀐 경우에는 다시 처리합니다.
+    """
+    output_path = Path(output_path)
+    marker = done_marker_path(output_path)
+    if not output_path.exists() or not marker.exists():
+        return False
+    try:
+        with open(marker, 'r') as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return expected_frames is None or info.get('frames') == expected_frames
+
+
+# ==========================================
+# 2. 워커 프로세스 (프로세스당 모델 1회 로드)
+# ==========================================
+_WORKER = {}
+
+
+def _init_worker(model_loader, device_queue, num_threads):
+    # 프로세스마다 장치 하나를 배정받고, 그 장치에 모델을 한 번만 올립니다.
+    device = device_queue.get()
+    if num_threads:
+        try:
+            import torch
+            torch.set_num_threads(num_threads)
+        except ImportError:
+            pass
+    if device != 'cpu':
+        import torch
+        torch.cuda.set_device(device)
+    _WORKER['device'] = device
+    _WORKER['models'] = model_loader(device)
+
+
+def _run_target(task_fn, target):
+    result = {'target': target, 'device': str(_WORKER['device']), 'pid': os.getpid(), 'error': None}
+    start_t = time.perf_counter()
+    try:
+        result.update(task_fn(target, _WORKER['models'], _WORKER['device']) or {})
+    except Exception as e:
+        result['error'] = str(e)
+    result['elapsed_s'] = time.perf_counter() - start_t
+    return result
+
+
+# ==========================================
+# 3. 스케줄러
+# ==========================================
+def run_targets(targets, task_fn, model_loader, devices=('cpu',), workers_per_device=1, num_threads=None):
+    """
+    targets를 워커 프로세스들에 나누어 처리하고 target별 소요 시간 DataFrame을 반환합니다.
+    - task_fn(target, models, device) -> dict (결과 행에 합쳐짐, 예: {'frames': N})
+    - model_loader(device) -> models: 워커 프로세스마다 한 번만 호출
+    - devices: GPU 번호 리스트 (예: [0, 1]) 또는 ['cpu']. 장치당 workers_per_device개 프로세스를 띄웁니다.
+    - num_threads: 워커당 torch 스레드 수 (CPU 코어를 워커끼리 나눌 때 사용)
+    task_fn / model_loader는 spawn 방식으로 전달되므로 모듈 최상위 함수여야 합니다.
+    먼저 끝나는 target부터 다음 target을 받으므로 느린 target 하나가 나머지를 막지 않습니다.
+    """
+    slots = [device for device in devices for _ in range(workers_per_device)]
+    num_workers = min(len(slots), len(targets))
+    if num_workers == 0:
+        return pd.DataFrame(columns=['target', 'device', 'pid', 'error', 'elapsed_s'])
+
+    ctx = mp.get_context('spawn')  # CUDA는 fork 이후 초기화할 수 없으므로 spawn 사용
+    device_queue = ctx.Queue()
+    for device in slots[:num_workers]:
+        device_queue.put(device)
+
+    rows = []
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(model_loader, device_queue, num_threads)) as executor:
+        futures = [executor.submit(_run_target, task_fn, target) for target in targets]
+        for future in as_completed(futures):
+            row = future.result()
+            status = f"❌ {row['error']}" if row['error'] else "✅"
+            print(f"{status} Target {row['target']} | device {row['device']} | {row['elapsed_s']:.1f}s")
+            rows.append(row)
+
+    return pd.DataFrame(rows).sort_values('target').reset_index(drop=True)
+
+
+def save_timing_summary(df, output_path):
+    """
+    target별 소요 시간 DataFrame을 CSV로 저장합니다. frames 열이 있으면 frames/s도 함께 기록합니다.
+    """
+    if 'frames' in df.columns:
+        df = df.assign(fps=df['frames'] / df['elapsed_s'].where(df['elapsed_s'] > 0))
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(output_path, index=False)
+    return output_path
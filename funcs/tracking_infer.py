@@ -0,0 +1,108 @@
+import time
+import numpy as np
+
+from funcs.result_store import result_to_arrays, empty_entry
+
+# ==========================================
+# 1. Keyframe + Crop 추론 (단일 인물)
+# ==========================================
+# 재활 영상은 한 사람이 천천히 움직이므로, 매 프레임 전체 해상도 검출 대신
+#   - keyframe: 전체 프레임을 full_imgsz로 추론
+#   - 그 사이 프레임: 직전 박스 주변 crop만 crop_imgsz로 추론
+# 하고, crop 결과의 신뢰도가 낮거나 움직임이 크면 그 프레임을 바로 전체 프레임으로 다시 검출합니다.
+# 라벨 생성(convert_json_to_yolo_kpt_fixed, instance_info[0])과 같이 프레임당 1명(top-1)만 다룹니다.
+
+def _top1(entry):
+    if len(entry['conf']) <= 1:
+        return entry
+    best = int(np.argmax(entry['conf']))
+    return {key: value[best:best + 1] for key, value in entry.items()}
+
+
+class KeyframePoseRunner:
+    """
+    - keyframe_interval: keyframe 간격 (1이면 매 프레임 전체 검출 = 기존 방식)
+    - crop_margin: crop 영역을 직전 박스 크기 대비 사방으로 넓히는 비율
+    - min_conf: crop 결과 신뢰도가 이보다 낮으면 전체 프레임 재검출
+    - max_motion: 박스 중심 이동량이 직전 박스 대각선 대비 이 비율을 넘으면 재검출
+    """
+
+    def __init__(self, model, keyframe_interval=10, full_imgsz=640, crop_imgsz=320, crop_margin=0.3,
+                 min_conf=0.5, max_motion=0.25, device='cpu', predict_kwargs=None):
+        self.model = model
+        self.keyframe_interval = keyframe_interval
+        self.full_imgsz = full_imgsz
+        self.crop_imgsz = crop_imgsz
+        self.crop_margin = crop_margin
+        self.min_conf = min_conf
+        self.max_motion = max_motion
+        self.device = device
+        self.predict_kwargs = dict(predict_kwargs or {})
+
+    def _predict(self, img, imgsz):
+        result = self.model.predict(img, imgsz=imgsz, device=self.device, verbose=False, **self.predict_kwargs)[0]
+        return _top1(result_to_arrays(result))
+
+    def _crop_box(self, box, img_w, img_h):
+        x1, y1, x2, y2 = box
+        mx, my = (x2 - x1) * self.crop_margin, (y2 - y1) * self.crop_margin
+        return (int(max(0, x1 - mx)), int(max(0, y1 - my)),
+                int(min(img_w, x2 + mx)), int(min(img_h, y2 + my)))
+
+    def _predict_crop(self, img, prev_box):
+        img_h, img_w = img.shape[:2]
+        cx1, cy1, cx2, cy2 = self._crop_box(prev_box, img_w, img_h)
+        if cx2 - cx1 < 2 or cy2 - cy1 < 2:
+            return None
+        entry = self._predict(img[cy1:cy2, cx1:cx2], self.crop_imgsz)
+        if len(entry['conf']) == 0:
+            return None
+        # crop 좌표 -> 원본 좌표
+        offset = np.array([cx1, cy1], dtype=np.float32)
+        entry['boxes'] = entry['boxes'] + np.tile(offset, 2)
+        entry['kpts'] = entry['kpts'].copy()
+        entry['kpts'][..., :2] += offset
+        return entry
+
+    def _needs_redetect(self, entry, prev_box):
+        if entry is None or entry['conf'][0] < self.min_conf:
+            return True
+        box = entry['boxes'][0]
+        prev_center = (prev_box[:2] + prev_box[2:]) / 2
+        center = (box[:2] + box[2:]) / 2
+        diag = np.linalg.norm(prev_box[2:] - prev_box[:2])
+        return np.linalg.norm(center - prev_center) > self.max_motion * max(diag, 1.0)
+
+    def run(self, frames):
+        """
+        (stem, 이미지) iterable을 순서대로 처리합니다.
+        반환값: ({stem: entry (result_store 형식, top-1)}, 통계 dict)
+        """
+        entries = {}
+        stats = {'frames': 0, 'full': 0, 'crop': 0, 'redetect': 0, 'elapsed_s': 0.0}
+        prev_box = None
+        since_key = 0
+
+        start_t = time.perf_counter()
+        for stem, img in frames:
+            entry = None
+            if prev_box is not None and since_key < self.keyframe_interval:
+                crop_entry = self._predict_crop(img, prev_box)
+                stats['crop'] += 1
+                if self._needs_redetect(crop_entry, prev_box):
+                    stats['redetect'] += 1
+                else:
+                    entry = crop_entry
+                    since_key += 1
+
+            if entry is None:
+                entry = self._predict(img, self.full_imgsz)
+                stats['full'] += 1
+                since_key = 1
+
+            prev_box = entry['boxes'][0] if len(entry['conf']) else None
+            entries[stem] = entry if len(entry['conf']) else empty_entry(entry['kpts'].shape[1])
+            stats['frames'] += 1
+        stats['elapsed_s'] = time.perf_counter() - start_t
+        stats['fps'] = stats['frames'] / stats['elapsed_s'] if stats['elapsed_s'] > 0 else 0.0
+        return entries, stats
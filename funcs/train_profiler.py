@@ -0,0 +1,159 @@
+import json
+import time
+import resource
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# ==========================================
+# 1. 학습 구간별 프로파일러 (Ultralytics 콜백)
+# ==========================================
+# 학습 루프의 배치 하나를 콜백 사이 구간으로 나눕니다.
+#   data_wait : 이전 배치 종료(또는 에폭 시작) -> on_train_batch_start  (NAS 읽기 + 디코딩 + 증강 대기)
+#   compute   : on_train_batch_start -> on_train_batch_end           (전처리 + forward/backward + optimizer)
+#   val       : on_train_epoch_end -> on_fit_epoch_end               (검증 + 지표 계산)
+# forward / backward는 같은 구간 안에서 연속으로 실행되어 콜백만으로는 나눌 수 없으므로 compute로 함께 잽니다.
+PROFILE_CSV = "profile_epochs.csv"
+PROFILE_JSON = "profile_summary.json"
+PERCENTILES = (50, 90, 99)
+
+
+def _cuda():
+    try:
+        import torch
+    except ImportError:
+        return None
+    return torch.cuda if torch.cuda.is_available() else None
+
+
+def _host_peak_gb():
+    # ru_maxrss: 리눅스에서 KB 단위, 메인 프로세스 기준 (dataloader 워커 프로세스는 포함되지 않음)
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e6
+
+
+def _percentiles(prefix, values_ms):
+    values = np.asarray(values_ms, dtype=np.float64)
+    if values.size == 0:
+        return {f"{prefix}_p{p}_ms": float('nan') for p in PERCENTILES}
+    return {f"{prefix}_p{p}_ms": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+class TrainProfiler:
+    """
+    model.add_callback으로 등록해 배치별 구간 시간과 메모리를 기록하고, 에폭마다 백분위 요약을
+    <save_dir>/profile_epochs.csv 로, 학습 종료 시 전체 요약을 profile_summary.json 으로 저장합니다.
+    - sync_cuda=True면 배치 종료 시 torch.cuda.synchronize()로 GPU 작업이 끝난 시점까지 잽니다.
+      (끄면 오버헤드는 없지만 비동기 실행 때문에 compute가 짧게, data_wait가 길게 보일 수 있습니다)
+    - metric_logger를 주면 에폭 요약을 'profile/...' 키로 함께 기록합니다.
+    """
+
+    def __init__(self, sync_cuda=True, metric_logger=None):
+        self.sync_cuda = sync_cuda
+        self.metric_logger = metric_logger
+        self.epochs = []
+        self.previous = None   # Resume 전 실행에서 기록한 에폭 (첫 저장 시 읽음)
+        self._reset_epoch()
+
+    def register(self, model):
+        for event in ("on_train_epoch_start", "on_train_batch_start", "on_train_batch_end",
+                      "on_train_epoch_end", "on_fit_epoch_end", "on_train_end"):
+            model.add_callback(event, getattr(self, event))
+        return self
+
+    def _reset_epoch(self):
+        self.wait_ms, self.compute_ms, self.images = [], [], 0
+        self.epoch_t = self.mark_t = self.batch_t = self.train_end_t = time.perf_counter()
+
+    # ------------------------------------------
+    # 콜백
+    # ------------------------------------------
+    def on_train_epoch_start(self, trainer):
+        cuda = _cuda()
+        if cuda is not None:
+            cuda.reset_peak_memory_stats()
+        self._reset_epoch()
+
+    def on_train_batch_start(self, trainer):
+        self.batch_t = time.perf_counter()
+        self.wait_ms.append((self.batch_t - self.mark_t) * 1000)
+
+    def on_train_batch_end(self, trainer):
+        cuda = _cuda()
+        if self.sync_cuda and cuda is not None:
+            cuda.synchronize()
+        self.mark_t = time.perf_counter()
+        self.compute_ms.append((self.mark_t - self.batch_t) * 1000)
+        # 마지막 배치는 더 작을 수 있으나 콜백에서는 배치 텐서에 접근할 수 없어 설정된 batch 크기로 셉니다.
+        self.images += trainer.batch_size
+
+    def on_train_epoch_end(self, trainer):
+        self.train_end_t = time.perf_counter()
+
+    def on_fit_epoch_end(self, trainer):
+        end_t = time.perf_counter()
+        train_s = self.train_end_t - self.epoch_t
+        wait_s, compute_s = sum(self.wait_ms) / 1000, sum(self.compute_ms) / 1000
+        cuda = _cuda()
+
+        row = {'epoch': trainer.epoch + 1, 'batches': len(self.compute_ms), 'images': self.images,
+               'epoch_s': end_t - self.epoch_t, 'train_s': train_s, 'val_s': end_t - self.train_end_t,
+               'images_per_s': self.images / train_s if train_s > 0 else 0.0,
+               'data_wait_ratio': wait_s / (wait_s + compute_s) if wait_s + compute_s > 0 else 0.0}
+        row.update(_percentiles("data_wait", self.wait_ms))
+        row.update(_percentiles("compute", self.compute_ms))
+        row['host_peak_gb'] = _host_peak_gb()
+        row['device_peak_gb'] = cuda.max_memory_allocated() / 1e9 if cuda is not None else 0.0
+        self.epochs.append(row)
+
+        self._save_epochs(Path(trainer.save_dir))
+        if self.metric_logger is not None:
+            self.metric_logger.log({f"profile/{k}": v for k, v in row.items() if k != 'epoch'})
+
+    def on_train_end(self, trainer):
+        # Resume 전 에폭까지 포함한 전체 기록 기준
+        summary = load_profile(trainer.save_dir)
+        with open(Path(trainer.save_dir) / PROFILE_JSON, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+    # ------------------------------------------
+    # 저장
+    # ------------------------------------------
+    def _save_epochs(self, save_dir):
+        """
+        에폭 요약을 CSV로 저장합니다. Resume한 경우 이전 실행에서 기록한 앞쪽 에폭을 유지합니다.
+        """
+        csv_path = save_dir / PROFILE_CSV
+        if self.previous is None:
+            previous = pd.read_csv(csv_path) if csv_path.exists() else pd.DataFrame(columns=['epoch'])
+            self.previous = previous[previous['epoch'] < self.epochs[0]['epoch']]
+        df = pd.DataFrame(self.epochs)
+        if len(self.previous):
+            df = pd.concat([self.previous, df], ignore_index=True)
+        df.to_csv(csv_path, index=False)
+
+
+def summarize_profile(epochs):
+    """
+    에폭별 요약(dict 리스트 또는 profile_epochs.csv DataFrame)을 실험 하나의 비용 지표로 합칩니다.
+    """
+    df = pd.DataFrame(epochs)
+    if df.empty:
+        return {}
+    return {'profiled_epochs': len(df),
+            'epoch_s_mean': float(df['epoch_s'].mean()),
+            'images_per_s': float(df['images'].sum() / df['train_s'].sum()) if df['train_s'].sum() > 0 else 0.0,
+            'data_wait_ratio': float(df['data_wait_ratio'].median()),
+            'data_wait_p90_ms': float(df['data_wait_p90_ms'].median()),
+            'compute_p50_ms': float(df['compute_p50_ms'].median()),
+            'host_peak_gb': float(df['host_peak_gb'].max()),
+            'device_peak_gb': float(df['device_peak_gb'].max())}
+
+
+def load_profile(run_dir):
+    """
+    run_dir/profile_epochs.csv의 요약. 프로파일 기록이 없으면 빈 dict.
+    """
+    csv_path = Path(run_dir) / PROFILE_CSV
+    if not csv_path.exists():
+        return {}
+    return summarize_profile(pd.read_csv(csv_path))
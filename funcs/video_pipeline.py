@@ -0,0 +1,197 @@
+import time
+import queue
+import threading
+import cv2
+from concurrent.futures import ThreadPoolExecutor
+
+# ==========================================
+# 1. 비동기 디코딩 -> 추론 -> 렌더링 -> 인코딩 파이프라인
+# ==========================================
+# [reader 스레드] --q_frames--> [추론: 호출 스레드(GPU)] --q_render(Future, 순서 유지)--> [writer 스레드]
+#                                        └─ 렌더링 워커 풀(ThreadPoolExecutor)에서 plot/병합 수행
+# 모든 큐는 크기가 제한되어 있어 가장 느린 단계가 전체 속도를 결정하고, 메모리는 일정하게 유지됩니다.
+_END = object()
+
+
+def iter_frame_files(frame_paths):
+    """
+    프레임 파일 경로 리스트를 (stem, 이미지)로 읽어 줍니다. (reader 스레드에서 실행)
+    """
+    for path in frame_paths:
+        yield path.stem, cv2.imread(str(path))
+
+
+class _StageTimer:
+    def __init__(self):
+        self.busy = {}
+        self.lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self.lock:
+            self.busy[stage] = self.busy.get(stage, 0.0) + seconds
+
+
+def _put(q, item, stop):
+    # 중단 요청 시 bounded queue에서 영원히 대기하지 않도록 timeout으로 확인합니다.
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _put_end(q, stop):
+    # 종료 신호는 stop 여부와 관계없이 반드시 전달합니다. (소비자가 get()에서 기다리고 있을 수 있음)
+    # 중단된 경우에는 남은 항목을 버려 자리를 만든 뒤 넣습니다. (이 큐의 생산자는 호출한 스레드 하나뿐)
+    if _put(q, _END, stop):
+        return
+    while True:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            break
+    q.put_nowait(_END)
+
+
+def run_pipeline(frames, infer_fn, render_fn, write_fn, batch_size=1, num_render_workers=4, queue_size=8):
+    """
+    프레임 스트림을 단계별 스레드로 나누어 처리하고, 입력 순서대로 write_fn에 전달합니다.
+    - frames: (stem, 이미지)를 내는 iterable (reader 스레드에서 소비, 예: iter_frame_files)
+    - infer_fn(images) -> 프레임별 추론 결과 리스트 (호출 스레드에서 실행, GPU 사용)
+    - render_fn(image, result) -> 출력 프레임 (렌더링 워커 풀에서 병렬 실행)
+    - write_fn(stem, frame): writer 스레드에서 순서대로 호출 (예: VideoWriter.write)
+    반환값: {'frames', 'elapsed_s', 'fps', 'busy_s': {단계: 누적 처리 시간}}
+    """
+    timer = _StageTimer()
+    stop = threading.Event()
+    q_frames = queue.Queue(maxsize=queue_size)
+    q_render = queue.Queue(maxsize=queue_size)
+    errors = []
+
+    # --- reader ---
+    def reader():
+        try:
+            it = iter(frames)
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                item = next(it, _END)
+                timer.add('decode', time.perf_counter() - t0)
+                if item is _END:
+                    break
+                if not _put(q_frames, item, stop):
+                    break
+        except Exception as e:
+            errors.append(e)
+        finally:
+            _put_end(q_frames, stop)
+
+    # --- writer ---
+    def writer():
+        while True:
+            item = q_render.get()
+            if item is _END:
+                break
+            stem, future = item
+            try:
+                frame = future.result()
+                if not errors:
+                    t0 = time.perf_counter()
+                    write_fn(stem, frame)
+                    timer.add('write', time.perf_counter() - t0)
+            except Exception as e:
+                errors.append(e)
+                stop.set()  # 이후 항목은 버리면서 큐만 비웁니다.
+
+    def timed_render(image, result):
+        t0 = time.perf_counter()
+        out = render_fn(image, result)
+        timer.add('render', time.perf_counter() - t0)
+        return out
+
+    reader_thread = threading.Thread(target=reader, daemon=True)
+    writer_thread = threading.Thread(target=writer, daemon=True)
+    reader_thread.start()
+    writer_thread.start()
+
+    start_t = time.perf_counter()
+    num_frames = 0
+
+    def flush(batch):
+        t0 = time.perf_counter()
+        results = infer_fn([image for _, image in batch])
+        timer.add('infer', time.perf_counter() - t0)
+        for (stem, image), result in zip(batch, results):
+            q_render.put((stem, render_pool.submit(timed_render, image, result)))
+
+    # --- inference (호출 스레드) ---
+    with ThreadPoolExecutor(max_workers=num_render_workers) as render_pool:
+        try:
+            batch = []
+            while not stop.is_set():
+                item = q_frames.get()
+                if item is _END:
+                    break
+                batch.append(item)
+                num_frames += 1
+                if len(batch) >= batch_size:
+                    flush(batch)
+                    batch = []
+            if batch and not stop.is_set():
+                flush(batch)
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            q_render.put(_END)
+            writer_thread.join()
+
+    stop.set()
+    reader_thread.join()
+
+    if errors:
+        raise errors[0]
+
+    elapsed = time.perf_counter() - start_t
+    return {'frames': num_frames, 'elapsed_s': elapsed,
+            'fps': num_frames / elapsed if elapsed > 0 else 0.0, 'busy_s': dict(timer.busy)}
+
+
+def video_writer_fn(writer):
+    """
+    cv2.VideoWriter를 run_pipeline의 write_fn 형태로 감쌉니다.
+    """
+    return lambda stem, frame: writer.write(frame)
+
+
+def comparison_render_fn(names):
+    """
+    모델별 결과를 plot + "이름 | FPS" 오버레이 후 2x2로 병합하는 run_pipeline의 render_fn을 만듭니다.
+    FPS는 Ultralytics Results.speed(preprocess + inference + postprocess, 프레임당 ms) 기준입니다.
+    """
+    def render(input_img, results):
+        w = input_img.shape[1]
+        processed_results = []
+        for name, result in zip(names, results):
+            frame_ms = sum(result.speed.get(key) or 0.0 for key in ('preprocess', 'inference', 'postprocess'))
+            fps = 1000.0 / frame_ms if frame_ms > 0 else 0.0
+
+            # 시각화 (ID 없이 Box와 Skeleton만 그려집니다)
+            res_frame = result.plot()
+
+            # 정보 텍스트 오버레이
+            display_text = f"{name} | FPS: {fps:.1f}"
+            font_scale, thickness = 1.0, 2
+            text_size = cv2.getTextSize(display_text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness)[0]
+            tx, ty = w - text_size[0] - 20, 45
+            cv2.rectangle(res_frame, (tx - 5, ty - text_size[1] - 5), (tx + text_size[0] + 5, ty + 5), (0, 0, 0), -1)
+            cv2.putText(res_frame, display_text, (tx, ty), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 255, 0), thickness, cv2.LINE_AA)
+            processed_results.append(res_frame)
+
+        # 4분할 화면 병합
+        top_row = cv2.hconcat([processed_results[0], processed_results[1]])
+        bottom_row = cv2.hconcat([processed_results[2], processed_results[3]])
+        return cv2.vconcat([top_row, bottom_row])
+
+    return render
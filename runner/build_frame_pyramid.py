@@ -0,0 +1,78 @@
+import os
+import random
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from tqdm import tqdm
+import sys
+
+# 경로 설정 (사용자 환경에 맞게 유지)
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.frame_pyramid import build_folder_pyramid, measure_decode_time, pyramid_dir_name
+from funcs.metadata import get_metadata
+
+# ==========================================
+# 1. 경로 및 실행 설정
+# ==========================================
+DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
+CSV_PATH = DATA_DIR / "metadata.csv"
+
+# 생성할 긴 변 크기 목록 (1_FRAME_640, ...)
+PYRAMID_SIZES = [640]
+JPEG_QUALITY = 95
+NUM_WORKERS = os.cpu_count() or 1
+# 디코딩 속도 비교에 사용할 샘플 프레임 수
+DECODE_SAMPLE = 200
+
+
+if __name__ == "__main__":
+    common_paths = get_metadata(CSV_PATH).common_paths('train_val')
+
+    print(f"📊 총 처리 대상 폴더 수: {len(common_paths)}개 | 크기: {PYRAMID_SIZES} | 워커 수: {NUM_WORKERS}")
+
+    # ==========================================
+    # 2. 폴더 단위 병렬 축소
+    # ==========================================
+    totals = {'frames': 0, 'written': 0, 'src_bytes': 0, 'dst_bytes': {size: 0 for size in PYRAMID_SIZES}}
+    error_folders = []
+
+    with ProcessPoolExecutor(max_workers=NUM_WORKERS) as executor:
+        futures = [executor.submit(build_folder_pyramid, cp, DATA_DIR, PYRAMID_SIZES, JPEG_QUALITY)
+                   for cp in common_paths]
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Building Pyramid"):
+            result = future.result()
+            for key in ('frames', 'written', 'src_bytes'):
+                totals[key] += result[key]
+            for size in PYRAMID_SIZES:
+                totals['dst_bytes'][size] += result['dst_bytes'][size]
+            if result['error']:
+                error_folders.append(f"{result['common_path']} ({result['error']})")
+
+    # ==========================================
+    # 3. 용량 / 디코딩 속도 리포트
+    # ==========================================
+    print("\n" + "="*40)
+    print(f"✅ 프레임 {totals['frames']:,}장 | 새로 생성 {totals['written']:,}개")
+    print(f"📦 원본 용량: {totals['src_bytes'] / 1e9:.2f}GB")
+
+    random.seed(0)
+    sample_paths = []
+    for common_path in random.sample(common_paths, min(len(common_paths), 20)):
+        frame_dir = DATA_DIR / "1_FRAME" / common_path
+        sample_paths += [p.relative_to(DATA_DIR / "1_FRAME") for p in sorted(frame_dir.glob("*.jpg"))[:DECODE_SAMPLE // 20]]
+
+    src_ms = measure_decode_time([DATA_DIR / "1_FRAME" / p for p in sample_paths])
+    print(f"⏱️ 원본 디코딩: {src_ms:.2f} ms/frame ({len(sample_paths)}장 샘플)")
+
+    for size in PYRAMID_SIZES:
+        dst_bytes = totals['dst_bytes'][size]
+        saved = totals['src_bytes'] - dst_bytes
+        dst_ms = measure_decode_time([DATA_DIR / pyramid_dir_name(size) / p for p in sample_paths])
+        print(f" - {pyramid_dir_name(size)}: {dst_bytes / 1e9:.2f}GB "
+              f"(절감 {saved / 1e9:.2f}GB, {saved / max(totals['src_bytes'], 1) * 100:.1f}%) | "
+              f"디코딩 {dst_ms:.2f} ms/frame (x{src_ms / max(dst_ms, 1e-9):.1f})")
+
+    if error_folders:
+        print(f"⚠️ 오류가 발생한 폴더 ({len(error_folders)}개):")
+        for err in error_folders:
+            print(f" - {err}")
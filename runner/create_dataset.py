@@ -2,35 +2,62 @@ import os
 import sys
 import shutil
 import yaml
-import pandas as pd
 from pathlib import Path
 from tqdm import tqdm
 # 경로 설정 (사용자 환경에 맞게 유지)
 BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
 sys.path.append(str(BASE_DIR))
-from funcs.data_utils import create_yolo_dataset_structure
+from funcs.data_utils import create_yolo_dataset_structure, check_list_dataset
+from funcs.metadata import get_metadata
+from funcs.integrity import load_bad_folders
 
 if __name__ == "__main__":
     # 경로 설정
     DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
     CSV_PATH = DATA_DIR / "metadata.csv" 
-    TEST_DATASET_DIR = DATA_DIR / "6_YOLO_TRAINING_DATA/v1.0_step1"
-    SAMPLING_STEP = 1
+    # '{step}' 자리에 각 Step 값이 들어갑니다. (v1.0_step1, v1.0_step15, v1.0_step30)
+    TEST_DATASET_DIR = DATA_DIR / "6_YOLO_TRAINING_DATA/v1.0_step{step}"
+    # 여러 Step을 한 번의 폴더 스캔으로 함께 생성합니다. (단일 값도 가능)
+    SAMPLING_STEP = [1, 15, 30]
+    # "stride": step 간격 / "motion": 움직임이 큰 구간 위주 / "diversity": 서로 다른 자세 위주 (같은 프레임 수)
+    # stride가 아니면 dataset 경로를 따로 두세요. (예: v1.0_motion_step{step})
+    SAMPLING = "stride"
+    # 폴더당 최대 프레임 수 (None이면 ceil(프레임 수 / step)). step과 무관한 예산이므로 step=1에서도 적용됩니다.
+    # 예: SAMPLING = "motion", MAX_FRAMES_PER_FOLDER = 300
+    MAX_FRAMES_PER_FOLDER = None
+    # "symlink": 프레임별 심볼릭 링크 + 라벨 복사 / "list": train.txt·val.txt 목록 + 폴더 단위 링크
+    DATASET_MODE = "symlink"
+    # 이미지 원본 폴더 (runner/build_frame_pyramid.py로 만든 축소 프레임을 쓰려면 "1_FRAME_640")
+    FRAME_DIR_NAME = "1_FRAME"
+    # runner/scan_integrity.py 리포트가 있으면 문제 폴더(프레임/JSON 폴더 없음, 깨진 이미지)를 미리 제외합니다.
+    INTEGRITY_REPORT_PATH = DATA_DIR / "integrity_report.json"
 
     # 데이터 로드
     print(f"📖 메타데이터 로드 중... ({CSV_PATH})")
-    df = pd.read_csv(CSV_PATH)
-    
     # Train 또는 Val로 마킹된 데이터만 필터링 (불필요한 루프 방지)
-    target_df = df[(df['is_train'] == True) | (df['is_val'] == True)]
+    target_df = get_metadata(CSV_PATH).split('train_val')
+    bad_folders = load_bad_folders(INTEGRITY_REPORT_PATH, issues=("missing_frame_dir", "missing_label_dir", "unreadable_images"), data_dir=DATA_DIR)
+    if bad_folders:
+        target_df = target_df[~target_df['common_path'].isin(bad_folders)]
+        print(f"🩺 무결성 리포트 기준 문제 폴더 {len(bad_folders)}개 제외")
     print(f"🎯 처리 대상 폴더: {len(target_df)}개 (Train + Val)")
 
-    # 함수 실행
+    # 함수 실행 (Step이 여러 개면 {step: yaml_path} 반환)
     generated_yaml = create_yolo_dataset_structure(
         df=target_df, 
         dataset_dir=TEST_DATASET_DIR, 
         data_dir=DATA_DIR, 
-        step=SAMPLING_STEP
+        step=SAMPLING_STEP,
+        mode=DATASET_MODE,
+        frame_dir_name=FRAME_DIR_NAME,
+        sampling=SAMPLING,
+        max_frames=MAX_FRAMES_PER_FOLDER
     )
+
+    # List 모드는 Ultralytics가 라벨을 찾을 수 있는지 샘플 검증
+    if DATASET_MODE == "list":
+        yaml_list = generated_yaml.values() if isinstance(generated_yaml, dict) else [generated_yaml]
+        for yaml_path in yaml_list:
+            check_list_dataset(yaml_path, max_check=1000)
     
     print(f"\n✅ 모든 작업이 끝났습니다. 학습을 시작할 준비가 되었습니다!")
@@ -0,0 +1,101 @@
+import sys
+import json
+import time
+import yaml
+import torch
+from pathlib import Path
+from tqdm import tqdm
+
+# 경로 설정 (사용자 환경에 맞게 유지)
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.image_utils import FrameSizeCache
+from funcs.metadata import get_metadata
+from funcs.frame_source import open_frame_source
+from funcs.result_store import ResultStore, checkpoint_hash, infer_with_store
+from funcs.pose_eval import PoseEvaluator, load_ground_truth
+from funcs.frame_sampler import sample_folder_positions
+
+# ==========================================
+# 1. 경로 및 실행 설정
+# ==========================================
+DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
+CSV_PATH = DATA_DIR / "metadata.csv"
+FRAME_SIZE_CACHE_PATH = DATA_DIR / "frame_size_cache.json"
+RESULT_DIR = DATA_DIR / "7_INFER_RESULTS"
+
+WEIGHTS_PATH = DATA_DIR / "checkpoints/YOLO_FINETUNING/v1.0_step30/weights/best.pt"
+# flip_idx를 읽을 data.yaml (없으면 기본 좌우 쌍 사용)
+DATA_YAML = DATA_DIR / "6_YOLO_TRAINING_DATA/v1.0_step30/data.yaml"
+
+SPLIT = "val"             # 평가할 split (train / val / train_val)
+STEP = 30                 # GT 프레임 샘플링 간격 (데이터셋 빌더의 stride와 같은 프레임 번호 순서 기준)
+FRAME_SOURCE = "frames"   # 예측이 없는 프레임을 추론할 때의 소스 ("frames" / "video")
+IMGSZ = 640
+BATCH_SIZE = 16
+PCK_ALPHA = 0.2
+OUTPUT_DIR = DATA_DIR / "test" / "pose_eval"
+
+
+if __name__ == "__main__":
+    target_df = get_metadata(CSV_PATH).split(SPLIT)
+
+    flip_idx = None
+    if DATA_YAML.exists():
+        with open(DATA_YAML, 'r') as f:
+            flip_idx = yaml.safe_load(f).get('flip_idx')
+
+    device = 0 if torch.cuda.is_available() else 'cpu'
+    store = ResultStore(RESULT_DIR)
+    ckpt_hash = checkpoint_hash(WEIGHTS_PATH)
+    size_cache = FrameSizeCache(FRAME_SIZE_CACHE_PATH)
+    evaluator = PoseEvaluator(flip_idx=flip_idx, pck_alpha=PCK_ALPHA)
+    model = None  # 결과 저장소에 없는 프레임이 있을 때만 로드
+
+    print(f"📊 평가 대상: {len(target_df)}개 영상 ({SPLIT}) | Step: {STEP} | ckpt: {ckpt_hash}")
+    start_t = time.perf_counter()
+
+    for common_path, video_path in tqdm(zip(target_df['common_path'], target_df.get('video_path', [None] * len(target_df))),
+                                        total=len(target_df), desc="Evaluating"):
+        size = size_cache.get(common_path, DATA_DIR / "1_FRAME" / common_path)
+        if size is None:
+            continue
+        gt_stems, gt_boxes, gt_kpts = load_ground_truth(DATA_DIR, common_path, *size)
+        # 라벨 stem은 문자열 순서(frame_1, frame_10, ...)이므로 빌더와 같은 프레임 번호 순서의 stride 위치를 사용합니다.
+        sel = sample_folder_positions(DATA_DIR, common_path, gt_stems.tolist(), STEP)[STEP]
+        gt_stems, gt_boxes, gt_kpts = gt_stems[sel], gt_boxes[sel], gt_kpts[sel]
+
+        stems = gt_stems.tolist()
+        if store.missing(ckpt_hash, common_path, IMGSZ, stems):
+            if model is None:
+                from ultralytics import YOLO
+                model = YOLO(str(WEIGHTS_PATH)).to(device)
+            pred = infer_with_store(model, WEIGHTS_PATH, store, common_path,
+                                    lambda missing: open_frame_source(DATA_DIR, common_path, video_path, FRAME_SOURCE, stems=missing),
+                                    stems, imgsz=IMGSZ, batch_size=BATCH_SIZE, device=device)
+        else:
+            pred = store.load(ckpt_hash, common_path, IMGSZ)
+
+        evaluator.add(common_path, gt_stems, gt_boxes, gt_kpts, pred)
+
+    size_cache.save()
+
+    # ==========================================
+    # 2. 결과 저장
+    # ==========================================
+    summary = evaluator.summary()
+    per_video = evaluator.per_video()
+    elapsed = time.perf_counter() - start_t
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    tag = f"{WEIGHTS_PATH.parent.parent.name}_{ckpt_hash}_{SPLIT}_step{STEP}"
+    per_video.to_csv(OUTPUT_DIR / f"{tag}_per_video.csv", index=False)
+    with open(OUTPUT_DIR / f"{tag}.json", 'w') as f:
+        json.dump({'weights': str(WEIGHTS_PATH), 'ckpt_hash': ckpt_hash, 'split': SPLIT, 'step': STEP,
+                   'imgsz': IMGSZ, 'pck_alpha': PCK_ALPHA, 'summary': summary}, f, indent=2)
+
+    print("\n" + "="*40)
+    print(f"✅ {summary['frames']:,} frames | {elapsed:.1f}s")
+    print(f"📈 AP50 {summary['AP50']:.4f} | AP75 {summary['AP75']:.4f} | AP50-95 {summary['AP50_95']:.4f}")
+    print(f"📈 PCK@{PCK_ALPHA} {summary['PCK']:.4f} | 좌우 뒤바뀜 {summary['swap_rate']:.4f}")
+    print(f"💾 저장: {OUTPUT_DIR / tag}.json / _per_video.csv")
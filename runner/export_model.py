@@ -0,0 +1,84 @@
+import sys
+import random
+import yaml
+import torch
+from pathlib import Path
+
+# 경로 설정 (사용자 환경에 맞게 유지)
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.frame_source import FrameDirSource
+from funcs.metadata import get_metadata
+from funcs.model_export import (export_checkpoint, artifact_path, runtime_available,
+                                check_parity, save_parity_report)
+
+# ==========================================
+# 1. 경로 및 실행 설정
+# ==========================================
+DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
+CSV_PATH = DATA_DIR / "metadata.csv"
+# 학습 설정 파일에서 output.base_dir / run_name / weights / best.pt 를 찾습니다.
+CONFIG_PATH = BASE_DIR / "config/exp_v1.0_step30.yaml"
+
+# export 대상 backend (openvino_int8은 data.yaml로 보정)
+EXPORT_BACKENDS = ["onnx", "openvino", "openvino_int8"]
+IMGSZ = 640
+
+# Parity check 설정
+PARITY_VIDEOS = 5            # val 영상 수
+PARITY_FRAMES_PER_VIDEO = 20
+TOL_PX = 3.0                 # 키포인트 오차 p95 허용치 (픽셀)
+TOL_PX_INT8 = 8.0            # INT8은 양자화 오차를 감안해 완화
+TOL_CONF = 0.05
+TOL_CONF_INT8 = 0.1
+
+
+if __name__ == "__main__":
+    from ultralytics import YOLO
+
+    with open(CONFIG_PATH, 'r') as f:
+        cfg = yaml.safe_load(f)
+    weights_path = Path(cfg['output']['base_dir']) / cfg['run_name'] / "weights" / "best.pt"
+    if not weights_path.exists():
+        raise FileNotFoundError(f"체크포인트를 찾을 수 없습니다: {weights_path}")
+
+    # ==========================================
+    # 2. Export
+    # ==========================================
+    exported = export_checkpoint(weights_path, EXPORT_BACKENDS, imgsz=IMGSZ, data=cfg['data']['config_path'])
+
+    # ==========================================
+    # 3. Parity Check (val 프레임 샘플)
+    # ==========================================
+    random.seed(0)
+    val_paths = get_metadata(CSV_PATH).common_paths('val')
+    frames = []
+    for common_path in random.sample(val_paths, min(PARITY_VIDEOS, len(val_paths))):
+        source = FrameDirSource(DATA_DIR / "1_FRAME" / common_path)
+        stems = source.stems[::max(1, len(source) // PARITY_FRAMES_PER_VIDEO)][:PARITY_FRAMES_PER_VIDEO]
+        frames += [(f"{common_path}/{stem}", img)
+                   for stem, img in FrameDirSource(DATA_DIR / "1_FRAME" / common_path, stems=stems)]
+    print(f"🎞️ Parity 샘플 프레임: {len(frames)}장")
+
+    device = 0 if torch.cuda.is_available() else 'cpu'
+    ref_model = YOLO(str(weights_path)).to(device)
+
+    reports = {}
+    for backend, path in exported.items():
+        if not runtime_available(backend):
+            print(f"⚠️ {backend}: 런타임이 설치되어 있지 않아 parity check를 건너뜁니다.")
+            continue
+        int8 = backend.endswith("int8")
+        test_model = YOLO(str(artifact_path(weights_path, backend)), task="pose")
+        reports[backend] = check_parity(ref_model, test_model, frames, IMGSZ, device,
+                                        tol_px=TOL_PX_INT8 if int8 else TOL_PX,
+                                        tol_conf=TOL_CONF_INT8 if int8 else TOL_CONF)
+        r = reports[backend]
+        status = "✅ PASS" if r['passed'] else "❌ FAIL"
+        print(f"{status} {backend}: kpt 오차 mean {r['kpt_err_px_mean']:.2f}px / p95 {r['kpt_err_px_p95']:.2f}px | "
+              f"conf 차이 max {r['conf_diff_max']:.3f} | 검출 불일치 {r['detection_mismatch']}/{r['frames']}")
+
+    report_path = save_parity_report(weights_path, reports)
+    print(f"\n💾 저장: {report_path}")
+    if not all(r['passed'] for r in reports.values()):
+        sys.exit(1)
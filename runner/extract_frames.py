@@ -0,0 +1,84 @@
+import os
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from tqdm import tqdm
+import sys
+
+# 경로 설정 (사용자 환경에 맞게 유지)
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.dir_index import list_dir
+from funcs.frame_sampler import sample_folder_positions
+from funcs.frame_source import frame_number
+from funcs.frame_source import VideoFileSource, resolve_video_path, export_frames
+from funcs.metadata import get_metadata
+
+# ==========================================
+# 1. 경로 및 실행 설정
+# ==========================================
+DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
+CSV_PATH = DATA_DIR / "metadata.csv"
+
+# 데이터셋 빌더(runner/create_dataset.py)의 SAMPLING_STEP과 같게 두면 학습에 쓰이는 프레임만 추출합니다.
+SAMPLING_STEP = [15, 30]
+SAMPLING = "stride"          # create_dataset.py의 SAMPLING과 같게 ("stride" / "motion" / "diversity")
+MAX_FRAMES_PER_FOLDER = None # create_dataset.py의 MAX_FRAMES_PER_FOLDER와 같게
+FRAME_DIR_NAME = "1_FRAME"
+JPEG_QUALITY = 95
+NUM_WORKERS = os.cpu_count() or 1
+
+
+def extract_folder(common_path, video_path):
+    """
+    [워커] 5_YOLO_TXT 라벨 중 샘플링되는 stem의 프레임만 3_MP4 영상에서 직접 decode하여 저장합니다.
+    이미 추출된 프레임은 decode하지 않습니다.
+    """
+    result = {'common_path': common_path, 'needed': 0, 'written': 0, 'error': None}
+    try:
+        label_entries = list_dir(DATA_DIR / "5_YOLO_TXT" / common_path) or {}
+        label_stems = sorted((name[:-4] for name in label_entries if name.endswith(".txt")), key=frame_number)
+        step_positions = sample_folder_positions(DATA_DIR, common_path, label_stems, SAMPLING_STEP, SAMPLING,
+                                                 MAX_FRAMES_PER_FOLDER)
+        needed = {label_stems[i] for positions in step_positions.values() for i in positions}
+        result['needed'] = len(needed)
+
+        output_dir = DATA_DIR / FRAME_DIR_NAME / common_path
+        existing = {name[:-4] for name in (list_dir(output_dir) or {}) if name.endswith(".jpg")}
+        missing = needed - existing
+        if not missing:
+            return result
+
+        source = VideoFileSource(resolve_video_path(DATA_DIR, common_path, video_path), stems=missing)
+        result['written'], _ = export_frames(source, output_dir, JPEG_QUALITY)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+if __name__ == "__main__":
+    target_df = get_metadata(CSV_PATH).split('train_val')
+    video_paths = target_df['video_path'] if 'video_path' in target_df else [None] * len(target_df)
+
+    print(f"📊 총 처리 대상 폴더 수: {len(target_df)}개 | Step: {SAMPLING_STEP} ({SAMPLING}) | 워커 수: {NUM_WORKERS}")
+
+    # ==========================================
+    # 2. 폴더 단위 병렬 추출
+    # ==========================================
+    totals = {'needed': 0, 'written': 0}
+    error_folders = []
+
+    with ProcessPoolExecutor(max_workers=NUM_WORKERS) as executor:
+        futures = [executor.submit(extract_folder, cp, vp) for cp, vp in zip(target_df['common_path'], video_paths)]
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Extracting Frames"):
+            result = future.result()
+            totals['needed'] += result['needed']
+            totals['written'] += result['written']
+            if result['error']:
+                error_folders.append(f"{result['common_path']} ({result['error']})")
+
+    print("\n" + "="*40)
+    print(f"✅ 필요 프레임 {totals['needed']:,}장 | 새로 추출 {totals['written']:,}장")
+    if error_folders:
+        print(f"⚠️ 오류가 발생한 폴더 ({len(error_folders)}개):")
+        for err in error_folders:
+            print(f" - {err}")
@@ -0,0 +1,59 @@
+import sys
+import torch
+from pathlib import Path
+from tqdm import tqdm
+
+# 경로 설정 (사용자 환경에 맞게 유지)
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.frame_source import open_frame_source
+from funcs.metadata import get_metadata
+from funcs.result_store import ResultStore, infer_with_store
+
+# ==========================================
+# 1. 경로 및 실행 설정
+# ==========================================
+DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
+CSV_PATH = DATA_DIR / "metadata.csv"
+CKPT_DIR = DATA_DIR / "checkpoints/YOLO/"
+# 결과 저장소: <RESULT_DIR>/<체크포인트 해시>/imgsz<IMGSZ>/<common_path>.npz
+RESULT_DIR = DATA_DIR / "7_INFER_RESULTS"
+
+MODEL_INFO = {
+    "YOLO11m-Pose": CKPT_DIR / "yolo11m-pose.pt",
+    "YOLO26m-Pose": CKPT_DIR / "yolo26m-pose.pt",
+}
+TARGETS = range(35, 40)
+STEP = 1                   # 결과가 필요한 프레임 간격
+FRAME_SOURCE = "frames"    # "frames" = 1_FRAME 폴더 (없으면 영상), "video" = 3_MP4에서 직접 decode
+IMGSZ = 640
+BATCH_SIZE = 8
+
+
+if __name__ == "__main__":
+    from ultralytics import YOLO
+
+    device = 0 if torch.cuda.is_available() else 'cpu'
+    meta = get_metadata(CSV_PATH)
+    store = ResultStore(RESULT_DIR)
+
+    print("📦 모델 로딩 중...")
+    models = {name: YOLO(str(path)).to(device) for name, path in MODEL_INFO.items()}
+
+    for target_idx in TARGETS:
+        if target_idx not in meta:
+            print(f"⚠️ Target {target_idx}: 메타데이터에 존재하지 않아 건너뜁니다.")
+            continue
+        common_path = meta.common_path(target_idx)
+        video_path = meta.video_path(target_idx)
+
+        # 필요한 프레임 stem 목록 (소스를 열기만 하고 decode는 하지 않음)
+        stems = open_frame_source(DATA_DIR, common_path, video_path, FRAME_SOURCE, STEP).stems
+
+        for name, model in models.items():
+            results = infer_with_store(
+                model, MODEL_INFO[name], store, common_path,
+                lambda missing: tqdm(open_frame_source(DATA_DIR, common_path, video_path, FRAME_SOURCE, stems=missing),
+                                     desc=f"{name} | Target {target_idx}", unit="frame", total=len(missing)),
+                stems, imgsz=IMGSZ, batch_size=BATCH_SIZE, device=device, predict_kwargs={'classes': [0]})
+            print(f"✅ {name} | Target {target_idx} ({common_path}): {len(results)}/{len(stems)} frames 저장됨")
@@ -1,98 +1,107 @@
-import json
-import cv2
-import numpy as np
-import pandas as pd
+import os
+import time
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from tqdm import tqdm
 import sys
 
 # 경로 설정 (사용자 환경에 맞게 유지)
 BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
 sys.path.append(str(BASE_DIR))
-from funcs.data_utils import convert_json_to_yolo_kpt_fixed, create_yolo_dataset_structure
+from funcs.data_utils import convert_folder_to_yolo
+from funcs.image_utils import FrameSizeCache
+from funcs.metadata import get_metadata
+from funcs.integrity import load_bad_folders
 
 # ==========================================
-# 1. 경로 및 데이터 로드
+# 1. 경로 및 실행 설정
 # ==========================================
 DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
-CSV_PATH = DATA_DIR / "metadata.csv" 
+CSV_PATH = DATA_DIR / "metadata.csv"
+# common_path별 프레임 해상도 캐시 (헤더만 읽어 채우며, 이후 실행에서는 프레임 조회 없음)
+FRAME_SIZE_CACHE_PATH = DATA_DIR / "frame_size_cache.json"
 
-# 메타데이터 로드
-df = pd.read_csv(CSV_PATH)
+# 병렬 워커 수 (1 이하이면 기존과 동일한 순차 처리)
+NUM_WORKERS = os.cpu_count() or 1
 
-# Train 및 Val 데이터만 필터링
-target_df = df[(df['is_train'] == True) | (df['is_val'] == True)]
+# 증분 변환: Manifest 기준으로 새로 생기거나 수정된 JSON만 변환하고 고아 .txt를 정리합니다.
+INCREMENTAL = True
+# Dry-run: 실제로 쓰지 않고 재변환/삭제 예정 개수만 출력합니다.
+DRY_RUN = False
+# 변환 결과를 common_path별 packed 라벨 shard(5_YOLO_SHARD)에도 기록합니다.
+WRITE_SHARDS = True
+# runner/scan_integrity.py 리포트가 있으면 프레임/JSON 폴더가 없는 폴더를 미리 건너뜁니다.
+INTEGRITY_REPORT_PATH = DATA_DIR / "integrity_report.json"
 
-print(f"📊 총 처리 대상 폴더 수: {len(target_df)}개 (Train + Val)")
 
-# ==========================================
-# 2. 전체 데이터 순회 및 변환 실행
-# ==========================================
+if __name__ == "__main__":
+    # 메타데이터 로드
+    # Train 및 Val 데이터만 필터링
+    common_paths = get_metadata(CSV_PATH).common_paths('train_val')
 
-total_success_files = 0  # 전체 변환 성공 파일 수 카운트
-error_folders = []       # 문제가 발생한 폴더 목록
-
-# target_df를 순회하도록 변경했습니다.
-for idx, row in tqdm(target_df.iterrows(), total=len(target_df), desc="Processing Folders"):
-    
-    try:
-        common_path = row['common_path']
-        
-        # 각 폴더별 경로 설정
-        FRAME_DIR = DATA_DIR / "1_FRAME" / common_path
-        INTERP_DIR = DATA_DIR / "4_INTERP_DATA" / common_path
-        YOLO_DIR = DATA_DIR / "5_YOLO_TXT" / common_path
-        
-        # 저장할 폴더가 없으면 생성합니다.
-        YOLO_DIR.mkdir(parents=True, exist_ok=True)
-        
-        # 이미지 파일 확인 (너비/높이 정보를 얻기 위해 하나만 읽음)
-        img_files = list(FRAME_DIR.glob("*.jpg")) + list(FRAME_DIR.glob("*.png"))
-        
-        if not img_files:
-            # 이미지가 없으면 해당 폴더는 건너뜁니다.
-            continue
-
-        # 첫 번째 이미지를 읽어 해상도(H, W) 정보를 가져옵니다.
-        sample_img = cv2.imread(str(img_files[0]))
-        if sample_img is None:
-             # 이미지가 깨져있거나 읽을 수 없는 경우
-            error_folders.append(f"{common_path} (Image Read Error)")
-            continue
-            
-        H, W = sample_img.shape[:2]
-
-        # JSON 파일 목록 가져오기
-        json_files = list(INTERP_DIR.glob("*.json"))
-        
-        if not json_files:
-             continue
-
-        # 폴더 내 파일 변환 루프
-        folder_success_count = 0
-        for json_file in json_files:
-            txt_file = YOLO_DIR / f"{json_file.stem}.txt"
-            
-            # 함수 호출
-            if convert_json_to_yolo_kpt_fixed(json_file, txt_file, W, H):
-                folder_success_count += 1
-        
-        total_success_files += folder_success_count
-
-    except Exception as e:
-        print(f"\n❌ 오류 발생 ({common_path}): {e}")
-        error_folders.append(f"{common_path} ({str(e)})")
-        continue
+    bad_folders = load_bad_folders(INTEGRITY_REPORT_PATH, issues=("missing_frame_dir", "missing_json_dir"), data_dir=DATA_DIR)
+    if bad_folders:
+        common_paths = [cp for cp in common_paths if cp not in bad_folders]
+        print(f"🩺 무결성 리포트 기준 문제 폴더 {len(bad_folders)}개 제외")
 
-# ==========================================
-# 3. 결과 요약
-# ==========================================
-print("\n" + "="*40)
-print(f"✅ 총 변환된 파일 수: {total_success_files}개")
-
-if error_folders:
-    print(f"⚠️ 오류가 발생한 폴더 ({len(error_folders)}개):")
-    for err in error_folders:
-        print(f" - {err}")
-else:
-    print("✨ 모든 폴더가 오류 없이 처리되었습니다.")
\ No newline at end of file
+    print(f"📊 총 처리 대상 폴더 수: {len(common_paths)}개 (Train + Val)")
+    print(f"⚙️ 워커 수: {NUM_WORKERS} | Incremental: {INCREMENTAL} | Dry-run: {DRY_RUN} | Shard: {WRITE_SHARDS}")
+
+    # 해상도는 부모 프로세스에서 캐시로 한 번에 확보하여 워커에 전달합니다.
+    size_cache = FrameSizeCache(FRAME_SIZE_CACHE_PATH)
+    img_sizes = {cp: size_cache.get(cp, DATA_DIR / "1_FRAME" / cp) for cp in common_paths}
+    size_cache.save()
+
+    # ==========================================
+    # 2. 전체 데이터 순회 및 변환 실행
+    # ==========================================
+    counts = {'files': 0, 'success': 0, 'converted': 0, 'skipped': 0, 'removed': 0}
+    error_folders = []  # 문제가 발생한 폴더 목록
+    pending_folders = []  # (Dry-run) 재변환/삭제 예정 파일이 있는 폴더 목록
+
+    def collect(result):
+        counts['files'] += result['total']
+        for key in ('success', 'converted', 'skipped', 'removed'):
+            counts[key] += result[key]
+        if DRY_RUN and (result['converted'] or result['removed']):
+            pending_folders.append(f"{result['common_path']} (변환 {result['converted']} / 삭제 {result['removed']})")
+        if result['error']:
+            print(f"\n❌ 오류 발생 ({result['common_path']}): {result['error']}")
+            error_folders.append(f"{result['common_path']} ({result['error']})")
+
+    start_t = time.perf_counter()
+
+    if NUM_WORKERS <= 1:
+        for common_path in tqdm(common_paths, desc="Processing Folders"):
+            collect(convert_folder_to_yolo(common_path, DATA_DIR, incremental=INCREMENTAL,
+                                           dry_run=DRY_RUN, img_size=img_sizes[common_path],
+                                           write_shard=WRITE_SHARDS))
+    else:
+        # 폴더 단위로 워커에 분배하고, 끝나는 순서대로 결과를 수집합니다.
+        with ProcessPoolExecutor(max_workers=NUM_WORKERS) as executor:
+            futures = [executor.submit(convert_folder_to_yolo, cp, DATA_DIR, incremental=INCREMENTAL,
+                                       dry_run=DRY_RUN, img_size=img_sizes[cp], write_shard=WRITE_SHARDS)
+                       for cp in common_paths]
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Processing Folders"):
+                collect(future.result())
+
+    elapsed = time.perf_counter() - start_t
+
+    # ==========================================
+    # 3. 결과 요약
+    # ==========================================
+    print("\n" + "="*40)
+    if DRY_RUN:
+        print(f"🧪 [Dry-run] 실제 파일은 변경되지 않았습니다. 재빌드 대상 폴더: {len(pending_folders)}개")
+        for item in sorted(pending_folders):
+            print(f" - {item}")
+    print(f"🔁 변환: {counts['converted']}개 | 건너뜀(변경 없음): {counts['skipped']}개 | 고아 .txt 삭제: {counts['removed']}개")
+    print(f"✅ 총 변환된 파일 수: {counts['success']}개 / {counts['files']}개")
+    print(f"⏱️ 소요 시간: {elapsed:.1f}s ({counts['files'] / max(elapsed, 1e-9):.1f} files/s)")
+
+    if error_folders:
+        print(f"⚠️ 오류가 발생한 폴더 ({len(error_folders)}개):")
+        for err in error_folders:
+            print(f" - {err}")
+    else:
+        print("✨ 모든 폴더가 오류 없이 처리되었습니다.")
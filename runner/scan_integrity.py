@@ -0,0 +1,57 @@
+import os
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from tqdm import tqdm
+import sys
+
+# 경로 설정 (사용자 환경에 맞게 유지)
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.integrity import scan_folder, save_report
+from funcs.metadata import get_metadata
+
+# ==========================================
+# 1. 경로 및 실행 설정
+# ==========================================
+DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
+CSV_PATH = DATA_DIR / "metadata.csv"
+# json2yolo.py / create_dataset.py가 이 리포트를 읽어 문제 폴더를 미리 건너뜁니다.
+REPORT_PATH = DATA_DIR / "integrity_report.json"
+
+SPLIT = "train_val"          # 검사할 split (train / val / train_val, None이면 전체)
+CHECK_IMAGES = True          # 이미지 헤더 검사 (프레임당 수백 바이트 읽기)
+CHECK_JSON = True            # 보간 JSON 키포인트 개수 검사 (JSON 전체 파싱)
+NUM_WORKERS = os.cpu_count() or 1
+
+
+if __name__ == "__main__":
+    common_paths = get_metadata(CSV_PATH).common_paths(SPLIT)
+    print(f"📊 검사 대상 폴더 수: {len(common_paths)}개 | 이미지: {CHECK_IMAGES} | JSON: {CHECK_JSON} | 워커 수: {NUM_WORKERS}")
+
+    # ==========================================
+    # 2. 폴더 단위 병렬 검사
+    # ==========================================
+    start_t = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=NUM_WORKERS) as executor:
+        futures = [executor.submit(scan_folder, cp, DATA_DIR, CHECK_IMAGES, CHECK_JSON) for cp in common_paths]
+        for future in tqdm(as_completed(futures), total=len(futures), desc="Scanning"):
+            results.append(future.result())
+
+    report = save_report(results, REPORT_PATH, DATA_DIR)
+    elapsed = time.perf_counter() - start_t
+
+    # ==========================================
+    # 3. 요약 출력
+    # ==========================================
+    files = sum(r['frames'] + r['jsons'] + r['labels'] for r in results)
+    print("\n" + "="*40)
+    print(f"✅ {len(results)}개 폴더 / {files:,}개 파일 검사 ({elapsed:.1f}s)")
+    if not report['summary'] and not report['errors']:
+        print("🎉 문제가 발견되지 않았습니다.")
+    for kind, info in report['summary'].items():
+        print(f" - {kind}: 폴더 {info['folders']}개 / {info['files']:,}건")
+    for common_path, error in report['errors'].items():
+        print(f"❌ {common_path}: {error}")
+    print(f"💾 저장: {REPORT_PATH}")
@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+from tqdm import tqdm
+
+# 경로 설정 (사용자 환경에 맞게 유지)
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.label_shards import shard_dir_for, export_shard_to_txt
+from funcs.metadata import get_metadata
+
+# ==========================================
+# 1. 경로 설정
+# ==========================================
+DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
+CSV_PATH = DATA_DIR / "metadata.csv"
+# 라벨 shard(5_YOLO_SHARD)로부터 기존 YOLO .txt 트리를 다시 만들 위치
+OUTPUT_TXT_DIR = DATA_DIR / "5_YOLO_TXT"
+
+
+if __name__ == "__main__":
+    target_df = get_metadata(CSV_PATH).split('train_val')
+    print(f"📊 총 처리 대상 폴더 수: {len(target_df)}개 (Train + Val)")
+
+    # ==========================================
+    # 2. Shard -> TXT Export
+    # ==========================================
+    total_files = 0
+    missing_shards = []
+    for common_path in tqdm(target_df['common_path'], desc="Exporting Shards"):
+        shard_dir = shard_dir_for(DATA_DIR, common_path)
+        written = export_shard_to_txt(shard_dir, OUTPUT_TXT_DIR / common_path)
+        if written == 0:
+            missing_shards.append(common_path)
+        total_files += written
+
+    print("\n" + "="*40)
+    print(f"✅ 총 생성된 .txt 파일 수: {total_files}개")
+    if missing_shards:
+        print(f"⚠️ shard가 없거나 비어 있는 폴더 ({len(missing_shards)}개):")
+        for common_path in missing_shards:
+            print(f" - {common_path}")
@@ -0,0 +1,63 @@
+import sys
+import glob
+import time
+import torch
+from pathlib import Path
+
+# 경로 설정 (사용자 환경에 맞게 유지)
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.sweep import expand_grid, load_job, run_sweep
+
+# ==========================================
+# 1. 경로 및 실행 설정
+# ==========================================
+TRAIN_SCRIPT = BASE_DIR / "runner" / "yolo_finetuning.py"
+OUTPUT_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data/checkpoints/YOLO_FINETUNING")
+LOG_DIR = OUTPUT_DIR / "sweep_logs"
+
+# 실행할 설정 파일 (glob). 정렬 순서대로 대기열에 들어갑니다.
+CONFIG_GLOB = str(BASE_DIR / "config" / "exp_v1.0_step*.yaml")
+
+# (선택) 파라미터 그리드: BASE_CONFIG에 모든 조합을 적용한 설정을 GRID_DIR에 만들어 대기열 뒤에 추가합니다.
+# 예: {'train.batch': [16, 32], 'train.imgsz': [480, 640]}
+BASE_CONFIG = BASE_DIR / "config" / "exp_v1.0_step30.yaml"
+GRID = {}
+GRID_DIR = BASE_DIR / "config" / "sweep"
+
+# 사용할 device (None이면 GPU 전체, GPU가 없으면 'cpu' 하나). device 하나에 job 하나씩 실행합니다.
+DEVICES = None
+POLL_SECONDS = 10
+
+
+if __name__ == "__main__":
+    config_paths = sorted(glob.glob(CONFIG_GLOB))
+    if GRID:
+        config_paths += [str(p) for p in expand_grid(BASE_CONFIG, GRID, GRID_DIR)]
+    jobs = [load_job(p) for p in config_paths]
+
+    devices = DEVICES
+    if devices is None:
+        devices = list(range(torch.cuda.device_count())) if torch.cuda.is_available() else ['cpu']
+
+    print(f"📊 실험 {len(jobs)}개 | device {devices}")
+    for job in jobs:
+        print(f" - {job['run_name']} ({Path(job['config']).name}) | data: {job['data_key']}")
+
+    # ==========================================
+    # 2. 실행 및 통합 결과표 저장
+    # ==========================================
+    start_t = time.perf_counter()
+    summary_df = run_sweep(jobs, devices, TRAIN_SCRIPT, LOG_DIR, poll_s=POLL_SECONDS)
+    elapsed = time.perf_counter() - start_t
+
+    csv_path = LOG_DIR / f"sweep_summary_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+    summary_df.to_csv(csv_path, index=False)
+
+    print("\n" + "="*40)
+    print(f"✅ 스윕 완료 ({elapsed / 60:.1f}분)")
+    columns = [c for c in ('run_name', 'status', 'device', 'wall_s', 'epochs_done', 'best_epoch',
+                           'metrics/mAP50(P)', 'metrics/mAP50-95(P)', 'images_per_s', 'data_wait_ratio',
+                           'epoch_s_mean') if c in summary_df.columns]
+    print(summary_df[columns].round(4).to_string(index=False))
+    print(f"💾 저장: {csv_path}")
@@ -0,0 +1,36 @@
+import os
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+# 경로 설정 (사용자 환경에 맞게 유지)
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.exp_logger import upload_pending
+
+# ==========================================
+# 1. 경로 및 실행 설정
+# ==========================================
+# 네트워크가 없던 노드에서 학습한 뒤, WandB에 접근 가능한 곳에서 실행합니다.
+ENV_PATH = BASE_DIR / ".env"
+METRICS_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data/checkpoints/YOLO_FINETUNING/metrics")
+PROJECT = "ASAN_YOLO_FINETUNING"   # 학습 때 WandB run이 없었던 기록에 사용할 프로젝트 이름
+
+
+if __name__ == "__main__":
+    load_dotenv(ENV_PATH)
+    import wandb
+    if os.getenv("WANDB_API_KEY"):
+        wandb.login(key=os.getenv("WANDB_API_KEY"))
+
+    log_paths = sorted(METRICS_DIR.glob("*.jsonl"))
+    print(f"📊 지표 기록 {len(log_paths)}개 확인")
+    for log_path in log_paths:
+        try:
+            count = upload_pending(log_path, project=PROJECT, name=log_path.stem)
+        except Exception as e:
+            print(f"❌ {log_path.stem}: {e}")
+            continue
+        if count:
+            print(f"✅ {log_path.stem}: {count}건 업로드")
+    print("🎉 업로드 완료")
@@ -0,0 +1,91 @@
+import sys
+import time
+import torch
+import pandas as pd
+from pathlib import Path
+
+# 경로 설정 (사용자 환경에 맞게 유지)
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.image_utils import FrameSizeCache
+from funcs.metadata import get_metadata
+from funcs.frame_source import open_frame_source
+from funcs.result_store import VideoResults
+from funcs.pose_eval import PoseEvaluator, load_ground_truth
+from funcs.tracking_infer import KeyframePoseRunner
+
+# ==========================================
+# 1. 경로 및 실행 설정
+# ==========================================
+DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
+CSV_PATH = DATA_DIR / "metadata.csv"
+FRAME_SIZE_CACHE_PATH = DATA_DIR / "frame_size_cache.json"
+WEIGHTS_PATH = DATA_DIR / "checkpoints/YOLO_FINETUNING/v1.0_step30/weights/best.pt"
+
+# 비교할 keyframe 간격 (1 = 매 프레임 전체 검출, 기준선)
+KEYFRAME_INTERVALS = [1, 5, 10, 30]
+CROP_IMGSZ = 320
+FULL_IMGSZ = 640
+MIN_CONF = 0.5
+MAX_MOTION = 0.25
+
+SPLIT = "val"
+MAX_VIDEOS = 10              # 측정에 사용할 영상 수 (연속 프레임 전체를 추론하므로 일부만 사용)
+FRAME_SOURCE = "frames"      # "frames" / "video"
+OUTPUT_DIR = DATA_DIR / "test" / "tracking_tradeoff"
+
+
+if __name__ == "__main__":
+    from ultralytics import YOLO
+
+    device = 0 if torch.cuda.is_available() else 'cpu'
+    target_df = get_metadata(CSV_PATH).split(SPLIT).head(MAX_VIDEOS)
+    size_cache = FrameSizeCache(FRAME_SIZE_CACHE_PATH)
+    model = YOLO(str(WEIGHTS_PATH)).to(device)
+
+    rows = []
+    for interval in KEYFRAME_INTERVALS:
+        runner = KeyframePoseRunner(model, interval, FULL_IMGSZ, CROP_IMGSZ, min_conf=MIN_CONF,
+                                    max_motion=MAX_MOTION, device=device)
+        evaluator = PoseEvaluator()
+        totals = {'frames': 0, 'full': 0, 'crop': 0, 'redetect': 0, 'elapsed_s': 0.0}
+
+        for _, row in target_df.iterrows():
+            common_path = row['common_path']
+            size = size_cache.get(common_path, DATA_DIR / "1_FRAME" / common_path)
+            if size is None:
+                continue
+            # 추적은 연속 프레임이 필요하므로 전체 프레임을 순서대로 읽습니다.
+            source = open_frame_source(DATA_DIR, common_path, row.get('video_path'), FRAME_SOURCE)
+            entries, stats = runner.run(source)
+            for key in totals:
+                totals[key] += stats[key]
+
+            gt_stems, gt_boxes, gt_kpts = load_ground_truth(DATA_DIR, common_path, *size)
+            evaluator.add(common_path, gt_stems, gt_boxes, gt_kpts, VideoResults.from_entries(entries))
+
+        summary = evaluator.summary()
+        fps = totals['frames'] / totals['elapsed_s'] if totals['elapsed_s'] > 0 else 0.0
+        rows.append({'keyframe_interval': interval, 'frames': totals['frames'], 'fps': fps,
+                     'full_ratio': totals['full'] / max(totals['frames'], 1),
+                     'redetect_ratio': totals['redetect'] / max(totals['crop'], 1),
+                     'AP50': summary['AP50'], 'AP50_95': summary['AP50_95'], 'PCK': summary['PCK']})
+        print(f"⏱️ interval {interval}: {fps:.1f} frames/s | full {rows[-1]['full_ratio']:.2f} | "
+              f"AP50-95 {summary['AP50_95']:.4f} | PCK {summary['PCK']:.4f}")
+
+    size_cache.save()
+
+    # ==========================================
+    # 2. 기준선(interval 1) 대비 리포트
+    # ==========================================
+    report = pd.DataFrame(rows)
+    base = report.iloc[0]
+    report['speedup'] = report['fps'] / base['fps'] if base['fps'] > 0 else float('nan')
+    report['dAP50_95'] = report['AP50_95'] - base['AP50_95']
+    report['dPCK'] = report['PCK'] - base['PCK']
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    csv_path = OUTPUT_DIR / f"tradeoff_{'gpu' if device != 'cpu' else 'cpu'}_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+    report.to_csv(csv_path, index=False)
+    print("\n" + report.round(4).to_string(index=False))
+    print(f"\n💾 저장: {csv_path}")
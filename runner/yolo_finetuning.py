@@ -1,10 +1,20 @@
 import os
+import sys
 import yaml
+from functools import partial
 from pathlib import Path
 from ultralytics import YOLO
 import wandb
 from dotenv import load_dotenv
 
+# 경로 설정 (사용자 환경에 맞게 유지)
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.frame_cache import stage_dataset
+from funcs.exp_logger import AsyncMetricLogger
+from funcs.train_profiler import TrainProfiler
+from funcs.autotune import autotune, load_autotune, save_autotune, apply_autotune
+
 # ---------------------------------------------------------
 # 1. 환경 설정 및 데이터 준비
 # ---------------------------------------------------------
@@ -12,9 +22,8 @@ ENV_PATH = "/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_
 load_dotenv(ENV_PATH)
 WANDB_API_KEY = os.getenv("WANDB_API_KEY")
 
+# 기본 설정 파일 (명령행 인자로 다른 설정 / device를 줄 수 있습니다: python yolo_finetuning.py <config.yaml> [device])
 CONFIG_PATH = "/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/config/exp_v1.0_step30.yaml"
-with open(CONFIG_PATH, 'r') as f:
-    cfg = yaml.safe_load(f)
 
 # ---------------------------------------------------------
 # 🛠️ 함수: 경로 유동성 해결 & 메타데이터 추출
@@ -35,89 +44,146 @@ def update_data_yaml_and_get_info(yaml_path):
         yaml.dump(data_cfg, f, sort_keys=False)
     return str(path_obj), step_info
 
-target_data_yaml = cfg['data']['config_path']
-fixed_data_yaml, dataset_step = update_data_yaml_and_get_info(target_data_yaml)
-
-# ---------------------------------------------------------
-# 🚀 WandB 초기화
-# ---------------------------------------------------------
-PROJECT = cfg['project_name']
-RUN_NAME = cfg['run_name']
-
-if cfg['logging']['use_wandb'] and WANDB_API_KEY:
-    try:
-        wandb.login(key=WANDB_API_KEY)
-        wandb_config = cfg.copy()
-        wandb_config['dataset'] = {'sampling_step': dataset_step, 'yaml_path': fixed_data_yaml}
-
-        wandb.init(
-            project=PROJECT,
-            name=RUN_NAME,
-            config=wandb_config,
-            resume="allow",
-            dir=cfg['output']['base_dir']
-        )
-        print(f"✅ WandB 초기화 성공 (Pose Task | Step: {dataset_step})")
-    except Exception as e:
-        print(f"⚠️ WandB 초기화 실패: {e}")
-
 # ---------------------------------------------------------
 # 🛠️ [핵심] 커스텀 WandB 콜백 (Pose Metrics 포함)
 # ---------------------------------------------------------
-def on_train_epoch_end(trainer):
+def on_train_epoch_end(trainer, metric_logger):
     """
     매 에폭 종료 시 실행. Pose Loss, Box Loss, mAP 등을 모두 기록합니다.
+    큐에 넣기만 하고 로컬 기록 / WandB 전달은 로거 스레드가 하므로 네트워크가 느리거나 끊겨도 학습이 멈추지 않습니다.
     """
-    if wandb.run:
-        # trainer.metrics 안에는 'pose_loss', 'box_loss' 등이 자동으로 포함됩니다.
-        wandb.log(trainer.metrics)
-        wandb.log({"epoch": trainer.epoch + 1})
+    # trainer.metrics 안에는 'pose_loss', 'box_loss' 등이 자동으로 포함됩니다.
+    metric_logger.log({**trainer.metrics, "epoch": trainer.epoch + 1})
 
 # ---------------------------------------------------------
-# 🤖 스마트 모델 로드 & 이어하기 (Pose Model 전용)
+# 🔥 실험 1개 실행 (runner/sweep.py가 설정 파일마다 별도 프로세스로 호출)
 # ---------------------------------------------------------
-CHECKPOINT_DIR = os.path.join(cfg['output']['base_dir'], RUN_NAME, 'weights')
-LAST_PT_PATH = os.path.join(CHECKPOINT_DIR, 'last.pt')
-BASE_MODEL_PATH = cfg['model']['base_path']
-
-resume_status = False
-
-# 1. 이어하기 (last.pt) 체크
-if os.path.exists(LAST_PT_PATH):
-    print(f"🔄 [Resume] 이전 학습 체크포인트를 발견했습니다: {LAST_PT_PATH}")
-    model = YOLO(LAST_PT_PATH)
-    resume_status = True
-
-# 2. 처음 시작 (설정 파일의 모델 경로 사용)
-elif os.path.exists(BASE_MODEL_PATH):
-    print(f"🆕 [Start] 설정된 Pose 모델을 로드합니다: {BASE_MODEL_PATH}")
-    model = YOLO(BASE_MODEL_PATH)
-    resume_status = False
+def main(config_path=CONFIG_PATH, device=None):
+    """
+    설정 파일 하나로 학습합니다. device를 주면 설정의 train.device를 덮어씁니다.
+    같은 run_name의 last.pt가 있으면 이어서 학습합니다.
+    """
+    with open(config_path, 'r') as f:
+        cfg = yaml.safe_load(f)
+    if device is not None:
+        cfg['train']['device'] = device
+
+    target_data_yaml = cfg['data']['config_path']
+    fixed_data_yaml, dataset_step = update_data_yaml_and_get_info(target_data_yaml)
+
+    # ---------------------------------------------------------
+    # 🚚 (선택) 로컬 SSD Staging: NAS 프레임을 노드 로컬 캐시로 복사 후 학습
+    # ---------------------------------------------------------
+    staging_cfg = cfg.get('staging', {})
+    if staging_cfg.get('enabled'):
+        fixed_data_yaml = str(stage_dataset(
+            fixed_data_yaml,
+            cache_dir=staging_cfg['cache_dir'],
+            max_gb=staging_cfg.get('max_gb', 200),
+            imgsz=cfg['train']['imgsz'] if staging_cfg.get('resize') else None,
+            num_workers=staging_cfg.get('num_workers', 8)
+        ))
+
+    # ---------------------------------------------------------
+    # ⚙️ (선택) batch / workers 자동 튜닝: 짧은 probe 학습으로 가장 빠르면서 메모리에 맞는 설정 선택
+    # ---------------------------------------------------------
+    autotune_cfg = cfg.get('autotune', {})
+    if autotune_cfg.get('enabled'):
+        autotune_dir = os.path.join(cfg['output']['base_dir'], 'autotune')
+        autotune_path = os.path.join(autotune_dir, f"{cfg['run_name']}.json")
+        tuned = load_autotune(autotune_path)
+        # 이미 튜닝한 실험이나 이어하기(last.pt)인 경우에는 다시 probe하지 않습니다.
+        if tuned is None and not os.path.exists(os.path.join(cfg['output']['base_dir'], cfg['run_name'], 'weights', 'last.pt')):
+            probe_model = cfg['model']['base_path'] if os.path.exists(cfg['model']['base_path']) else "yolo11n-pose.pt"
+            tuned = autotune(probe_model, fixed_data_yaml, cfg['train'].get('device', 0), autotune_cfg,
+                             train_kwargs=cfg['train'], project=autotune_dir)
+            save_autotune(tuned, autotune_path)
+        if tuned is not None:
+            apply_autotune(cfg, tuned)
+            print(f"⚙️ [Autotune] batch {tuned['batch']} | workers {tuned['workers']} | threads {tuned['threads']}")
+
+    # ---------------------------------------------------------
+    # 🚀 WandB 초기화
+    # ---------------------------------------------------------
+    PROJECT = cfg['project_name']
+    RUN_NAME = cfg['run_name']
+
+    if cfg['logging']['use_wandb'] and WANDB_API_KEY:
+        try:
+            wandb.login(key=WANDB_API_KEY)
+            wandb_config = cfg.copy()
+            wandb_config['dataset'] = {'sampling_step': dataset_step, 'yaml_path': fixed_data_yaml}
+
+            wandb.init(
+                project=PROJECT,
+                name=RUN_NAME,
+                config=wandb_config,
+                resume="allow",
+                dir=cfg['output']['base_dir']
+            )
+            print(f"✅ WandB 초기화 성공 (Pose Task | Step: {dataset_step})")
+        except Exception as e:
+            print(f"⚠️ WandB 초기화 실패: {e}")
+
+    # ---------------------------------------------------------
+    # 🤖 스마트 모델 로드 & 이어하기 (Pose Model 전용)
+    # ---------------------------------------------------------
+    CHECKPOINT_DIR = os.path.join(cfg['output']['base_dir'], RUN_NAME, 'weights')
+    LAST_PT_PATH = os.path.join(CHECKPOINT_DIR, 'last.pt')
+    BASE_MODEL_PATH = cfg['model']['base_path']
 
-# 3. 파일 없음 (자동 다운로드 - Pose 버전 명시)
-else:
-    print(f"⚠️ [Download] 모델 파일을 찾을 수 없어 'yolo11n-pose.pt'를 다운로드합니다.")
-    # 사용자가 실수로 일반 모델을 적었더라도, 파일이 없으면 확실하게 pose 모델을 받도록 처리
-    model = YOLO("yolo11n-pose.pt") 
     resume_status = False
 
-# ---------------------------------------------------------
-# 🔗 콜백 등록 및 학습 시작
-# ---------------------------------------------------------
-# 커스텀 콜백 등록
-model.add_callback("on_train_epoch_end", on_train_epoch_end)
-print("✅ 커스텀 WandB 콜백 등록 완료")
-
-print(f"\n🔥 Pose Estimation 학습 시작: {RUN_NAME} (Resume: {resume_status})")
-
-model.train(
-    data=fixed_data_yaml,
-    project=cfg['output']['base_dir'], 
-    name=RUN_NAME,
-    resume=resume_status,
-    plots=True,
-    **cfg['train'] 
-)
-
-if wandb.run:
-    wandb.finish()
\ No newline at end of file
+    # 1. 이어하기 (last.pt) 체크
+    if os.path.exists(LAST_PT_PATH):
+        print(f"🔄 [Resume] 이전 학습 체크포인트를 발견했습니다: {LAST_PT_PATH}")
+        model = YOLO(LAST_PT_PATH)
+        resume_status = True
+
+    # 2. 처음 시작 (설정 파일의 모델 경로 사용)
+    elif os.path.exists(BASE_MODEL_PATH):
+        print(f"🆕 [Start] 설정된 Pose 모델을 로드합니다: {BASE_MODEL_PATH}")
+        model = YOLO(BASE_MODEL_PATH)
+        resume_status = False
+
+    # 3. 파일 없음 (자동 다운로드 - Pose 버전 명시)
+    else:
+        print(f"⚠️ [Download] 모델 파일을 찾을 수 없어 'yolo11n-pose.pt'를 다운로드합니다.")
+        # 사용자가 실수로 일반 모델을 적었더라도, 파일이 없으면 확실하게 pose 모델을 받도록 처리
+        model = YOLO("yolo11n-pose.pt") 
+        resume_status = False
+
+    # ---------------------------------------------------------
+    # 🔗 콜백 등록 및 학습 시작
+    # ---------------------------------------------------------
+    # 커스텀 콜백 등록 (WandB가 없거나 실패해도 <base_dir>/metrics/<run_name>.jsonl 에 먼저 기록)
+    metric_logger = AsyncMetricLogger(os.path.join(cfg['output']['base_dir'], 'metrics', f"{RUN_NAME}.jsonl"),
+                                      use_wandb=wandb.run is not None)
+    model.add_callback("on_train_epoch_end", partial(on_train_epoch_end, metric_logger=metric_logger))
+    # 구간별 시간 / 처리량 / 메모리 프로파일 (<run_dir>/profile_epochs.csv, profile_summary.json)
+    TrainProfiler(metric_logger=metric_logger).register(model)
+    print("✅ 커스텀 WandB / 프로파일러 콜백 등록 완료")
+
+    print(f"\n🔥 Pose Estimation 학습 시작: {RUN_NAME} (Resume: {resume_status})")
+
+    try:
+        model.train(
+            data=fixed_data_yaml,
+            project=cfg['output']['base_dir'], 
+            name=RUN_NAME,
+            resume=resume_status,
+            plots=True,
+            **cfg['train'] 
+        )
+    finally:
+        metric_logger.close()
+        if wandb.run:
+            wandb.finish()
+
+
+if __name__ == "__main__":
+    config_arg = sys.argv[1] if len(sys.argv) > 1 else CONFIG_PATH
+    device_arg = sys.argv[2] if len(sys.argv) > 2 else None
+    if device_arg is not None and device_arg.isdigit():
+        device_arg = int(device_arg)
+    main(config_arg, device_arg)
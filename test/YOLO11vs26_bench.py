@@ -0,0 +1,63 @@
+import sys
+import time
+import torch
+from pathlib import Path
+from ultralytics import YOLO
+
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.benchmark import run_benchmark, environment_info, save_benchmark
+from funcs.metadata import get_metadata
+
+# 1. 경로 및 기본 설정
+DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
+CKPT_DIR = DATA_DIR / "checkpoints/YOLO/"
+MODEL_INFO = {
+    "YOLO11m": CKPT_DIR / "yolo11m.pt",
+    "YOLO26m": CKPT_DIR / "yolo26m.pt",
+    "YOLO11m-Pose": CKPT_DIR / "yolo11m-pose.pt",
+    "YOLO26m-Pose": CKPT_DIR / "yolo26m-pose.pt",
+}
+
+# 벤치마크 설정
+TARGETS = [35, 36, 37, 38, 39]       # 프레임을 가져올 metadata 행 번호
+FRAMES_PER_TARGET = 100              # target당 사용할 프레임 수
+BATCH_SIZES = [1, 8, 16]
+IMGSZ = 640
+WARMUP_BATCHES = 2                   # 통계에서 제외할 앞쪽 배치 수
+PLOT = True                          # result.plot() 시간도 측정
+OUTPUT_DIR = DATA_DIR / "test" / "benchmark"
+
+# 2. 장치 설정 (GPU가 없으면 CPU에서 동일하게 측정)
+device = 0 if torch.cuda.is_available() else 'cpu'
+print(f"✅ 장치: {device}")
+
+# 3. 벤치마크 프레임 수집
+metadata = get_metadata(DATA_DIR / "metadata.csv")
+frame_paths = []
+for target_idx in TARGETS:
+    if target_idx not in metadata:
+        print(f"⚠️ Target {target_idx}: 메타데이터에 존재하지 않아 건너뜁니다.")
+        continue
+    frame_dir = DATA_DIR / "1_FRAME" / metadata.common_path(target_idx)
+    frame_paths += sorted(frame_dir.glob("*.jpg"))[:FRAMES_PER_TARGET]
+print(f"🎞️ 벤치마크 프레임: {len(frame_paths)}장")
+
+# 4. 모델 로드 (한 번만)
+print("📦 모델 로딩 중...")
+models = {name: YOLO(str(path)) for name, path in MODEL_INFO.items()}
+
+# 5. 측정 및 저장
+results_df = run_benchmark(models, frame_paths, BATCH_SIZES, imgsz=IMGSZ, device=device,
+                           warmup_batches=WARMUP_BATCHES, plot=PLOT, predict_kwargs={'classes': [0]})
+
+tag = f"bench_{'gpu' if device != 'cpu' else 'cpu'}_{time.strftime('%Y%m%d_%H%M%S')}"
+meta = {'env': environment_info(device), 'targets': TARGETS, 'frames': len(frame_paths),
+        'batch_sizes': BATCH_SIZES, 'imgsz': IMGSZ, 'warmup_batches': WARMUP_BATCHES,
+        'models': {name: str(path) for name, path in MODEL_INFO.items()}}
+csv_path, json_path = save_benchmark(results_df, OUTPUT_DIR, tag, meta)
+
+cols = ['model', 'batch_size', 'fps', 'latency_ms_p50', 'latency_ms_p95',
+        'decode_ms_p50', 'preprocess_ms_p50', 'inference_ms_p50', 'postprocess_ms_p50', 'plot_ms_p50']
+print(results_df[cols].round(2).to_string(index=False))
+print(f"\n💾 저장: {csv_path}\n💾 저장: {json_path}")
@@ -0,0 +1,128 @@
+import cv2
+import time
+import torch
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.dir_index import list_dir
+from funcs.image_utils import read_image_size
+from funcs.frame_source import frame_number
+from funcs.video_pipeline import run_pipeline, iter_frame_files, video_writer_fn, comparison_render_fn
+from funcs.metadata import get_metadata
+from funcs.target_scheduler import (select_targets, is_target_done, write_done_marker,
+                                    run_targets, save_timing_summary)
+
+# ==========================================
+# 1. 경로 및 실행 설정
+# ==========================================
+DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
+CKPT_DIR = DATA_DIR / "checkpoints/YOLO/"
+MODEL_INFO = [
+    {"name": "YOLO11m", "path": str(CKPT_DIR / "yolo11m.pt")},
+    {"name": "YOLO26m", "path": str(CKPT_DIR / "yolo26m.pt")},
+    {"name": "YOLO11m-Pose", "path": str(CKPT_DIR / "yolo11m-pose.pt")},
+    {"name": "YOLO26m-Pose", "path": str(CKPT_DIR / "yolo26m-pose.pt")},
+]
+VIDEO_FILENAME = "Comparison_v1.2.mp4"
+
+# 처리 대상: 행 번호와 (선택) metadata 필터. 둘 다 주면 교집합입니다.
+TARGETS = range(35, 40)
+TARGET_QUERY = None            # 예: "is_val == True"
+
+# 워커 설정: GPU가 있으면 GPU마다, 없으면 CPU 코어를 나누어 워커를 띄웁니다.
+WORKERS_PER_DEVICE = 1
+CPU_WORKERS = 2
+
+# 워커 내부 파이프라인 설정 (v1.2와 동일)
+BATCH_SIZE = 8
+RENDER_WORKERS = 4
+QUEUE_SIZE = 32
+
+
+# ==========================================
+# 2. 워커 함수 (spawn으로 전달되므로 모듈 최상위에 정의)
+# ==========================================
+def load_models(device):
+    from ultralytics import YOLO
+    print(f"📦 [pid {os.getpid()}] 모델 로딩 중... (device {device})")
+    return [YOLO(m["path"]).to(device) for m in MODEL_INFO]
+
+
+def list_frames(frame_dir):
+    # stem 번호가 0으로 채워져 있지 않으므로(frame_1, frame_10, ...) 프레임 번호 순서로 정렬합니다.
+    entries = list_dir(frame_dir) or {}
+    paths = [Path(entry.path) for name, entry in entries.items() if name.endswith(".jpg")]
+    return sorted(paths, key=lambda p: (frame_number(p.stem), p.name))
+
+
+render = comparison_render_fn([m['name'] for m in MODEL_INFO])
+
+
+def process_target(target, models, device):
+    """
+    [워커] (target 번호, common_path) 하나의 2x2 비교 영상을 만들고 완료 마커를 남깁니다.
+    """
+    target_idx, common_path = target
+    frame_dir = DATA_DIR / "1_FRAME" / common_path
+    output_dir = DATA_DIR / "test" / common_path
+    os.makedirs(output_dir, exist_ok=True)
+    output_video_path = output_dir / VIDEO_FILENAME
+
+    frame_files = list_frames(frame_dir)
+    if not frame_files:
+        raise FileNotFoundError(f"프레임 없음: {frame_dir}")
+    w, h = read_image_size(frame_files[0])
+
+    def infer(images):
+        per_model = [model.predict(images, imgsz=640, classes=[0], device=device, verbose=False) for model in models]
+        return list(zip(*per_model))
+
+    out = cv2.VideoWriter(str(output_video_path), cv2.VideoWriter_fourcc(*'mp4v'), 30.0, (w * 2, h * 2))
+    try:
+        stats = run_pipeline(iter_frame_files(frame_files), infer, render, video_writer_fn(out),
+                             batch_size=BATCH_SIZE, num_render_workers=RENDER_WORKERS, queue_size=QUEUE_SIZE)
+    finally:
+        out.release()
+
+    write_done_marker(output_video_path, {'frames': stats['frames'], 'common_path': common_path,
+                                          'device': str(device), 'elapsed_s': stats['elapsed_s']})
+    return {'common_path': common_path, 'frames': stats['frames']}
+
+
+# ==========================================
+# 3. 실행
+# ==========================================
+if __name__ == "__main__":
+    meta = get_metadata(DATA_DIR / "metadata.csv")
+
+    # 완료된 target (영상 + 프레임 수가 일치하는 완료 마커) 은 건너뜁니다.
+    targets, skipped = [], []
+    for target_idx in select_targets(meta.df, TARGETS, TARGET_QUERY):
+        common_path = meta.common_path(target_idx)
+        num_frames = len(list_frames(DATA_DIR / "1_FRAME" / common_path))
+        if is_target_done(DATA_DIR / "test" / common_path / VIDEO_FILENAME, num_frames):
+            skipped.append(target_idx)
+        else:
+            targets.append((target_idx, common_path))
+
+    if torch.cuda.is_available():
+        devices, num_threads = list(range(torch.cuda.device_count())), None
+    else:
+        devices, num_threads = ['cpu'] * CPU_WORKERS, max(1, (os.cpu_count() or 1) // CPU_WORKERS)
+
+    print(f"📊 처리 대상 {len(targets)}개 | 완료되어 건너뜀 {len(skipped)}개 {skipped} | 장치 {devices}")
+
+    timing_df = run_targets(targets, process_target, load_models, devices,
+                            workers_per_device=WORKERS_PER_DEVICE, num_threads=num_threads)
+
+    if len(timing_df):
+        timing_df['target'] = timing_df['target'].map(lambda t: t[0])
+        csv_path = save_timing_summary(timing_df, DATA_DIR / "test" / "benchmark" /
+                                       f"multi_target_{time.strftime('%Y%m%d_%H%M%S')}.csv")
+        print(timing_df.drop(columns=['pid']).round(2).to_string(index=False))
+        print(f"\n💾 저장: {csv_path}")
+
+    print("\n🎉 모든 Target 분석 완료")
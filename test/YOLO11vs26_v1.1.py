@@ -2,11 +2,16 @@ import cv2
 import time
 import torch
 import os
-import pandas as pd
+import sys
 from pathlib import Path
 from ultralytics import YOLO
 from tqdm import tqdm
 
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.image_utils import FrameSizeCache
+from funcs.metadata import get_metadata
+
 # 1. 경로 및 기본 설정
 DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
 YOLO11_PATH = DATA_DIR / "checkpoints/YOLO/" / "yolo11m.pt"
@@ -14,11 +19,11 @@ YOLO26_PATH = DATA_DIR / "checkpoints/YOLO/" / "yolo26m.pt"
 YOLO11_POSE_PATH = DATA_DIR / "checkpoints/YOLO/" / "yolo11m-pose.pt"
 YOLO26_POSE_PATH = DATA_DIR / "checkpoints/YOLO/" / "yolo26m-pose.pt"
 
-# 메타데이터 로드
-metadata_path = DATA_DIR / "metadata.csv"
-if not metadata_path.exists():
-    raise FileNotFoundError("metadata.csv 파일을 찾을 수 없습니다.")
-df = pd.read_csv(metadata_path)
+# 메타데이터 로드 (바이너리 캐시, 파일이 없으면 FileNotFoundError)
+meta = get_metadata(DATA_DIR / "metadata.csv")
+
+# common_path별 해상도 캐시 (프레임 디코딩 없이 헤더만 읽음)
+size_cache = FrameSizeCache(DATA_DIR / "frame_size_cache.json")
 
 # 2. GPU 장치 설정
 device = 0 if torch.cuda.is_available() else 'cpu'
@@ -45,11 +50,11 @@ TARGET_END = 40
 for target_idx in range(TARGET_START, TARGET_END):
     try:
         # 데이터프레임 인덱스 확인
-        if target_idx not in df.index:
+        if target_idx not in meta:
             print(f"⚠️ Target {target_idx}: 메타데이터에 존재하지 않아 건너뜁니다.")
             continue
 
-        COMMON_PATH = df.loc[target_idx, "common_path"]
+        COMMON_PATH = meta.common_path(target_idx)
         
         # 입력 및 출력 경로 설정
         FRAME_DIR = DATA_DIR / "1_FRAME" / COMMON_PATH
@@ -63,8 +68,8 @@ for target_idx in range(TARGET_START, TARGET_END):
             continue
 
         # 비디오 저장 설정
-        sample_img = cv2.imread(str(frame_files[0]))
-        h, w = sample_img.shape[:2]
+        w, h = size_cache.get(COMMON_PATH, FRAME_DIR)
+        size_cache.save()
         
         # 파일명 (Tracking이 빠졌으므로 Detection으로 명시하면 좋습니다)
         video_filename = f"Comparison_v1.1.mp4"
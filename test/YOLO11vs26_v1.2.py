@@ -0,0 +1,129 @@
+import cv2
+import torch
+import os
+import sys
+from pathlib import Path
+from ultralytics import YOLO
+from tqdm import tqdm
+
+BASE_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/ASAN_01_mini_yolo_finetuning/")
+sys.path.append(str(BASE_DIR))
+from funcs.image_utils import FrameSizeCache
+from funcs.video_pipeline import run_pipeline, video_writer_fn, comparison_render_fn
+from funcs.frame_source import open_frame_source
+from funcs.metadata import get_metadata
+
+# 1. 경로 및 기본 설정
+DATA_DIR = Path("/workspace/nas203/ds_RehabilitationMedicineData/IDs/tojihoo/data")
+YOLO11_PATH = DATA_DIR / "checkpoints/YOLO/" / "yolo11m.pt"
+YOLO26_PATH = DATA_DIR / "checkpoints/YOLO/" / "yolo26m.pt"
+YOLO11_POSE_PATH = DATA_DIR / "checkpoints/YOLO/" / "yolo11m-pose.pt"
+YOLO26_POSE_PATH = DATA_DIR / "checkpoints/YOLO/" / "yolo26m-pose.pt"
+
+# 파이프라인 설정
+BATCH_SIZE = 8          # 모델별 predict 한 번에 넣을 프레임 수
+RENDER_WORKERS = 4      # plot / 오버레이 / 4분할 병합 스레드 수
+QUEUE_SIZE = 32         # 단계 사이 bounded queue 크기 (프레임 단위)
+# 프레임 소스: "frames" = 1_FRAME 폴더 (없으면 영상), "video" = 3_MP4 영상에서 직접 decode
+FRAME_SOURCE = "frames"
+
+# 메타데이터 로드 (바이너리 캐시, 파일이 없으면 FileNotFoundError)
+meta = get_metadata(DATA_DIR / "metadata.csv")
+
+# common_path별 해상도 캐시 (프레임 디코딩 없이 헤더만 읽음)
+size_cache = FrameSizeCache(DATA_DIR / "frame_size_cache.json")
+
+# 2. GPU 장치 설정
+device = 0 if torch.cuda.is_available() else 'cpu'
+if device == 0:
+    torch.cuda.set_device(device)
+    print(f"✅ GPU 가속 활성화: {torch.cuda.get_device_name(0)}")
+
+# 3. 모델 로드 (루프 외부에서 단 한 번만 수행)
+print("📦 모델 로딩 중... (한 번만 실행됩니다)")
+model_info = [
+    {"name": "YOLO11m", "path": str(YOLO11_PATH)},
+    {"name": "YOLO26m", "path": str(YOLO26_PATH)},
+    {"name": "YOLO11m-Pose", "path": str(YOLO11_POSE_PATH)},
+    {"name": "YOLO26m-Pose", "path": str(YOLO26_POSE_PATH)}
+]
+# 모델을 GPU로 이동
+models = [YOLO(m["path"]).to(device) for m in model_info]
+print("🚀 모델 로드 완료!")
+
+
+# --- 파이프라인 단계 정의 ---
+def infer(images):
+    """
+    [추론 단계] 모델별로 배치 predict 후, 프레임별 [모델 4개 결과] 리스트로 묶어 반환합니다.
+    """
+    per_model = [model.predict(images, imgsz=640, classes=[0], device=device, verbose=False) for model in models]
+    return list(zip(*per_model))
+
+
+render = comparison_render_fn([m['name'] for m in model_info])
+
+
+# 4. Target 루프 실행
+TARGET_START = 35
+TARGET_END = 40
+
+for target_idx in range(TARGET_START, TARGET_END):
+    try:
+        # 데이터프레임 인덱스 확인
+        if target_idx not in meta:
+            print(f"⚠️ Target {target_idx}: 메타데이터에 존재하지 않아 건너뜁니다.")
+            continue
+
+        COMMON_PATH = meta.common_path(target_idx)
+
+        # 입력 및 출력 경로 설정
+        FRAME_DIR = DATA_DIR / "1_FRAME" / COMMON_PATH
+        OUTPUT_DIR = DATA_DIR / "test" / COMMON_PATH
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+        # 프레임 소스 확보 (1_FRAME 폴더 또는 3_MP4 영상)
+        source = open_frame_source(DATA_DIR, COMMON_PATH, meta.video_path(target_idx), prefer=FRAME_SOURCE)
+        if len(source) == 0:
+            print(f"⚠️ Target {target_idx} ({COMMON_PATH}): 프레임이 없어 건너뜁니다.")
+            continue
+
+        # 비디오 저장 설정
+        if FRAME_DIR.is_dir():
+            w, h = size_cache.get(COMMON_PATH, FRAME_DIR)
+            size_cache.save()
+        else:
+            w, h = source.size
+
+        video_filename = f"Comparison_v1.2.mp4"
+        output_video_path = str(OUTPUT_DIR / video_filename)
+
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        out = cv2.VideoWriter(output_video_path, fourcc, 30.0, (w * 2, h * 2))
+
+        print(f"\n▶️ [Target {target_idx}] Pipeline 분석 시작: {len(source)} Frames")
+        print(f"   📂 저장 경로: {output_video_path}")
+
+        # --- 비동기 파이프라인 (reader -> 추론 -> 렌더링 풀 -> writer, 프레임 순서 유지) ---
+        with tqdm(total=len(source), desc=f"Target {target_idx}", unit="frame") as pbar:
+            write_frame = video_writer_fn(out)
+
+            def write_and_update(stem, frame):
+                write_frame(stem, frame)
+                pbar.update(1)
+
+            stats = run_pipeline(source, infer, render, write_and_update,
+                                 batch_size=BATCH_SIZE, num_render_workers=RENDER_WORKERS, queue_size=QUEUE_SIZE)
+
+        busy = " | ".join(f"{stage} {sec:.1f}s" for stage, sec in stats['busy_s'].items())
+        print(f"   ⏱️ {stats['fps']:.1f} frames/s ({stats['elapsed_s']:.1f}s) | 단계별 누적: {busy}")
+
+        # 현재 Target 작업 종료
+        out.release()
+
+    except Exception as e:
+        print(f"\n❌ [Error] Target {target_idx} 처리 중 오류 발생: {e}")
+        if 'out' in locals(): out.release()
+        continue
+
+print("\n🎉 모든 Target 분석 완료 (Pipeline 모드)")
@@ -0,0 +1,135 @@
+import os
+import sys
+import time
+import shutil
+import tempfile
+import contextlib
+import pandas as pd
+from pathlib import Path
+
+# 저장소 루트를 경로에 추가 (NAS 밖에서도 실행 가능하도록 상대 경로 사용)
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.append(str(BASE_DIR))
+from funcs.data_utils import create_yolo_dataset_structure
+
+# =========================================================
+# 1. 벤치마크 설정
+# =========================================================
+NUM_FOLDERS = 20          # 가상 common_path 개수
+FRAMES_PER_FOLDER = 500   # 폴더당 프레임 수
+SAMPLING_STEP = 1
+# 실제 NAS 경로에서 측정하려면 여기에 기존 data 경로를 지정합니다. (None이면 임시 폴더에 가상 트리 생성)
+DATA_DIR = None
+
+
+# =========================================================
+# 2. 기존 구현 (glob + 파일 단위 exists/is_symlink) - 비교 기준
+# =========================================================
+def legacy_create_yolo_dataset_structure(df, dataset_dir, data_dir, step=30):
+    for split in ['train', 'val']:
+        (dataset_dir / 'images' / split).mkdir(parents=True, exist_ok=True)
+        (dataset_dir / 'labels' / split).mkdir(parents=True, exist_ok=True)
+
+    for idx, row in df.iterrows():
+        if row.get('is_train') == True: split = 'train'
+        elif row.get('is_val') == True: split = 'val'
+        else: continue
+
+        common_path = row['common_path']
+        src_label_dir = data_dir / "5_YOLO_TXT" / common_path
+        src_image_dir = data_dir / "1_FRAME" / common_path
+        if not src_label_dir.exists() or not src_image_dir.exists():
+            continue
+
+        label_files = sorted(list(src_label_dir.glob("*.txt")))
+        for label_file in label_files[::step]:
+            file_stem = label_file.stem
+            image_file = src_image_dir / f"{file_stem}.jpg"
+            if not image_file.exists():
+                image_file = src_image_dir / f"{file_stem}.png"
+            if not image_file.exists(): continue
+
+            unique_name = f"{common_path.replace('/', '_')}_{file_stem}"
+            dst_image = dataset_dir / 'images' / split / f"{unique_name}{image_file.suffix}"
+            dst_label = dataset_dir / 'labels' / split / f"{unique_name}.txt"
+
+            if dst_image.is_symlink() and not dst_image.exists():
+                dst_image.unlink()
+            if dst_image.exists() and dst_label.exists():
+                continue
+            if not dst_image.exists():
+                os.symlink(image_file, dst_image)
+            if not dst_label.exists():
+                shutil.copy2(label_file, dst_label)
+
+
+# =========================================================
+# 3. 메타데이터 syscall 카운터
+# =========================================================
+@contextlib.contextmanager
+def count_syscalls(counter):
+    """
+    os.stat / os.lstat / os.readlink / os.scandir 호출 횟수를 셉니다.
+    (pathlib의 exists()/is_symlink()도 내부적으로 os.stat/os.lstat을 사용합니다.)
+    """
+    originals = {name: getattr(os, name) for name in ('stat', 'lstat', 'readlink', 'scandir')}
+
+    def wrap(name, func):
+        def wrapper(*args, **kwargs):
+            counter[name] = counter.get(name, 0) + 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    for name, func in originals.items():
+        setattr(os, name, wrap(name, func))
+    try:
+        yield counter
+    finally:
+        for name, func in originals.items():
+            setattr(os, name, func)
+
+
+def make_fake_tree(data_dir):
+    rows = []
+    for i in range(NUM_FOLDERS):
+        common_path = f"patient_{i:03d}/session_0"
+        (data_dir / "1_FRAME" / common_path).mkdir(parents=True)
+        (data_dir / "5_YOLO_TXT" / common_path).mkdir(parents=True)
+        for j in range(FRAMES_PER_FOLDER):
+            (data_dir / "1_FRAME" / common_path / f"frame_{j}.jpg").write_bytes(b"\xff\xd8")
+            (data_dir / "5_YOLO_TXT" / common_path / f"frame_{j}.txt").write_text("0 0.5 0.5 0.1 0.1\n")
+        rows.append({'common_path': common_path, 'is_train': i % 5 != 0, 'is_val': i % 5 == 0})
+    return pd.DataFrame(rows)
+
+
+def run_case(name, func, df, dataset_dir, data_dir):
+    counter = {}
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), \
+            contextlib.redirect_stderr(devnull), count_syscalls(counter):
+        start_t = time.perf_counter()
+        func(df=df, dataset_dir=dataset_dir, data_dir=data_dir, step=SAMPLING_STEP)
+        elapsed = time.perf_counter() - start_t
+    return {'case': name, 'wall_s': round(elapsed, 3), **counter,
+            'total_calls': sum(counter.values())}
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        if DATA_DIR is None:
+            data_dir = tmp / "data"
+            df = make_fake_tree(data_dir)
+        else:
+            data_dir = Path(DATA_DIR)
+            df = pd.read_csv(data_dir / "metadata.csv")
+            df = df[(df['is_train'] == True) | (df['is_val'] == True)]
+
+        results = []
+        for name, func in [("legacy", legacy_create_yolo_dataset_structure),
+                           ("scandir_index", create_yolo_dataset_structure)]:
+            dataset_dir = tmp / f"dataset_{name}"
+            results.append(run_case(f"{name} (fresh)", func, df, dataset_dir, data_dir))
+            results.append(run_case(f"{name} (rebuild)", func, df, dataset_dir, data_dir))
+
+        print(f"📊 폴더 {len(df)}개 | Step {SAMPLING_STEP}")
+        print(pd.DataFrame(results).fillna(0).to_string(index=False))